@@ -0,0 +1,82 @@
+"""
+Per-ticker-per-year cost of the export/summary technicals, before and after
+moving to ``stock_dashboard.indicators``.
+
+    python benchmarks/bench_indicators.py --tickers 50 --years 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from stock_dashboard import indicators
+
+
+def synthetic_closes(n_tickers, years, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2026-01-01", periods=252 * years)
+    returns = rng.normal(0.0003, 0.015, (len(dates), n_tickers))
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=dates,
+                        columns=[f"T{i:04d}" for i in range(n_tickers)])
+
+
+def legacy_technicals(closes):
+    """The per-ticker loop previously in summary_tab/export_tab."""
+    out = {}
+    for ticker in closes.columns:
+        hist = closes[[ticker]].rename(columns={ticker: "Close"})
+        hist["SMA_50"] = hist["Close"].rolling(50).mean()
+        hist["SMA_200"] = hist["Close"].rolling(200).mean()
+        hist["Volatility"] = hist["Close"].pct_change().rolling(30).std() * np.sqrt(252)
+        hist["RSI"] = 100 - (100 / (1 + hist["Close"].pct_change().rolling(14).apply(
+            lambda x: (x[x > 0].sum() / abs(x[x < 0].sum())) if abs(x[x < 0].sum()) > 0 else 0)))
+        hist["Upper Band"] = hist["Close"].rolling(20).mean() + 2 * hist["Close"].rolling(20).std()
+        hist["Lower Band"] = hist["Close"].rolling(20).mean() - 2 * hist["Close"].rolling(20).std()
+        out[ticker] = hist
+    return out
+
+
+def vectorized_technicals(closes):
+    _, upper, lower = indicators.bollinger_bands(closes, 20, 2)
+    return {
+        "SMA_50": indicators.sma(closes, 50),
+        "SMA_200": indicators.sma(closes, 200),
+        "Volatility": indicators.rolling_volatility(closes, 30),
+        "RSI": indicators.rsi(closes, 14),
+        "Upper Band": upper,
+        "Lower Band": lower,
+    }
+
+
+def best_of(fn, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    closes = synthetic_closes(args.tickers, args.years)
+    units = args.tickers * args.years
+    before = best_of(legacy_technicals, closes, args.repeat)
+    after = best_of(vectorized_technicals, closes, args.repeat)
+    print(f"{args.tickers} tickers x {args.years} years ({len(closes)} bars each)")
+    print(f"  legacy rolling.apply : {before * 1e6 / units:10.1f} us per ticker-year")
+    print(f"  vectorized           : {after * 1e6 / units:10.1f} us per ticker-year")
+    print(f"  speedup              : {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
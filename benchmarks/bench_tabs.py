@@ -0,0 +1,214 @@
+"""
+Data-preparation cost of each dashboard tab, replayed from recorded fixtures.
+
+Runs each tab's ``compute_*`` data preparation (no Streamlit runtime)
+against a synthetic 15- or 2,000-ticker portfolio served by
+:class:`LocalFileProvider`, so timings are free of network noise:
+
+    python benchmarks/bench_tabs.py --portfolio small
+    python benchmarks/bench_tabs.py --portfolio large --json large.json
+    python benchmarks/bench_tabs.py --portfolio large --baseline large.json
+    python -m pytest tests/test_benchmarks.py   # call-count assertions on the small fixture
+
+Every stage is reported cold (fresh provider, as on a first page load) and
+warm (memoized data), with the upstream calls it triggered and its
+tracemalloc peak. ``--baseline`` compares against a previous ``--json`` run
+and exits non-zero when a stage got slower than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fixtures import PORTFOLIOS, fixture_dir, write_fixture
+from stock_dashboard.analytics import BENCHMARK, PortfolioAnalytics
+from stock_dashboard.compute import (compute_classification, compute_overview, compute_price_change,
+                                     compute_summary, compute_value_over_time, period_change, price_holdings)
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.market_data import LocalFileProvider, set_provider, window_start
+from stock_dashboard.report_export import collect_fundamentals, iter_technicals
+
+
+class CountingProvider(LocalFileProvider):
+    """
+    Replay provider that counts upstream calls and the symbols they asked for.
+
+    Counted where a batch leaves the memo for the backend (the same boundary
+    the ``upstream`` metrics wrap), so a backend hook calling another, as the
+    file backend's quotes do, is still one call.
+    """
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.calls, self.symbols = Counter(), Counter()
+
+    def _coalesce(self, endpoint, tickers, window, fetch):
+        def counted(batch):
+            self.calls[endpoint] += 1
+            self.symbols[endpoint] += len(batch)
+            return fetch(batch)
+        return super()._coalesce(endpoint, tickers, window, counted)
+
+
+# ----- stages: one per tab, in the order the dashboard runs them -----
+def prep_holdings(state, provider):
+    """Dashboard: quotes and FX conversion for the holdings frame."""
+    holdings = Holdings.from_records({"ticker": t, "quantity": q} for t, q in state["positions"])
+    state["df"] = price_holdings(holdings, provider)
+
+
+def prep_analytics(state, provider):
+    """Dashboard: the shared analytics matrix."""
+    state["analytics"] = PortfolioAnalytics.from_provider(state["df"], provider)
+
+
+def prep_overview(state, provider):
+    result = compute_overview(state["df"], state["analytics"], provider)
+    provider.quotes(result.tickers + [BENCHMARK])
+
+
+def prep_price_change(state, provider):
+    result = compute_price_change(state["df"], state["analytics"], provider)
+    # The "5 Years" option is the one window outside the shared matrix
+    period_change(result.metrics, result.analytics, "5y", provider)
+
+
+def prep_value_over_time(state, provider):
+    tickers = state["df"]["ticker"].astype(str).unique().tolist()
+    compute_value_over_time(tickers, [], window_start("1y"), provider)
+
+
+def prep_classification(state, provider):
+    compute_classification(state["df"], state["analytics"], provider)
+
+
+def prep_summary(state, provider):
+    compute_summary(str(state["df"]["ticker"].iloc[0]), provider)
+
+
+def prep_export(state, provider):
+    tickers = state["df"]["ticker"].astype(str).unique().tolist()
+    collect_fundamentals(tickers, provider)
+    for _ in iter_technicals(tickers, provider):
+        pass
+
+
+STAGES = [
+    ("holdings", prep_holdings),
+    ("analytics", prep_analytics),
+    ("overview", prep_overview),
+    ("price_change", prep_price_change),
+    ("value_over_time", prep_value_over_time),
+    ("classification", prep_classification),
+    ("summary", prep_summary),
+    ("export", prep_export),
+]
+
+
+def run_pass(root, positions, provider=None, memory=False):
+    """Run every stage once; returns ``{stage: {...}}`` and the provider (for a warm pass)."""
+    provider = provider or CountingProvider(root)
+    set_provider(provider)
+    state = {"positions": positions}
+    results = {}
+    for name, stage in STAGES:
+        calls, symbols = provider.calls.copy(), provider.symbols.copy()
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        stage(state, provider)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+        results[name] = {
+            "seconds": elapsed,
+            "calls": dict(provider.calls - calls),
+            "symbols": sum((provider.symbols - symbols).values()),
+            "peak_mb": peak / 1e6 if peak is not None else None,
+        }
+    return results, provider
+
+
+def benchmark(name, repeat):
+    n_tickers = PORTFOLIOS[name]
+    root = fixture_dir(str(n_tickers))
+    manifest = write_fixture(root, n_tickers)
+    rng = np.random.default_rng(1)
+    positions = [(t, int(q)) for t, q in zip(manifest["tickers"], rng.integers(1, 200, n_tickers))]
+
+    cold = [run_pass(root, positions)[0] for _ in range(repeat)]
+    _, provider = run_pass(root, positions)
+    warm = [run_pass(root, positions, provider)[0] for _ in range(repeat)]
+    memory, _ = run_pass(root, positions, memory=True)
+    set_provider(None)
+
+    report = {}
+    for stage, _ in STAGES:
+        report[stage] = {
+            "cold_s": min(r[stage]["seconds"] for r in cold),
+            "warm_s": min(r[stage]["seconds"] for r in warm),
+            "calls": cold[0][stage]["calls"],
+            "symbols": cold[0][stage]["symbols"],
+            "peak_mb": memory[stage]["peak_mb"],
+        }
+    return report
+
+
+def print_report(name, report):
+    print(f"{name} portfolio ({PORTFOLIOS[name]} tickers)")
+    print(f"  {'stage':<16}{'cold ms':>10}{'warm ms':>10}{'calls':>7}{'symbols':>9}{'peak MB':>9}  upstream")
+    for stage, r in report.items():
+        calls = ", ".join(f"{k}={v}" for k, v in sorted(r["calls"].items())) or "-"
+        print(f"  {stage:<16}{r['cold_s'] * 1e3:>10.1f}{r['warm_s'] * 1e3:>10.1f}"
+              f"{sum(r['calls'].values()):>7}{r['symbols']:>9}{r['peak_mb']:>9.1f}  {calls}")
+    total = sum(r["cold_s"] for r in report.values())
+    print(f"  {'total':<16}{total * 1e3:>10.1f}{sum(r['warm_s'] for r in report.values()) * 1e3:>10.1f}")
+
+
+def compare(reports, baseline, tolerance):
+    """Stages whose cold time grew by more than ``tolerance`` (a fraction) over ``baseline``."""
+    regressions = []
+    for name, report in reports.items():
+        for stage, r in report.items():
+            before = baseline.get(name, {}).get(stage)
+            if before and r["cold_s"] > before["cold_s"] * (1 + tolerance):
+                regressions.append(f"{name}/{stage}: {before['cold_s'] * 1e3:.1f} -> {r['cold_s'] * 1e3:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--portfolio", choices=[*PORTFOLIOS, "all"], default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Compare against a previous --json file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    names = list(PORTFOLIOS) if args.portfolio == "all" else [args.portfolio]
+    reports = {}
+    for name in names:
+        reports[name] = benchmark(name, args.repeat)
+        print_report(name, reports[name])
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(reports, json.load(fh), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Recorded market-data fixtures for the benchmarks.
+
+Writes synthetic but yfinance-shaped responses (``.info`` dicts and daily
+OHLCV bars) in the :class:`LocalFileProvider` layout, so a benchmark replays
+them with no network access:
+
+    python benchmarks/fixtures.py --tickers 2000 --out /tmp/fixtures/large
+
+Fixtures are deterministic for a given size and seed and are only written
+once per directory (a ``manifest.json`` records what is there).
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from stock_dashboard.market_data import LocalFileProvider
+from stock_dashboard.utils import data_dir
+
+PORTFOLIOS = {"small": 15, "large": 2000}
+HISTORY_YEARS = 2
+END_DATE = "2026-10-16"
+BENCHMARK = "SPY"
+
+# (suffix, exchange, quote currency, share of the portfolio)
+LISTINGS = [
+    ("", "NMS", "USD", 0.70),
+    (".DE", "GER", "EUR", 0.10),
+    (".L", "LSE", "GBp", 0.10),
+    (".T", "JPX", "JPY", 0.10),
+]
+FX_PAIRS = {"EUR": ("EURUSD=X", 1.08), "GBP": ("GBPUSD=X", 1.27), "JPY": ("JPYUSD=X", 0.0067)}
+SECTORS = ["Technology", "Healthcare", "Financial Services", "Industrials", "Consumer Cyclical",
+           "Consumer Defensive", "Energy", "Utilities", "Real Estate", "Communication Services"]
+
+
+def portfolio_tickers(n_tickers):
+    """``n_tickers`` symbols spread over :data:`LISTINGS` (US listings take the remainder)."""
+    foreign = []
+    for suffix, _, _, share in LISTINGS[1:]:
+        foreign += [f"F{len(foreign) + i:04d}{suffix}" for i in range(int(n_tickers * share))]
+    return [f"U{i:04d}" for i in range(n_tickers - len(foreign))] + foreign
+
+
+def synthetic_bars(rng, dates, start_price, vol):
+    returns = rng.normal(0.0003, vol, len(dates))
+    close = start_price * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, vol, len(dates))) * close
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, vol / 4, len(dates))),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, len(dates)),
+    }, index=pd.DatetimeIndex(dates, name="Date"))
+
+
+def synthetic_info(rng, ticker, bars, exchange, currency):
+    closes = bars["Close"].iloc[-252:]
+    return {
+        "symbol": ticker,
+        "currency": currency,
+        "exchange": exchange,
+        "sector": SECTORS[rng.integers(len(SECTORS))],
+        "industry": "Synthetic",
+        "marketCap": int(rng.integers(1, 2000)) * 10 ** 9,
+        "trailingPE": round(float(rng.uniform(5, 60)), 2),
+        "forwardEps": round(float(rng.uniform(0.5, 15)), 2),
+        "dividendYield": round(float(rng.uniform(0, 0.05)), 4),
+        "beta": round(float(rng.uniform(0.3, 2.0)), 2),
+        "priceToBook": round(float(rng.uniform(0.5, 20)), 2),
+        "fiftyTwoWeekHigh": float(closes.max()),
+        "fiftyTwoWeekLow": float(closes.min()),
+    }
+
+
+def write_fixture(root, n_tickers, seed=0):
+    """
+    Record a synthetic ``n_tickers`` portfolio (plus benchmark and FX pairs) under ``root``.
+
+    Returns:
+        dict: The manifest, with the portfolio's ``tickers``.
+    """
+    root = Path(root)
+    manifest_path = root / "manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("n_tickers") == n_tickers and manifest.get("seed") == seed:
+            return manifest
+
+    rng = np.random.default_rng(seed)
+    provider = LocalFileProvider(root)
+    dates = pd.bdate_range(end=END_DATE, periods=252 * HISTORY_YEARS)
+    tickers = portfolio_tickers(n_tickers)
+    listing = {suffix: (exchange, currency) for suffix, exchange, currency, _ in LISTINGS}
+    for ticker in tickers:
+        suffix = ticker[ticker.rfind("."):] if "." in ticker else ""
+        exchange, currency = listing[suffix]
+        bars = synthetic_bars(rng, dates, rng.uniform(10, 500), rng.uniform(0.008, 0.035))
+        provider.save(ticker, info=synthetic_info(rng, ticker, bars, exchange, currency), history=bars)
+
+    provider.save(BENCHMARK, info={"symbol": BENCHMARK, "currency": "USD", "exchange": "PCX"},
+                  history=synthetic_bars(rng, dates, 450, 0.01))
+    for pair, level in FX_PAIRS.values():
+        provider.save(pair, info={"symbol": pair, "currency": "USD"},
+                      history=synthetic_bars(rng, dates, level, 0.004))
+
+    manifest = {"n_tickers": n_tickers, "seed": seed, "tickers": tickers}
+    manifest_path.write_text(json.dumps(manifest))
+    return manifest
+
+
+def fixture_dir(name):
+    return data_dir("benchmarks", name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=PORTFOLIOS["small"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Fixture directory (default: the data dir's benchmarks/<tickers>).")
+    args = parser.parse_args()
+
+    root = Path(args.out) if args.out else fixture_dir(str(args.tickers))
+    manifest = write_fixture(root, args.tickers, args.seed)
+    print(f"{len(manifest['tickers'])} tickers recorded in {root}")
+
+
+if __name__ == "__main__":
+    main()
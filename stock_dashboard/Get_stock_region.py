@@ -1,70 +1,162 @@
-import yfinance as yf
-from typing import Dict
+import re
+from typing import Dict, Iterable, List, Optional
 
-def get_stock_region(ticker: str) -> str:
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        exchange = info.get("exchange", "").lower()
+import pandas as pd
+
+from stock_dashboard.market_data import get_provider, unique_tickers
 
-        region_map = {
-    "American Stock": [
-        "nasdaq", "nyse", "amex", "arca", "pcx", "nms", "nyq", "snp", "cboe", "bats", "tsx", "tsxv", "cse", "ne"
+AMERICAS = "American Stock"
+EUROPE = "European Stock"
+ASIA = "Asian Stock"
+OTHER = "Other/Unknown Region"
+
+# Exchange codes (as reported in ``.info["exchange"]``, plus common long names) per region.
+REGION_EXCHANGES = {
+    AMERICAS: [
+        "nasdaq", "nyse", "amex", "arca", "pcx", "nms", "nyq", "ngm", "ncm", "ase", "bts", "snp", "cboe", "bats",
+        "pnk", "oqb", "oqx", "tsx", "tsxv", "tor", "van", "cse", "cnq", "ne", "neo"
+    ],
+    EUROPE: [
+        "lse", "iob", "euronext", "xetra", "bme", "mce", "six", "ebs", "vtx", "fra", "ger", "ber", "dus", "ham",
+        "mun", "stu", "ams", "par", "bru", "mil", "lis", "vse", "vie", "omx", "sto", "hel", "cph", "osl", "oslo",
+        "ise", "dublin", "wse", "prague", "pra", "athens", "ath", "budapest", "bud", "bvx", "micex", "moex",
+        "mcx", "bolsa-madrid", "ist"
     ],
-    "European Stock": [
-        "lse", "euronext", "xetra", "bme", "six", "fra", "ams", "par", "mil", "lis", "vse", "omx", "wse", "prague",
-        "athens", "budapest", "bvx", "micex", "moex", "hel", "sto", "oslo", "dublin", "bolsa-madrid","ger","ebs"
+    ASIA: [
+        "tse", "tyo", "jpx", "jpxt", "tky", "osa", "fka", "sap", "sse", "shh", "szse", "shz", "shanghai",
+        "shenzhen", "hkex", "hkg", "hsi", "kospi", "ksc", "kosdaq", "koe", "nse", "nsi", "bse", "bom", "taiex",
+        "tai", "two", "taipei", "ses", "idx", "jkt", "pse", "phs", "bursa-malaysia", "kls", "set", "karachi",
+        "kar", "dhaka"
     ],
-    "Asian Stock": [
-        "tse", "sse", "hkex", "kospi", "kosdaq", "nse", "bse", "szse", "taiex", "jpxt", "hsi", "idx", "pse",
-        "bursa-malaysia", "set", "hkg", "jpx", "tky", "sto", "shanghai", "shenzhen", "taipei", "karachi", "dhaka","ksc","nsi"
+    OTHER: [
+        "asx", "nzx", "nze", "jse", "jnb", "bvc", "bmv", "mex", "b3", "bovespa", "sao", "safex", "adx", "dfm",
+        "tadawul", "sau", "qse", "doh", "egx", "cai", "tlv", "casablanca", "nairobi", "lagos", "muscat", "kuwait",
+        "manama", "colombia", "peru", "chile", "sgo", "argentina", "bue"
+    ],
+}
+
+# Yahoo crypto pairs (BTC-USD, ETH-EUR); share classes like BRK-B have a one- or two-letter tail.
+CRYPTO_PAIR_RE = re.compile(r"^[A-Z0-9]+-[A-Z]{3,4}$")
+
+# Yahoo ticker suffixes per region; a symbol without a suffix is a US listing.
+REGION_SUFFIXES = {
+    AMERICAS: ["TO", "V", "CN", "NE"],
+    EUROPE: [
+        "L", "IL", "PA", "AS", "BR", "LS", "IR", "DE", "F", "BE", "DU", "HM", "MU", "SG", "SW", "MI", "MC",
+        "VI", "ST", "HE", "CO", "OL", "IC", "WA", "PR", "AT", "BD", "ME", "IS"
     ],
-    "Other/Unknown Region": [
-        "asx", "nzx", "jse", "bvc", "bmv", "b3", "bovespa", "safex", "adx", "dfm", "tadawul", "qse", "egx", "casablanca",
-        "nairobi", "lagos", "muscat", "doha", "kuwait", "manama", "colombia", "peru", "chile", "argentina"
-    ]
+    ASIA: ["T", "HK", "KS", "KQ", "NS", "BO", "SS", "SZ", "TW", "TWO", "SI", "JK", "KL", "BK", "PS", "KA"],
+    OTHER: ["AX", "NZ", "JO", "SA", "MX", "TA", "SR", "QA", "CA", "BA", "SN", "CL", "LM"],
 }
 
-        for region, exchanges in region_map.items():
-            if any(ex in exchange for ex in exchanges):
-                return region
 
-        return f"Other/Unknown Region (Exchange: {exchange})"
+def _index(groups: Dict[str, List[str]]) -> Dict[str, str]:
+    """Flatten ``{region: codes}`` to ``{code: region}``; the first region listing a code wins."""
+    index = {}
+    for region, codes in groups.items():
+        for code in codes:
+            index.setdefault(code, region)
+    return index
+
+
+# Built once at import; lookups are exact dictionary hits.
+EXCHANGE_REGION = _index(REGION_EXCHANGES)
+SUFFIX_REGION = _index({region: [s.upper() for s in suffixes] for region, suffixes in REGION_SUFFIXES.items()})
+
+
+def region_from_suffix(ticker: str) -> Optional[str]:
+    """
+    Region implied by a Yahoo ticker alone, or ``None`` if the symbol does not say.
+
+    ``NESN.SW`` -> European, ``7203.T`` -> Asian, plain ``AAPL``/``BRK-B`` -> American.
+    FX pairs and futures (``EURUSD=X``, ``CL=F``) and crypto pairs (``BTC-USD``)
+    belong to no region and give :data:`OTHER`. Indices (``^GSPC``) and unknown
+    suffixes return ``None``.
+    """
+    ticker = ticker.strip().upper()
+    if not ticker or "^" in ticker:
+        return None
+    if "=" in ticker or CRYPTO_PAIR_RE.match(ticker):
+        return OTHER
+    base, dot, suffix = ticker.rpartition(".")
+    if not dot:
+        return AMERICAS
+    return SUFFIX_REGION.get(suffix)
+
+
+def region_from_exchange(exchange: str) -> str:
+    exchange = (exchange or "").strip().lower()
+    return EXCHANGE_REGION.get(exchange, f"{OTHER} (Exchange: {exchange})")
+
+
+def exchange_codes(tickers: Iterable[str]) -> Dict[str, str]:
+    """
+    Exchange code for the tickers whose suffix does not give their region.
 
+    Served from the shared ``.info`` cache (reference fields live for days),
+    so a portfolio of suffixed or US symbols makes no request at all.
+    """
+    unresolved = [t for t in unique_tickers(tickers) if region_from_suffix(t) is None]
+    if not unresolved:
+        return {}
+    infos = get_provider().info(unresolved, fields=["exchange"])
+    return {t: infos.get(t, {}).get("exchange", "") for t in unresolved}
+
+
+def get_stock_regions(tickers: Iterable[str]) -> Dict[str, str]:
+    """Region per ticker, from the suffix where possible and the exchange code otherwise."""
+    tickers = unique_tickers(tickers)
+    exchanges = exchange_codes(tickers)
+    return {t: region_from_suffix(t) or region_from_exchange(exchanges.get(t, "")) for t in tickers}
+
+
+def region_weights(holdings: pd.DataFrame) -> pd.Series:
+    """
+    Percentage of portfolio value per region, in one groupby.
+
+    Args:
+        holdings (pd.DataFrame): ``ticker`` and ``value`` columns, plus an optional
+            ``exchange`` column (see :func:`exchange_codes`) for tickers whose
+            suffix is not conclusive.
+
+    Returns:
+        pd.Series: Percent of total value by region (empty if there is no value).
+    """
+    tickers = holdings["ticker"].astype(str)
+    regions = tickers.map({t: region_from_suffix(t) for t in tickers.unique()})
+    if "exchange" in holdings:
+        exchanges = holdings["exchange"].fillna("").astype(str)
+        by_exchange = exchanges.map({e: region_from_exchange(e) for e in exchanges.unique()})
+        regions = regions.fillna(by_exchange)
+    regions = regions.fillna(region_from_exchange(""))
+
+    values = holdings["value"].where(holdings["value"] > 0)
+    totals = values.groupby(regions, sort=False).sum()
+    total = totals.sum()
+    return totals / total * 100 if total > 0 else totals.iloc[:0]
+
+
+def get_stock_region(ticker: str) -> str:
+    try:
+        return get_stock_regions([ticker]).get(ticker, region_from_exchange(""))
     except Exception as e:
         return f"Error fetching data for {ticker}: {e}"
 
+
 def stock_region_diversification(tickers_with_quantity: Dict[str, int]) -> Dict[str, float]:
     try:
         if not tickers_with_quantity:
             raise ValueError("Input tickers_with_quantity is empty.")
 
-        region_totals = {}
-        total_investment = 0
-
-        for ticker, quantity in tickers_with_quantity.items():
-            stock = yf.Ticker(ticker)
-            current_price = stock.info.get("regularMarketPrice", 0)
-            if current_price <= 0:
-                continue
+        quantities = pd.Series(tickers_with_quantity, dtype=float)
+        prices = get_provider().quotes(quantities.index)["price"].reindex(quantities.index)
+        holdings = pd.DataFrame({"ticker": quantities.index, "value": (prices * quantities).to_numpy()})
+        holdings["exchange"] = holdings["ticker"].map(exchange_codes(holdings["ticker"]))
 
-            investment = current_price * quantity
-            total_investment += investment
-
-            region = get_stock_region(ticker)
-            if region not in region_totals:
-                region_totals[region] = 0
-            region_totals[region] += investment
-
-        if total_investment == 0:
+        region_percentages = region_weights(holdings)
+        if region_percentages.empty:
             return {"Error": "Total investment is zero. Cannot calculate diversification."}
-
-        region_percentages = {
-            region: (amount / total_investment) * 100
-            for region, amount in region_totals.items()
-        }
-
-        return region_percentages
+        return region_percentages.to_dict()
 
     except Exception as e:
-        return {"Error": f"Error calculating diversification: {e}"}
\ No newline at end of file
+        return {"Error": f"Error calculating diversification: {e}"}
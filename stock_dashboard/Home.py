@@ -1,6 +1,12 @@
 import streamlit as st
+import sys
+import os
 from nextpage import nav_page
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from stock_dashboard.holdings import Holdings, as_holdings
+from stock_dashboard.portfolio_import import SUPPORTED_TYPES, import_holdings
+
 # -------------------- PAGE CONFIG --------------------
 st.set_page_config(page_title="Stock Portfolio Builder", layout="wide")
 
@@ -89,33 +95,64 @@ st.write("Input your stock holdings to analyze them on the dashboard.")
 
 # Initialize session state
 if "portfolio" not in st.session_state:
-    st.session_state.portfolio = []
-
-def add_stock():
-    st.session_state.portfolio.append({"ticker": "", "quantity": 0.0})
+    st.session_state.portfolio = Holdings()
+holdings = as_holdings(st.session_state.portfolio)
+
+# -------------------- BULK IMPORT --------------------
+st.markdown("### Import Holdings")
+uploaded = st.file_uploader(
+    "Upload a broker export (CSV, Excel or Parquet) with ticker and quantity columns",
+    type=list(SUPPORTED_TYPES),
+)
+replace_existing = st.checkbox("Replace current holdings", value=True)
+if uploaded is not None and st.button("Import"):
+    try:
+        with st.spinner("Importing holdings..."):
+            imported, report = import_holdings(uploaded, name=uploaded.name)
+    except Exception as e:
+        st.error(f"Could not import {uploaded.name}: {e}")
+    else:
+        if not replace_existing:
+            merged = Holdings.from_frame(holdings.to_frame())
+            merged.extend(imported.to_frame()["ticker"], imported.quantities)
+            imported = merged
+        holdings = st.session_state.portfolio = imported
+        # Reload the editor from the imported holdings
+        st.session_state.pop("holdings_base", None)
+        st.session_state.pop("holdings_editor", None)
+        st.success(f"Imported {report['imported']:,} of {report['rows']:,} rows.")
+        if report["rejected_count"]:
+            st.warning(f"Skipped {report['rejected_count']:,} invalid rows.")
+            st.dataframe(report["rejected"], hide_index=True, use_container_width=True)
+        if report["unresolved"]:
+            st.warning("No market data for: " + ", ".join(report["unresolved"][:50]))
 
 # Card-style container
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown("### Add Stocks")
 
-for i, stock in enumerate(st.session_state.portfolio):
-    col1, col2 = st.columns(2)
-    stock["ticker"] = col1.text_input(
-        f"Stock Ticker {i+1}", stock["ticker"], key=f"ticker_{i}"
-    )
-    stock["quantity"] = col2.number_input(
-        f"Quantity", value=float(stock["quantity"]), min_value=0.0, step=1.0, key=f"quantity_{i}"
-    )
+# One grid widget for every row: adding or editing rows no longer adds widgets per holding.
+# The editor applies its edits on top of a fixed base frame, snapshotted when the page opens.
+if "holdings_editor" not in st.session_state or "holdings_base" not in st.session_state:
+    st.session_state.holdings_base = holdings.to_frame(categorical=False)
+edited = st.data_editor(
+    st.session_state.holdings_base,
+    num_rows="dynamic",
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "ticker": st.column_config.TextColumn("Stock Ticker"),
+        "quantity": st.column_config.NumberColumn("Quantity", min_value=0.0, step=1.0),
+    },
+    key="holdings_editor",
+)
 st.markdown("</div>", unsafe_allow_html=True)
 
-# Add stock button
-if st.button("Add Another"):
-    add_stock()
+# Store the compact container; blank tickers and non-positive quantities are dropped
+st.session_state.portfolio = Holdings.from_frame(edited)
 
 # Validation
-valid_stocks = [s for s in st.session_state.portfolio if s["ticker"].strip() and s["quantity"] > 0]
-
-if valid_stocks:
+if len(st.session_state.portfolio):
     st.success("Portfolio ready.")
     if st.button("Go to Dashboard"):
         nav_page("Dashboard")
@@ -0,0 +1,127 @@
+from functools import cached_property
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard import indicators
+from stock_dashboard.fx import FXRates
+from stock_dashboard.market_data import MarketDataProvider, get_provider, slice_period, unique_tickers
+
+ANALYTICS_PERIOD = "1y"
+BENCHMARK = "SPY"
+
+
+class PortfolioAnalytics:
+    """
+    Portfolio statistics shared by every dashboard tab.
+
+    Built once per refresh from the holdings frame (``ticker``, ``quantity``,
+    ``price``, ``value``) and an aligned close matrix. Each statistic is a
+    lazily computed, cached property, so switching tabs only renders.
+
+    Args:
+        holdings (pd.DataFrame): The Dashboard portfolio frame.
+        prices (pd.DataFrame): Daily closes, dates x tickers.
+        benchmark (pd.Series, optional): Benchmark closes used for beta.
+    """
+
+    def __init__(self, holdings: pd.DataFrame, prices: pd.DataFrame, benchmark: Optional[pd.Series] = None):
+        self.holdings = holdings
+        self.prices = prices
+        self.benchmark = benchmark if benchmark is not None else pd.Series(dtype=float)
+        self._windows: Dict[str, pd.DataFrame] = {}
+
+    @classmethod
+    def from_provider(cls, holdings: pd.DataFrame, provider: Optional[MarketDataProvider] = None,
+                      period: str = ANALYTICS_PERIOD, benchmark: str = BENCHMARK) -> "PortfolioAnalytics":
+        """
+        Fetch one aligned matrix (holdings plus benchmark) and wrap it.
+
+        Holdings prices are converted to the base currency at each day's FX
+        rate, so portfolio values add up across markets.
+        """
+        provider = provider or get_provider()
+        tickers = unique_tickers(holdings["ticker"])
+        closes = provider.close(tickers + [benchmark], period=period)
+        bench = closes[benchmark].dropna() if benchmark in closes.columns else None
+        prices = closes.reindex(columns=[t for t in tickers if t in closes.columns])
+        fx = FXRates(provider)
+        prices = fx.convert(prices, fx.currencies(prices.columns))
+        return cls(holdings, prices, bench)
+
+    # ----- windows -----
+    def window(self, period: str) -> pd.DataFrame:
+        """
+        The price matrix cut to a yfinance-style period.
+
+        ``"Nd"`` windows keep each ticker's own last ``N`` bars, matching a
+        per-ticker ``history(period="Nd")``; calendar periods cut by date.
+        """
+        if period not in self._windows:
+            if period.endswith("d") and period[:-1].isdigit():
+                bars_left = self.prices.notna()[::-1].cumsum()[::-1]
+                self._windows[period] = self.prices.where(bars_left <= int(period[:-1])).dropna(how="all")
+            else:
+                self._windows[period] = slice_period(self.prices, period)
+        return self._windows[period]
+
+    def change(self, period: str) -> pd.Series:
+        """Percent change from the first to the last bar of ``period``."""
+        closes = self.window(period)
+        if closes.empty:
+            return pd.Series(np.nan, index=self.prices.columns, dtype=float)
+        first, last = closes.bfill().iloc[0], closes.ffill().iloc[-1]
+        return (last - first) / first * 100
+
+    def max_drawdown(self, period: str) -> pd.Series:
+        """Worst peak-to-trough fall within ``period``, in percent."""
+        return indicators.drawdown(self.window(period)).min() * 100
+
+    # ----- lazy statistics -----
+    @cached_property
+    def weights(self) -> pd.Series:
+        values = self.holdings.groupby("ticker", sort=False)["value"].sum()
+        return values / values.sum()
+
+    @cached_property
+    def returns(self) -> pd.DataFrame:
+        """Daily returns per ticker over the full matrix."""
+        return indicators.returns(self.prices)
+
+    @cached_property
+    def volatility(self) -> pd.Series:
+        """Standard deviation of daily returns over each ticker's last 30 bars."""
+        return indicators.returns(self.window("30d")).std(ddof=0)
+
+    @cached_property
+    def portfolio_volatility(self) -> float:
+        vol = self.volatility.reindex(self.weights.index)
+        valid = vol.notna()
+        return float(np.average(vol[valid], weights=self.weights[valid])) if valid.any() else np.nan
+
+    @cached_property
+    def rolling_volatility(self) -> pd.DataFrame:
+        """Annualized 30-bar rolling volatility."""
+        return indicators.rolling_volatility(self.prices, 30)
+
+    @cached_property
+    def drawdown(self) -> pd.DataFrame:
+        return indicators.drawdown(self.prices)
+
+    @cached_property
+    def beta(self) -> pd.Series:
+        """Beta of each ticker's daily returns against the benchmark."""
+        if self.benchmark.empty:
+            return pd.Series(np.nan, index=self.prices.columns, dtype=float)
+        bench = self.benchmark.pct_change(fill_method=None).rename("__benchmark__")
+        joined = self.returns.join(bench, how="inner")
+        cov = joined.cov()["__benchmark__"]
+        return (cov / cov["__benchmark__"]).drop("__benchmark__")
+
+    @cached_property
+    def portfolio_history(self) -> pd.Series:
+        """Daily market value of the holdings (last close carried over gaps)."""
+        quantities = self.holdings.groupby("ticker", sort=False)["quantity"].sum()
+        held = [t for t in self.prices.columns if t in quantities.index]
+        return (self.prices[held].ffill() * quantities[held]).sum(axis=1, min_count=1)
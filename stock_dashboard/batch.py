@@ -0,0 +1,262 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from stock_dashboard.analytics import ANALYTICS_PERIOD, BENCHMARK, PortfolioAnalytics
+from stock_dashboard.compute import (compute_classification, compute_export, compute_overview, compute_price_change,
+                                     compute_value_over_time, price_holdings, unconverted_tickers)
+from stock_dashboard.fx import PIVOT, base_currency, major_unit, pair_symbol
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.market_data import (LocalFileProvider, MarketDataProvider, get_provider, set_provider,
+                                         unique_tickers, window_start)
+from stock_dashboard.portfolio_import import SUPPORTED_TYPES, import_holdings
+from stock_dashboard.report_export import SIDECAR_FORMATS
+from stock_dashboard.utils import data_dir
+
+DEFAULT_BENCHMARKS = ["^GSPC"]
+DEFAULT_SINCE = "5y"  # value-over-time window when no --start is given
+FRAME_FORMATS = ("csv", "parquet")
+SNAPSHOT_DIR = "market_data"
+SUMMARY_NAME = "summary.json"
+EXPORT_NAME = "full_portfolio_export.zip"
+
+
+def find_portfolios(directory) -> List[Path]:
+    """Portfolio files (any of :data:`SUPPORTED_TYPES`) directly inside ``directory``, by name."""
+    suffixes = {f".{ext}" for ext in SUPPORTED_TYPES}
+    return sorted(p for p in Path(directory).iterdir() if p.is_file() and p.suffix.lower() in suffixes)
+
+
+def load_portfolios(paths: List[Path]) -> Dict[str, Holdings]:
+    """
+    Read and validate every portfolio file, keyed by file stem.
+
+    Symbols are not resolved here; that happens once for all portfolios in
+    :func:`snapshot_market_data`. Files that cannot be read, or that hold
+    no valid rows, are reported on stderr and left out.
+    """
+    portfolios = {}
+    for path in paths:
+        try:
+            holdings, report = import_holdings(path, resolve=False)
+        except (ValueError, OSError) as e:
+            print(f"{path.name}: skipped ({e})", file=sys.stderr)
+            continue
+        if not len(holdings):
+            print(f"{path.name}: skipped (no valid rows of {report['rows']})", file=sys.stderr)
+            continue
+        portfolios[path.stem] = holdings
+    return portfolios
+
+
+def snapshot_market_data(symbols: List[str], root, start: pd.Timestamp,
+                         provider: Optional[MarketDataProvider] = None) -> LocalFileProvider:
+    """
+    Fetch everything the batch needs for ``symbols`` once and record it under ``root``.
+
+    Quotes, ``.info`` and daily bars from ``start`` (and at least
+    ``ANALYTICS_PERIOD``) are fetched in one batched call each, together
+    with the benchmark and the FX pairs the holdings are quoted in. They are
+    written in the :class:`LocalFileProvider` layout, with the quote kept in
+    each ``.info`` dict, so every worker process replays the same
+    point-in-time data without calling upstream again.
+
+    Returns:
+        LocalFileProvider: A provider replaying the snapshot.
+    """
+    provider = provider or get_provider()
+    start = min(start, window_start(ANALYTICS_PERIOD))
+    infos = provider.info(symbols)
+    currencies = {major_unit(infos.get(t, {}).get("currency"))[0] for t in symbols} | {base_currency()}
+    pairs = [pair_symbol(c) for c in sorted(currencies - {PIVOT})]
+    symbols = unique_tickers([*symbols, *pairs])
+    infos.update(provider.info(pairs))
+
+    quotes = provider.quotes(symbols).reindex(symbols)
+    history = provider.history(symbols, start=start)
+    recorded = set(history.columns.get_level_values(1))
+    snapshot = LocalFileProvider(root)
+    for t in symbols:
+        info = dict(infos.get(t) or {})
+        quote = quotes.loc[t]
+        if pd.notna(quote["price"]):
+            info["regularMarketPrice"] = quote["price"]
+            info["previousClose"] = quote["previous_close"]
+        bars = history.xs(t, axis=1, level=1).dropna(how="all") if t in recorded else None
+        snapshot.save(t, info=info, history=bars if bars is not None and not bars.empty else None)
+    return snapshot
+
+
+def _write_frame(frame: pd.DataFrame, path: Path, fmt: str, index: bool = False) -> None:
+    if fmt == "parquet":
+        frame.to_parquet(path.with_suffix(".parquet"), index=index)
+    else:
+        frame.to_csv(path.with_suffix(".csv"), index=index)
+
+
+def _init_worker(snapshot_root: str) -> None:
+    set_provider(LocalFileProvider(snapshot_root))
+
+
+def run_portfolio(name: str, holdings: Holdings, out_dir: str, benchmarks: List[str], start: str,
+                  fmt: str = "csv", export: bool = True, per_ticker_sheets: bool = False,
+                  sidecar: Optional[str] = None) -> dict:
+    """
+    Compute every tab's output for one portfolio and write it to ``out_dir/name``.
+
+    Process-pool worker: uses the provider set by the pool initializer and
+    returns the portfolio's summary (with an ``error`` instead when it fails).
+    """
+    started = time.perf_counter()
+    target = Path(out_dir) / name
+    try:
+        target.mkdir(parents=True, exist_ok=True)
+        df = price_holdings(holdings)
+        if df.empty:
+            raise ValueError("no holding has a price")
+        analytics = PortfolioAnalytics.from_provider(df)
+
+        overview = compute_overview(df, analytics)
+        _write_frame(overview.holdings, target / "holdings", fmt)
+        _write_frame(overview.sectors, target / "sectors", fmt)
+        _write_frame(overview.history.rename_axis("Date").reset_index(), target / "history", fmt)
+
+        price_change = compute_price_change(df, analytics)
+        _write_frame(price_change.metrics, target / "price_change", fmt)
+
+        value_over_time = compute_value_over_time(unique_tickers(df["ticker"]), benchmarks, start)
+        _write_frame(value_over_time.returns.rename_axis("ticker").reset_index(), target / "returns", fmt)
+
+        classification = compute_classification(df, analytics)
+        if classification is not None:
+            _write_frame(classification.features, target / "risk", fmt)
+
+        if export:
+            (target / EXPORT_NAME).write_bytes(
+                compute_export(df, per_ticker_sheets=per_ticker_sheets, sidecar=sidecar).archive
+            )
+
+        summary = {
+            "portfolio": name,
+            "holdings": len(df),
+            "unpriced": sorted(set(holdings.symbols) - set(unique_tickers(df["ticker"]))),
+            "unconverted": unconverted_tickers(df),
+            "total_value": overview.total_value,
+            "top_holding": overview.top_holding,
+            "volatility": overview.portfolio_volatility,
+            "dividend_yield": overview.dividend_yield,
+            "sectors": overview.sector_count,
+            "regions": overview.regions.to_dict(),
+            "risk": classification.portfolio_risk if classification is not None else None,
+            "risk_averages": classification.averages if classification is not None else {},
+        }
+    except Exception as e:
+        summary = {"portfolio": name, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    summary["seconds"] = time.perf_counter() - started
+    if target.exists():
+        (target / SUMMARY_NAME).write_text(json.dumps(summary, indent=2, default=str))
+    return summary
+
+
+def run_batch(directory, out_dir, workers: Optional[int] = None, benchmarks: Optional[List[str]] = None,
+              start=None, fmt: str = "csv", export: bool = True, per_ticker_sheets: bool = False,
+              sidecar: Optional[str] = None) -> List[dict]:
+    """
+    Precompute the dashboard's outputs for every portfolio file in ``directory``.
+
+    The union of all portfolios' symbols is fetched once into a snapshot
+    under ``out_dir`` (see :func:`snapshot_market_data`), then each portfolio
+    is computed in its own task on a process pool replaying that snapshot.
+    Per-portfolio results go to ``out_dir/<file stem>/``, and a ``summary``
+    table of all of them to ``out_dir``.
+
+    Args:
+        directory: Folder of CSV, Excel or Parquet portfolio files.
+        out_dir: Output folder (created if needed).
+        workers (int, optional): Worker processes; defaults to the CPU count.
+        benchmarks (list, optional): Value-over-time benchmarks; defaults to :data:`DEFAULT_BENCHMARKS`.
+        start (optional): Value-over-time start date; defaults to :data:`DEFAULT_SINCE` ago.
+        fmt (str): Table format, one of :data:`FRAME_FORMATS`.
+        export (bool): Also build each portfolio's report package.
+        per_ticker_sheets (bool): Export option, see :func:`build_export`.
+        sidecar (str, optional): Export option, see :func:`build_export`.
+
+    Returns:
+        list: One summary dict per portfolio, in file order.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    benchmarks = [b.upper() for b in (DEFAULT_BENCHMARKS if benchmarks is None else benchmarks)]
+    start = pd.Timestamp(start) if start is not None else window_start(DEFAULT_SINCE)
+
+    portfolios = load_portfolios(find_portfolios(directory))
+    if not portfolios:
+        return []
+    symbols = unique_tickers([s for h in portfolios.values() for s in h.symbols] + [BENCHMARK, *benchmarks])
+    snapshot = snapshot_market_data(symbols, out_dir / SNAPSHOT_DIR, start)
+    print(f"Fetched market data once for {len(symbols)} symbols across {len(portfolios)} portfolios", file=sys.stderr)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(portfolios)))
+    options = dict(out_dir=str(out_dir), benchmarks=benchmarks, start=str(start.date()), fmt=fmt, export=export,
+                   per_ticker_sheets=per_ticker_sheets, sidecar=sidecar)
+    results = {}
+    # "spawn" keeps the workers clear of the parent's fetch threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(str(snapshot.root),)) as pool:
+        futures = {pool.submit(run_portfolio, name, holdings, **options): name
+                   for name, holdings in portfolios.items()}
+        for future in as_completed(futures):
+            summary = future.result()
+            results[futures[future]] = summary
+            status = summary.get("error") or f"{summary['holdings']} holdings"
+            print(f"{summary['portfolio']}: {status} ({summary['seconds']:.1f}s)", file=sys.stderr)
+
+    summaries = [results[name] for name in portfolios]
+    table = pd.DataFrame([{k: v for k, v in s.items() if k not in ("regions", "risk_averages", "traceback")}
+                          for s in summaries])
+    _write_frame(table, out_dir / "summary", fmt)
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute dashboard analytics for a folder of portfolio files.")
+    parser.add_argument("directory", help=f"Folder of portfolio files ({', '.join(SUPPORTED_TYPES)}).")
+    parser.add_argument("--out", help="Output folder (default: the data dir's batch/<today>).")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--benchmarks", default=",".join(DEFAULT_BENCHMARKS),
+                        help="Comma-separated value-over-time benchmarks.")
+    parser.add_argument("--start", help=f"Value-over-time start date (default: {DEFAULT_SINCE} ago).")
+    parser.add_argument("--format", choices=FRAME_FORMATS, default="csv", help="Table format.")
+    parser.add_argument("--no-export", action="store_true", help="Skip the Excel/PDF report package.")
+    parser.add_argument("--per-ticker-sheets", action="store_true", help="One technicals sheet per ticker.")
+    parser.add_argument("--sidecar", choices=SIDECAR_FORMATS, help="Add a technicals sidecar to the export.")
+    args = parser.parse_args(argv)
+
+    if not Path(args.directory).is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    out_dir = Path(args.out) if args.out else data_dir("batch", date.today().isoformat())
+    summaries = run_batch(
+        args.directory, out_dir, workers=args.workers,
+        benchmarks=[b.strip() for b in args.benchmarks.split(",") if b.strip()], start=args.start,
+        fmt=args.format, export=not args.no_export, per_ticker_sheets=args.per_ticker_sheets, sidecar=args.sidecar,
+    )
+    if not summaries:
+        print(f"No portfolio files found in {args.directory}", file=sys.stderr)
+        return 1
+    failed = [s["portfolio"] for s in summaries if "error" in s]
+    print(f"Wrote {len(summaries) - len(failed)} of {len(summaries)} portfolios to {out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,8 @@
-def render_risk_classification_tab(df):
-    import streamlit as st
-    import pandas as pd
-    import numpy as np
-    import yfinance as yf
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.preprocessing import LabelEncoder
-    import plotly.express as px
+import streamlit as st
+import plotly.express as px
+from stock_dashboard.compute import compute_classification
 
+def render_risk_classification_tab(df, analytics=None):
     # === Dark Theme and Full White Styling ===
     st.markdown("""
     <style>
@@ -55,72 +51,25 @@ def render_risk_classification_tab(df):
         st.error("The input data must contain a 'ticker' column.")
         return None, None
 
-    tickers = df["ticker"].dropna().unique().tolist()
     desired_risk = st.radio("Select your desired risk level:", options=["Low", "Moderate", "High"], horizontal=True)
 
-    @st.cache_data
-    def fetch_features(tickers):
-        data = []
-        for t in tickers:
-            try:
-                ticker = yf.Ticker(t)
-                info = ticker.info
-                hist = ticker.history(period="6mo", auto_adjust=True)
-                volatility = hist["Close"].pct_change().rolling(30).std().mean() * np.sqrt(252)
-                beta = info.get("beta", np.nan)
-                pe = info.get("trailingPE", np.nan)
-                dividend = (info.get("dividendYield") or 0) * 100
-                stddev = hist["Close"].std()
-                data.append({
-                    "ticker": t,
-                    "Volatility": volatility,
-                    "Beta": beta,
-                    "P/E Ratio": pe,
-                    "Dividend Yield": dividend,
-                    "Price Std Dev": stddev
-                })
-            except:
-                continue
-        return pd.DataFrame(data).dropna()
-
-    feature_df = fetch_features(tickers)
-
-    if feature_df.empty:
+    result = compute_classification(df, analytics)
+
+    if result is None:
         st.warning("No valid financial data could be retrieved. Please check your ticker symbols.")
         return None, None
 
-    def label_risk(row):
-        score = 0
-        if row["Volatility"] > 0.35 or row["Beta"] > 1.2: score += 2
-        if row["P/E Ratio"] > 30: score += 1
-        if row["Dividend Yield"] < 1: score += 1
-        return "High" if score >= 3 else "Moderate" if score == 2 else "Low"
-
-    feature_df["Risk"] = feature_df.apply(label_risk, axis=1)
-
-    X = feature_df[["Volatility", "Beta", "P/E Ratio", "Dividend Yield", "Price Std Dev"]]
-    y = feature_df["Risk"]
-    le = LabelEncoder()
-    y_encoded = le.fit_transform(y)
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
-    model.fit(X, y_encoded)
-    feature_df["Predicted Risk"] = le.inverse_transform(model.predict(X))
-    portfolio_risk = feature_df["Predicted Risk"].value_counts().idxmax()
-
-    avg_vol = feature_df["Volatility"].mean()
-    avg_beta = feature_df["Beta"].mean()
-    avg_pe = feature_df["P/E Ratio"].mean()
-    avg_yield = feature_df["Dividend Yield"].mean()
+    feature_df, portfolio_risk = result.features, result.portfolio_risk
 
     st.markdown("### Portfolio Risk Summary")
     left, right = st.columns(2)
 
     with left:
         st.metric("Predicted Risk", portfolio_risk)
-        st.markdown(f"**Average Volatility:** {avg_vol:.2f}")
-        st.markdown(f"**Average Beta:** {avg_beta:.2f}")
-        st.markdown(f"**Average P/E Ratio:** {avg_pe:.2f}")
-        st.markdown(f"**Average Dividend Yield:** {avg_yield:.2f}%")
+        st.markdown(f"**Average Volatility:** {result.averages['Volatility']:.2f}")
+        st.markdown(f"**Average Beta:** {result.averages['Beta']:.2f}")
+        st.markdown(f"**Average P/E Ratio:** {result.averages['P/E Ratio']:.2f}")
+        st.markdown(f"**Average Dividend Yield:** {result.averages['Dividend Yield']:.2f}%")
 
     with right:
         risk_distribution = feature_df["Predicted Risk"].value_counts().reset_index()
@@ -158,9 +107,6 @@ def render_risk_classification_tab(df):
         st.success("Your portfolio risk is in line with your selected target.")
 
     # === Stock-Level Risk Breakdown
-    safest = feature_df[feature_df["Predicted Risk"] == "Low"].nsmallest(3, "Volatility")
-    riskiest = feature_df[feature_df["Predicted Risk"] == "High"].nlargest(3, "Volatility")
-
     def display_stock_cards(df_subset):
         for _, row in df_subset.iterrows():
             st.markdown(f"""
@@ -176,18 +122,13 @@ def render_risk_classification_tab(df):
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**Safest Holdings**")
-        display_stock_cards(safest)
+        display_stock_cards(result.safest)
 
     with col2:
         st.markdown("**Riskiest Holdings**")
-        display_stock_cards(riskiest)
+        display_stock_cards(result.riskiest)
 
     # === Return Key Metrics and Chart ===
-    key_metrics = {
-        "Avg Beta": f"{avg_beta:.2f}" if not pd.isna(avg_beta) else "N/A",
-        "Avg Dividend Yield": f"{avg_yield:.2f}%" if not pd.isna(avg_yield) else "N/A"
-    }
-
     fig_volatility = px.scatter(
         feature_df,
         x="Beta",
@@ -209,4 +150,4 @@ def render_risk_classification_tab(df):
 
     st.plotly_chart(fig_volatility, use_container_width=True)
 
-    return key_metrics, fig_volatility
+    return result.key_metrics, fig_volatility
@@ -0,0 +1,368 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard import indicators
+from stock_dashboard.Get_stock_region import exchange_codes, region_weights
+from stock_dashboard.analytics import ANALYTICS_PERIOD, BENCHMARK, PortfolioAnalytics
+from stock_dashboard.fx import FXRates
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.market_data import MarketDataProvider, get_provider, unique_tickers, window_start
+from stock_dashboard.report_export import build_export, export_key
+from stock_dashboard.risk_model import extract_features, label_risk, predict_risk
+
+# Streamlit-free data preparation for every dashboard tab. Each ``compute_*``
+# takes the Dashboard holdings frame (plus the shared analytics when there is
+# one) and returns a result dataclass; the ``render_*_tab`` functions only turn
+# those results into widgets and figures. Nothing here imports Streamlit or
+# Plotly, so batch jobs, worker processes and benchmarks can use it directly.
+
+PERIODS = {
+    "1 Day": "2d",
+    "1 Week": "7d",
+    "1 Month": "30d",
+    "6 Months": "6mo",
+    "1 Year": "1y",
+    "5 Years": "5y",
+    "All Time": "max"
+}
+HISTORY_DAYS = 30
+PRICE_HISTORY_WINDOW = "90d"
+RETURN_WINDOWS = {"1M": 30, "6M": 180, "1Y": 365, "5Y": 1825}
+
+
+def _labelled(df: pd.DataFrame) -> pd.DataFrame:
+    """A copy with plain string tickers, so per-ticker ``.map()`` lookups return plain values."""
+    df = df.copy()
+    df["ticker"] = df["ticker"].astype(str)
+    return df
+
+
+# ----- Holdings -----
+def price_holdings(holdings: Holdings, provider: Optional[MarketDataProvider] = None) -> pd.DataFrame:
+    """
+    The holdings frame every tab starts from: latest prices in the base currency and values.
+
+    One batched quote lookup per distinct symbol, converted at the latest FX
+    rates. Holdings without a quote are dropped; holdings whose currency has
+    no FX rate are kept with a NaN ``price`` and ``value`` (see
+    :func:`unconverted_tickers`) rather than silently leaving the portfolio.
+
+    Returns:
+        pd.DataFrame: ``ticker`` (categorical), ``quantity``, ``currency``, ``fx_rate``, ``price``, ``value``.
+    """
+    provider = provider or get_provider()
+    df = holdings.to_frame()
+    tickers = df["ticker"]
+    symbols = tickers.cat.categories.tolist()
+    fx = FXRates(provider)
+    quotes = provider.quotes(symbols)
+    currencies = pd.Series(fx.currencies(symbols)).reindex(symbols)
+    rates = currencies.map(fx.spot(currencies.unique())).to_numpy(dtype=float)
+    prices = quotes["price"].reindex(symbols).to_numpy()
+    codes = tickers.array.codes
+    df["currency"], df["fx_rate"], df["price"] = currencies.to_numpy()[codes], rates[codes], (prices * rates)[codes]
+    df["value"] = df["price"] * df["quantity"]
+    return df[prices[codes] > 0]
+
+
+def unconverted_tickers(df: pd.DataFrame) -> List[str]:
+    """Tickers in a :func:`price_holdings` frame that are quoted but have no FX rate to the base currency."""
+    return unique_tickers(df.loc[df["fx_rate"].isna(), "ticker"].astype(str))
+
+
+def weighted_average(values, weights) -> float:
+    """Value-weighted mean over the rows where both are known (NaN when none are)."""
+    values, weights = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+    known = ~(np.isnan(values) | np.isnan(weights))
+    if not weights[known].sum():
+        return np.nan
+    return float(np.average(values[known], weights=weights[known]))
+
+
+# ----- Overview -----
+@dataclass
+class OverviewResult:
+    holdings: pd.DataFrame  # one row per holding, with volatility, div_yield, sector and exchange
+    portfolio_volatility: float
+    dividend_yield: float
+    sector_count: int
+    top_holding: str
+    regions: pd.Series  # percent of value per region
+    sectors: pd.DataFrame  # sector, value; largest first
+    history: pd.DataFrame  # "Portfolio Value" and "S&P 500 (SPY)" over the last 30 sessions
+
+    @property
+    def tickers(self) -> List[str]:
+        return self.holdings["ticker"].tolist()
+
+    @property
+    def total_value(self) -> float:
+        return float(self.holdings["value"].sum())
+
+
+def compute_overview(df: pd.DataFrame, analytics: Optional[PortfolioAnalytics] = None,
+                     provider: Optional[MarketDataProvider] = None) -> OverviewResult:
+    df = _labelled(df)
+    provider = provider or get_provider()
+    analytics = analytics or PortfolioAnalytics.from_provider(df, provider)
+    tickers = df["ticker"].tolist()
+    infos = provider.info(tickers, fields=["dividendYield", "sector"])
+
+    df["volatility"] = df["ticker"].map(analytics.volatility)
+    portfolio_volatility = weighted_average(df["volatility"], df["value"])
+
+    df["div_yield"] = df["ticker"].map(lambda t: infos.get(t, {}).get("dividendYield", 0))
+    weighted_div_yield = weighted_average(df["div_yield"].fillna(0), df["value"])
+
+    df["sector"] = df["ticker"].map({t: infos.get(t, {}).get("sector", "Unknown") for t in tickers})
+    top_holding = df.loc[df["value"].idxmax()]["ticker"] if df["value"].notna().any() else "N/A"
+
+    # Reuses the computed values; only tickers without a telling suffix need their cached exchange code
+    df["exchange"] = df["ticker"].map(exchange_codes(tickers))
+
+    portfolio = analytics.portfolio_history.dropna().iloc[-HISTORY_DAYS:]
+    history = pd.DataFrame({
+        "Portfolio Value": portfolio,
+        "S&P 500 (SPY)": analytics.benchmark.reindex(portfolio.index, method="ffill")
+    }).dropna()
+
+    return OverviewResult(
+        holdings=df,
+        portfolio_volatility=portfolio_volatility,
+        dividend_yield=weighted_div_yield,
+        sector_count=df["sector"].nunique(),
+        top_holding=top_holding,
+        regions=region_weights(df),
+        sectors=df.groupby("sector")["value"].sum().reset_index().sort_values("value", ascending=False),
+        history=history,
+    )
+
+
+def reprice(holdings: pd.DataFrame, quotes: pd.DataFrame) -> Tuple[pd.Series, pd.Series, float]:
+    """
+    Values and daily change per holding from fresh ``quotes`` (converted at the stored FX rate).
+
+    Returns ``(value, daily_change_pct, benchmark_price)``.
+    """
+    rate = holdings["fx_rate"] if "fx_rate" in holdings else 1.0
+    price = (holdings["ticker"].map(quotes["price"]) * rate).fillna(holdings["price"])
+    # Previous closes are in the quote currency; convert them at the same rate as the price
+    prev_close = holdings["ticker"].map(quotes["previous_close"]) * rate
+    value = price * holdings["quantity"]
+    daily_change_pct = ((price - prev_close) / prev_close) * 100
+    return value, daily_change_pct, quotes["price"].get(BENCHMARK, np.nan)
+
+
+# ----- Price Change -----
+@dataclass
+class PriceChangeResult:
+    metrics: pd.DataFrame  # holdings plus 1D/1W/1M %, volatility, drawdown and 52-week-high columns
+    history: pd.DataFrame  # closes over the last 90 days
+    tickers: List[str]
+    analytics: PortfolioAnalytics = field(repr=False)  # for other return periods, see period_change
+
+
+def period_change(df: pd.DataFrame, analytics: PortfolioAnalytics, period: str,
+                  provider: Optional[MarketDataProvider] = None) -> pd.Series:
+    """
+    Percent change per ticker over ``period``, in the base currency.
+
+    Sliced from the analytics matrix when it covers ``period``; longer
+    windows are fetched and converted at the same daily FX rates, so every
+    period of the selector is on one currency basis.
+    """
+    start = window_start(period)
+    if start is not None and start >= window_start(ANALYTICS_PERIOD):
+        return analytics.change(period)
+    return PortfolioAnalytics.from_provider(df, provider, period=period).change(period)
+
+
+def compute_price_change(df: pd.DataFrame, analytics: Optional[PortfolioAnalytics] = None,
+                         provider: Optional[MarketDataProvider] = None) -> PriceChangeResult:
+    """
+    Return, volatility and drawdown metrics per holding.
+
+    All of them come from closes converted to the base currency at each
+    day's FX rate, so for foreign listings they include the currency move
+    (a yen stock's 1Y % is what a USD holder earned, not the Tokyo quote's
+    change).
+    """
+    df = _labelled(df)
+    provider = provider or get_provider()
+    analytics = analytics or PortfolioAnalytics.from_provider(df, provider)
+    tickers = df["ticker"].tolist()
+    infos = provider.info(tickers, fields=["fiftyTwoWeekHigh"])
+
+    df["1D %"] = df["ticker"].map(analytics.change("2d"))
+    df["1W %"] = df["ticker"].map(analytics.change("7d"))
+    df["1M %"] = df["ticker"].map(analytics.change("30d"))
+    df["Volatility (30d)"] = df["ticker"].map(analytics.volatility * 100)
+    df["Max Drawdown (90d)"] = df["ticker"].map(analytics.max_drawdown("90d"))
+    high = {t: infos.get(t, {}).get("fiftyTwoWeekHigh", np.nan) for t in tickers}
+    df["52W High"] = df["ticker"].map(high).astype(float) * df.get("fx_rate", 1.0)
+    df["From 52W High"] = ((df["price"] - df["52W High"]) / df["52W High"]) * 100
+
+    return PriceChangeResult(metrics=df, history=analytics.window(PRICE_HISTORY_WINDOW),
+                             tickers=unique_tickers(df["ticker"]), analytics=analytics)
+
+
+# ----- Value Over Time -----
+@dataclass
+class ValueOverTimeResult:
+    prices: pd.DataFrame  # holdings' closes in the base currency
+    benchmarks: pd.DataFrame  # benchmark closes, unconverted
+    returns: pd.DataFrame  # per ticker: 1M/6M/1Y/5Y % and max drawdown %
+    volatility: pd.DataFrame  # 30-day rolling volatility of daily returns, in %
+
+    @property
+    def empty(self) -> bool:
+        return self.prices.empty and self.benchmarks.empty
+
+
+def fetch_price_history(tickers, start, provider: Optional[MarketDataProvider] = None) -> pd.DataFrame:
+    data = (provider or get_provider()).close(tickers, start=start)
+    return data.dropna(axis=1, how="all") if not data.empty else pd.DataFrame()
+
+
+def calculate_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Trailing returns over :data:`RETURN_WINDOWS` and max drawdown, in percent, per ticker."""
+    returns = pd.DataFrame(index=prices.columns)
+    if prices.empty:
+        return returns.assign(**{name: np.nan for name in [*RETURN_WINDOWS, "Max Drawdown %"]})
+    today = prices.index[-1]
+    for name, days in RETURN_WINDOWS.items():
+        past = prices.index[prices.index >= today - pd.Timedelta(days=days)][0]
+        returns[name] = ((prices.loc[today] - prices.loc[past]) / prices.loc[past]) * 100
+    returns["Max Drawdown %"] = ((prices / prices.cummax()) - 1).min() * 100
+    return returns.round(2)
+
+
+def compute_value_over_time(tickers: List[str], benchmarks: List[str], start,
+                            provider: Optional[MarketDataProvider] = None) -> ValueOverTimeResult:
+    provider = provider or get_provider()
+    price_data = fetch_price_history(list(dict.fromkeys(tickers + benchmarks)), start, provider)
+    if price_data.empty:
+        return ValueOverTimeResult(*(pd.DataFrame() for _ in range(4)))
+
+    benchmark_data = price_data[[b for b in benchmarks if b in price_data]].dropna(axis=1, how="all")
+    stock_data = price_data.drop(columns=benchmarks, errors="ignore")
+
+    # FX conversion (silent): each day's price at that day's rate into the base currency
+    fx = FXRates(provider)
+    stock_data = fx.convert(stock_data, fx.currencies(stock_data.columns))
+
+    return ValueOverTimeResult(
+        prices=stock_data,
+        benchmarks=benchmark_data,
+        returns=calculate_returns(stock_data),
+        volatility=indicators.rolling_volatility(stock_data, 30, annualize=False) * 100,
+    )
+
+
+# ----- Portfolio Classification -----
+@dataclass
+class ClassificationResult:
+    features: pd.DataFrame  # risk features per ticker, with rule-based "Risk" and model "Predicted Risk"
+    portfolio_risk: str
+    averages: Dict[str, float]  # mean Volatility, Beta, P/E Ratio and Dividend Yield
+    safest: pd.DataFrame
+    riskiest: pd.DataFrame
+
+    @property
+    def key_metrics(self) -> Dict[str, str]:
+        beta, dividend = self.averages["Beta"], self.averages["Dividend Yield"]
+        return {
+            "Avg Beta": f"{beta:.2f}" if not pd.isna(beta) else "N/A",
+            "Avg Dividend Yield": f"{dividend:.2f}%" if not pd.isna(dividend) else "N/A"
+        }
+
+
+def compute_classification(df: pd.DataFrame, analytics: Optional[PortfolioAnalytics] = None,
+                           provider: Optional[MarketDataProvider] = None) -> Optional[ClassificationResult]:
+    """The portfolio's risk breakdown, or ``None`` when no ticker has usable data."""
+    features = extract_features(df["ticker"].dropna().astype(str), provider, analytics)
+    if features.empty:
+        return None
+
+    # The classifier is trained offline (python -m stock_dashboard.risk_model train) and loaded once
+    # per process; every holding is scored in one call, falling back to the rules without a model
+    features["Risk"] = label_risk(features)
+    features["Predicted Risk"] = predict_risk(features)
+
+    return ClassificationResult(
+        features=features,
+        portfolio_risk=features["Predicted Risk"].value_counts().idxmax(),
+        averages={name: features[name].mean() for name in ("Volatility", "Beta", "P/E Ratio", "Dividend Yield")},
+        safest=features[features["Predicted Risk"] == "Low"].nsmallest(3, "Volatility"),
+        riskiest=features[features["Predicted Risk"] == "High"].nlargest(3, "Volatility"),
+    )
+
+
+# ----- Summary -----
+@dataclass
+class SummaryResult:
+    ticker: str
+    info: dict
+    history: pd.DataFrame  # one year of OHLCV bars with the technicals columns
+    state: Optional[indicators.RollingIndicators] = field(default=None, repr=False)
+
+    @property
+    def price(self) -> float:
+        return self.history["Close"].iloc[-1]
+
+    @property
+    def avg_volume(self) -> float:
+        return self.history["Volume"].rolling(20).mean().iloc[-1]
+
+    @property
+    def rsi(self) -> float:
+        return self.history["RSI"].iloc[-1]
+
+
+def compute_summary(ticker: str, provider: Optional[MarketDataProvider] = None,
+                    previous: Optional[SummaryResult] = None) -> SummaryResult:
+    """
+    Info and technicals for one ticker.
+
+    With the ``previous`` result for the same ticker, bars newer than its
+    frame are fed through its streaming indicator state (O(1) each) instead
+    of recomputing the year.
+    """
+    provider = provider or get_provider()
+    info = provider.ticker_info(ticker)
+    bars = provider.ohlcv(ticker, period="1y")
+
+    hist, state = (previous.history, previous.state) if previous is not None else (None, None)
+    if hist is not None and state is not None and len(hist) > 1 and hist.index[-1] in bars.index \
+            and np.isclose(bars["Close"].get(hist.index[-2], np.nan), hist["Close"].iloc[-2]):
+        last = hist.index[-1]
+        rows = []
+        for date, bar in bars.loc[bars.index >= last].iterrows():
+            values = state.update(bar["Close"], replace_last=date == last)
+            rows.append({**bar.to_dict(), **values, "Date": date})
+        new_rows = pd.DataFrame(rows).set_index("Date")
+        hist = pd.concat([hist.iloc[:-1], new_rows[hist.columns]])
+        hist = hist.loc[hist.index >= bars.index[0]]
+    else:
+        hist = bars.copy()
+        for name, values in indicators.technicals(hist["Close"]).items():
+            hist[name] = values
+        state = indicators.RollingIndicators.from_prices(hist["Close"])
+    return SummaryResult(ticker=ticker, info=info, history=hist, state=state)
+
+
+# ----- Export -----
+@dataclass
+class ExportResult:
+    key: str  # cache key: holdings hash, data version and options
+    archive: bytes  # the ZIP package
+
+
+def compute_export(df: pd.DataFrame, provider: Optional[MarketDataProvider] = None,
+                   per_ticker_sheets: bool = False, sidecar: Optional[str] = None) -> ExportResult:
+    provider = provider or get_provider()
+    archive = build_export(df, provider, per_ticker_sheets=per_ticker_sheets, sidecar=sidecar)
+    return ExportResult(key=export_key(df, provider, per_ticker_sheets, sidecar), archive=archive)
@@ -0,0 +1,106 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# About one point per horizontal pixel of a full-width chart.
+DEFAULT_MAX_POINTS = 1500
+# Above this many points in a figure, traces render with WebGL.
+WEBGL_THRESHOLD = 20_000
+
+
+def _as_float(x) -> np.ndarray:
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of each bucket's minimum and maximum (plus both end points).
+
+    Fully vectorized; keeps every spike visible, which matters more than
+    shape fidelity for volatile series.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(int)
+    # Lay the buckets out as rows of one padded 2-D array so argmin/argmax run once
+    width = int(np.diff(edges).max())
+    idx = edges[:-1, None] + np.arange(width)[None, :]
+    valid = idx < edges[1:, None]
+    block = y[np.minimum(idx, n - 2)]
+    lo = np.where(valid, block, np.inf).argmin(axis=1)
+    hi = np.where(valid, block, -np.inf).argmax(axis=1)
+    picks = np.concatenate([[0], edges[:-1] + lo, edges[:-1] + hi, [n - 1]])
+    return np.unique(picks)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: the ``n_out`` points that best keep the line's shape.
+
+    Each bucket contributes the point forming the largest triangle with the
+    previously chosen point and the next bucket's average.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Next-bucket averages for every bucket at once
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    avg_x, avg_y = np.append(avg_x[1:], x[-1]), np.append(avg_y[1:], y[-1])
+
+    picks = np.empty(n_out, dtype=np.int64)
+    picks[0], picks[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        picks[i + 1] = a
+    return picks
+
+
+def downsample(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS, method: str = "lttb") -> pd.Series:
+    """
+    Reduce a date-indexed series to at most ``max_points`` points.
+
+    NaNs are dropped first; ``method`` is ``"lttb"`` (shape-preserving) or
+    ``"minmax"`` (extreme-preserving, fully vectorized).
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    if method == "minmax":
+        picks = minmax_indices(series.to_numpy(dtype=float), max_points)
+    else:
+        picks = lttb_indices(series.index.to_numpy(), series.to_numpy(dtype=float), max_points)
+    return series.iloc[picks]
+
+
+def line_trace(series: pd.Series, webgl: bool = False, max_points: Optional[int] = DEFAULT_MAX_POINTS,
+               method: str = "lttb", **kwargs):
+    """
+    A Plotly line trace for ``series``, downsampled to ``max_points``.
+
+    ``webgl=True`` gives a ``Scattergl`` trace, which the browser draws on the
+    GPU; pick it with :func:`use_webgl` for figures holding many points.
+    Other keyword arguments go to the trace constructor.
+    """
+    if max_points:
+        series = downsample(series, max_points, method)
+    trace = go.Scattergl if webgl else go.Scatter
+    return trace(x=series.index, y=series.to_numpy(), mode="lines", **kwargs)
+
+
+def use_webgl(*frames: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS, threshold: int = WEBGL_THRESHOLD) -> bool:
+    """Whether the figure drawing ``frames`` would still exceed ``threshold`` points after downsampling."""
+    points = sum(min(int(count), max_points) for frame in frames for count in frame.count())
+    return points > threshold
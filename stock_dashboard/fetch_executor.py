@@ -0,0 +1,136 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 5.0  # upstream requests per second
+DEFAULT_BURST = 10
+DEFAULT_TIMEOUT = 20.0  # seconds per request, counted from when it is let through
+STALL_HEADROOM = 4  # pool threads per slot, so hung requests cannot starve later fetches
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens/second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class FetchExecutor:
+    """
+    Bounded thread pool for upstream requests.
+
+    Every request first takes one of ``max_workers`` slots and a token from a
+    shared :class:`TokenBucket`, so concurrency never exceeds ``max_workers``
+    and the request rate never exceeds ``rate`` however many callers share the
+    executor. A request that runs longer than ``timeout`` is abandoned and
+    reported as ``default``: its slot is handed back at once and its thread is
+    left to finish on spare pool capacity, so a hung request cannot starve
+    later fetches.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, rate: float = DEFAULT_RATE,
+                 burst: int = DEFAULT_BURST, timeout: float = DEFAULT_TIMEOUT):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate, burst)
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers * STALL_HEADROOM, thread_name_prefix="fetch")
+
+    def deadline(self, n_items: int) -> float:
+        """Longest a :meth:`map` over ``n_items`` can take: every item let through at ``rate`` and timing out."""
+        return math.ceil(n_items / self.max_workers) * self.timeout + n_items / self.limiter.rate
+
+    def map(self, fn: Callable[[Hashable], Any], items: Iterable[Hashable], default: Any = None) -> Dict[Hashable, Any]:
+        """
+        Run ``fn(item)`` for every item concurrently.
+
+        Args:
+            fn (callable): The upstream call for one item.
+            items (iterable): Hashable work items, usually ticker symbols.
+            default: Result recorded for items that raise or time out.
+
+        Returns:
+            dict: ``{item: result}`` in the order the items were given.
+        """
+        items = list(dict.fromkeys(items))
+        started: Dict[Hashable, float] = {}
+        released = set()
+        lock = threading.Lock()
+
+        def release(item):
+            with lock:
+                if item in released:
+                    return
+                released.add(item)
+            self._slots.release()
+
+        def run(item):
+            self._slots.acquire()
+            try:
+                self.limiter.acquire()
+                started[item] = time.monotonic()
+                return fn(item)
+            finally:
+                release(item)
+
+        futures = {self._pool.submit(run, item): item for item in items}
+        results = {item: default for item in items}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results[futures[future]] = future.result()
+                except Exception:
+                    pass
+            now = time.monotonic()
+            for future in [f for f in pending if futures[f] in started]:
+                item = futures[future]
+                if now - started[item] > self.timeout:
+                    release(item)
+                    pending.discard(future)
+        return results
+
+
+_executor: Optional[FetchExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> FetchExecutor:
+    """
+    Return the process-wide executor, so the rate limit holds across sessions.
+
+    Configured with ``PORTFOLIO_FETCH_WORKERS``, ``PORTFOLIO_FETCH_RATE``,
+    ``PORTFOLIO_FETCH_BURST`` and ``PORTFOLIO_FETCH_TIMEOUT``.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FetchExecutor(
+                max_workers=int(os.environ.get("PORTFOLIO_FETCH_WORKERS", DEFAULT_WORKERS)),
+                rate=float(os.environ.get("PORTFOLIO_FETCH_RATE", DEFAULT_RATE)),
+                burst=int(os.environ.get("PORTFOLIO_FETCH_BURST", DEFAULT_BURST)),
+                timeout=float(os.environ.get("PORTFOLIO_FETCH_TIMEOUT", DEFAULT_TIMEOUT)),
+            )
+        return _executor
@@ -0,0 +1,96 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from stock_dashboard.fetch_executor import get_executor
+
+BatchFetcher = Callable[[List[str]], Dict[str, Any]]
+
+logger = logging.getLogger(__name__)
+
+
+class FetchService:
+    """
+    asyncio fetch pipeline that coalesces identical in-flight requests.
+
+    Streamlit runs every session in its own thread of one process. All of
+    them hand their lookups to this service, whose event loop runs in a
+    daemon thread: a ``(endpoint, symbol, window)`` already being fetched is
+    awaited instead of requested again, so a burst of sessions asking for the
+    same quotes costs one upstream call per unique symbol. Blocking batch
+    fetchers run in the loop's default thread pool.
+
+    A caller waits at most ``timeout(n_symbols)`` seconds (by default the
+    shared :class:`FetchExecutor`'s :meth:`~FetchExecutor.deadline`). After
+    that its symbols come back unresolved, as for a failed fetch, and their
+    in-flight entries are released so the next caller retries.
+    """
+
+    def __init__(self, timeout: Optional[Callable[[int], float]] = None):
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fetch-service", daemon=True)
+        self._thread.start()
+
+    async def fetch_async(self, endpoint: str, symbols: List[str], window: Hashable, fetch: BatchFetcher) -> Dict[str, Any]:
+        """
+        Resolve ``symbols`` for one endpoint/window, joining in-flight requests.
+
+        Only the symbols nobody is fetching yet are passed to ``fetch`` (as one
+        batch); the rest wait on the futures of the requests already running.
+        Must be awaited on the service loop.
+        """
+        waiting, owned = {}, []
+        for symbol in symbols:
+            key = (endpoint, symbol, window)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._loop.create_future()
+                self._inflight[key] = future
+                owned.append(symbol)
+            waiting[symbol] = future
+
+        if owned:
+            fetched = {}
+            try:
+                fetched = await self._loop.run_in_executor(None, fetch, owned)
+            except Exception:
+                pass
+            finally:
+                # Also runs when a timed-out caller is cancelled, so joiners are never left waiting
+                for symbol in owned:
+                    future = self._inflight.pop((endpoint, symbol, window))
+                    if not future.done():
+                        future.set_result(fetched.get(symbol))
+
+        # Shielded: cancelling one caller must not cancel a future other callers share
+        return {symbol: await asyncio.shield(future) for symbol, future in waiting.items()}
+
+    def fetch(self, endpoint: str, symbols: List[str], window: Hashable, fetch: BatchFetcher) -> Dict[str, Any]:
+        """Synchronous facade for render functions and other non-async callers."""
+        if not symbols:
+            return {}
+        timeout = (self.timeout or get_executor().deadline)(len(symbols))
+        future = asyncio.run_coroutine_threadsafe(self.fetch_async(endpoint, symbols, window, fetch), self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("%s fetch for %d symbols gave up after %.1fs", endpoint, len(symbols), timeout)
+            return {}
+
+
+_service: Optional[FetchService] = None
+_service_lock = threading.Lock()
+
+
+def get_fetch_service() -> FetchService:
+    """Return the process-wide service shared by every Streamlit session."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FetchService()
+        return _service
@@ -0,0 +1,118 @@
+import os
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard.market_data import MarketDataProvider, get_provider
+
+DEFAULT_BASE_CURRENCY = "USD"
+PIVOT = "USD"  # every rate is fetched against USD and crossed through it
+
+# Yahoo quotes some listings in minor units (LSE in pence, JSE in cents, TASE in agorot).
+MINOR_UNITS = {"GBp": ("GBP", 0.01), "GBX": ("GBP", 0.01), "ZAc": ("ZAR", 0.01), "ILA": ("ILS", 0.01)}
+
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "CHF": "CHF ", "INR": "₹", "KRW": "₩"}
+
+
+def base_currency() -> str:
+    """Reporting currency, set with ``PORTFOLIO_BASE_CURRENCY`` (default USD)."""
+    return os.environ.get("PORTFOLIO_BASE_CURRENCY", DEFAULT_BASE_CURRENCY).upper()
+
+
+def currency_symbol(currency: str) -> str:
+    return CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+
+
+def major_unit(currency: Optional[str]):
+    """``(ISO code, multiplier)`` turning an amount in ``currency`` into its major unit."""
+    if not currency:
+        return PIVOT, 1.0
+    if currency in MINOR_UNITS:
+        return MINOR_UNITS[currency]
+    return currency.upper(), 1.0
+
+
+def pair_symbol(currency: str) -> str:
+    """Yahoo symbol quoting one unit of ``currency`` in USD."""
+    return f"{currency}{PIVOT}=X"
+
+
+class FXRates:
+    """
+    Daily exchange rates, crossed through USD.
+
+    Only ``<CCY>USD=X`` series are fetched, through the market-data provider,
+    so they share its memo and on-disk price store with every other series
+    (a refresh only downloads the new bars). Any ``A -> B`` rate is then
+    triangulated as ``A/USD / B/USD``, and whole price matrices are converted
+    with one aligned multiply rather than per-ticker loops.
+
+    Args:
+        provider (MarketDataProvider, optional): Defaults to :func:`get_provider`.
+        base (str, optional): Target currency; defaults to :func:`base_currency`.
+    """
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None, base: Optional[str] = None):
+        self.provider = provider or get_provider()
+        self.base = (base or base_currency()).upper()
+
+    def currencies(self, tickers: Iterable[str]) -> Dict[str, str]:
+        """Quote currency per ticker as reported by ``.info`` (USD when unknown)."""
+        tickers = list(tickers)
+        infos = self.provider.info(tickers, fields=["currency"])
+        return {t: infos.get(t, {}).get("currency") or PIVOT for t in tickers}
+
+    def usd_rates(self, currencies: Iterable[str], period: Optional[str] = None, start=None) -> pd.DataFrame:
+        """
+        USD per one major unit of each ISO currency, dates x currencies.
+
+        Missing days (FX holidays) are carried forward; a currency with no
+        data at all is left as a NaN column.
+        """
+        currencies = list(dict.fromkeys(c.upper() for c in currencies))
+        foreign = [c for c in currencies if c != PIVOT]
+        closes = self.provider.close([pair_symbol(c) for c in foreign], period=period, start=start)
+        if closes.empty:
+            closes = pd.DataFrame(index=pd.DatetimeIndex([pd.Timestamp.today().normalize()], name="Date"))
+        rates = pd.DataFrame(
+            {c: closes[pair_symbol(c)] if pair_symbol(c) in closes else np.nan for c in foreign},
+            index=closes.index, dtype=float,
+        )
+        rates[PIVOT] = 1.0
+        return rates.reindex(columns=currencies).ffill()
+
+    def rates(self, currencies: Iterable[str], base: Optional[str] = None, period: Optional[str] = None,
+              start=None) -> pd.DataFrame:
+        """``base`` per one unit of each currency (minor units included), dates x currencies."""
+        base = (base or self.base).upper()
+        currencies = list(dict.fromkeys(currencies))
+        units = {c: major_unit(c) for c in currencies}
+        usd = self.usd_rates([iso for iso, _ in units.values()] + [base], period=period, start=start)
+        cross = usd.div(usd[base], axis=0)
+        return pd.DataFrame({c: cross[iso] * factor for c, (iso, factor) in units.items()}, index=usd.index)
+
+    def spot(self, currencies: Iterable[str], base: Optional[str] = None) -> pd.Series:
+        """Latest ``base`` per one unit of each currency (NaN when unknown)."""
+        currencies = list(dict.fromkeys(currencies))
+        return self.rates(currencies, base=base, period="7d").iloc[-1]
+
+    def convert(self, prices: pd.DataFrame, currencies: Mapping[str, str], base: Optional[str] = None) -> pd.DataFrame:
+        """
+        Convert a dates x tickers price matrix into ``base`` at each day's rate.
+
+        Rates are aligned to the price dates (carried forward over FX
+        holidays, back-filled before the first fixing) and applied with a
+        single element-wise multiply. Columns whose rate is unknown are NaN.
+        """
+        if prices.empty:
+            return prices
+        column_ccy = [currencies.get(t) or PIVOT for t in prices.columns]
+        rates = self.rates(set(column_ccy), base=base, start=prices.index[0])
+        rates = rates.reindex(rates.index.union(prices.index)).ffill().bfill().reindex(prices.index)
+        return prices * rates[column_ccy].to_numpy()
+
+    def convert_latest(self, amounts: pd.Series, currencies: pd.Series, base: Optional[str] = None) -> pd.Series:
+        """Convert row-aligned ``amounts`` in ``currencies`` at the latest rates."""
+        spot = self.spot(pd.unique(currencies), base=base)
+        return amounts * currencies.map(spot).to_numpy(dtype=float)
@@ -1,13 +1,15 @@
 import logging
-import yfinance as yf
 from typing import Optional, Dict, Any
 import pandas as pd
 import streamlit as st
+from stock_dashboard.market_data import get_provider
+
+logger = logging.getLogger(__name__)
 
 
 def get_info_on_stock(ticker: str) -> Dict[str, Any]:
     """
-    Fetch stock information for a given ticker using yfinance.
+    Fetch stock information for a given ticker through the shared market-data provider.
 
     Args:
         ticker (str): The stock ticker symbol.
@@ -16,15 +18,11 @@ def get_info_on_stock(ticker: str) -> Dict[str, Any]:
         dict: A dictionary containing stock information.
     """
     try:
-        stock = yf.Ticker(ticker)
-        stock_info = stock.info
+        stock_info = get_provider().ticker_info(ticker)
         # Removed the debugging output to avoid displaying stock info
         # st.write(f"Stock Info for {ticker}: {stock_info}")  # Debugging output
         return stock_info
     except Exception as e:
+        logger.warning("info lookup failed for %s: %s", ticker, e)
         st.error(f"Error fetching data for {ticker}: {e}")
         return {}
-
-
-# Configure logging
-logging.basicConfig(filename='stock_data.log', level=logging.INFO, format='%(asctime)s - %(message)s')
\ No newline at end of file
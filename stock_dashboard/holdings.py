@@ -0,0 +1,185 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MIN_CAPACITY = 16
+
+
+def _code_dtype(n_symbols: int) -> np.dtype:
+    """Smallest integer dtype for ``n_symbols`` codes (the one pandas picks for categoricals)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_symbols < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def normalize_ticker(ticker) -> str:
+    """Canonical symbol spelling: stripped and upper-case (``""`` for blanks)."""
+    return str(ticker).strip().upper() if isinstance(ticker, str) else ""
+
+
+class Holding:
+    """One position, as handed out when iterating :class:`Holdings`."""
+
+    __slots__ = ("ticker", "quantity")
+
+    def __init__(self, ticker: str, quantity: float):
+        self.ticker = ticker
+        self.quantity = quantity
+
+    def __repr__(self) -> str:
+        return f"Holding({self.ticker!r}, {self.quantity!r})"
+
+
+class Holdings:
+    """
+    Columnar, memory-compact list of positions.
+
+    Each distinct symbol is stored once (interned) and positions hold a small
+    integer code into that symbol table next to a ``float64`` quantity, both
+    in growable NumPy buffers. A 50k-row book costs ~10 bytes per position plus
+    one string per distinct symbol, instead of a dict and two boxed objects per
+    row. :meth:`to_frame` wraps the buffers in a DataFrame (categorical
+    ``ticker``, ``quantity``) without copying them.
+    """
+
+    __slots__ = ("_symbols", "_index", "_codes", "_quantities", "_size")
+
+    def __init__(self, tickers: Iterable[str] = (), quantities: Iterable[float] = ()):
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._codes = np.empty(MIN_CAPACITY, dtype=_code_dtype(0))
+        self._quantities = np.empty(MIN_CAPACITY, dtype=np.float64)
+        self._size = 0
+        self.extend(tickers, quantities)
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> "Holdings":
+        """Build from ``{"ticker", "quantity"}`` dicts or :class:`Holding` objects."""
+        tickers, quantities = [], []
+        for record in records:
+            if isinstance(record, Holding):
+                tickers.append(record.ticker)
+                quantities.append(record.quantity)
+            else:
+                tickers.append(record.get("ticker"))
+                quantities.append(record.get("quantity"))
+        return cls(tickers, quantities)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "Holdings":
+        """Build from a frame with ``ticker`` and ``quantity`` columns."""
+        if frame.empty:
+            return cls()
+        return cls(frame["ticker"], frame["quantity"])
+
+    # ----- building -----
+    def _reserve(self, extra: int) -> None:
+        """Grow the buffers for ``extra`` rows and widen codes for the current symbol count."""
+        needed = self._size + extra
+        code_dtype = _code_dtype(len(self._symbols))
+        if needed <= len(self._codes) and code_dtype == self._codes.dtype:
+            return
+        capacity = max(needed, 2 * len(self._codes)) if needed > len(self._codes) else len(self._codes)
+        for name, dtype in (("_codes", code_dtype), ("_quantities", np.float64)):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _code(self, ticker: str) -> int:
+        code = self._index.get(ticker)
+        if code is None:
+            code = self._index[ticker] = len(self._symbols)
+            self._symbols.append(sys.intern(ticker))
+        return code
+
+    def extend(self, tickers: Iterable[str], quantities: Iterable[float]) -> None:
+        """
+        Append positions in bulk.
+
+        Tickers are normalized and quantities coerced to float; rows with a
+        blank ticker or a missing, non-positive quantity are dropped.
+        """
+        tickers = pd.Series(list(tickers), dtype=object).map(normalize_ticker)
+        quantities = pd.to_numeric(pd.Series(list(quantities), dtype=object), errors="coerce").to_numpy(dtype=float)
+        if len(tickers) != len(quantities):
+            raise ValueError("tickers and quantities must have the same length")
+        keep = (tickers != "").to_numpy() & (quantities > 0)
+        if not keep.any():
+            return
+        # Factorize once, then intern only the distinct symbols
+        codes, uniques = pd.factorize(tickers[keep])
+        table = np.fromiter((self._code(t) for t in uniques), dtype=np.int64, count=len(uniques))
+        n = int(keep.sum())
+        self._reserve(n)
+        self._codes[self._size:self._size + n] = table[codes]
+        self._quantities[self._size:self._size + n] = quantities[keep]
+        self._size += n
+
+    def append(self, ticker: str, quantity: float) -> None:
+        self.extend([ticker], [quantity])
+
+    # ----- access -----
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> Holding:
+        if not -self._size <= i < self._size:
+            raise IndexError(i)
+        i %= self._size
+        return Holding(self._symbols[self._codes[i]], float(self._quantities[i]))
+
+    def __iter__(self) -> Iterator[Holding]:
+        for code, quantity in zip(self._codes[:self._size], self._quantities[:self._size]):
+            yield Holding(self._symbols[code], float(quantity))
+
+    @property
+    def symbols(self) -> List[str]:
+        """Distinct symbols in first-seen order."""
+        return list(self._symbols)
+
+    @property
+    def quantities(self) -> np.ndarray:
+        """Read-only view of the quantity buffer."""
+        view = self._quantities[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held, buffers plus the symbol table."""
+        return (self._codes.nbytes + self._quantities.nbytes
+                + sum(sys.getsizeof(s) for s in self._symbols))
+
+    def to_frame(self, categorical: bool = True) -> pd.DataFrame:
+        """
+        The positions as a ``ticker``/``quantity`` DataFrame.
+
+        The categorical ``ticker`` column reuses the code buffer and
+        ``quantity`` a read-only view of the float buffer, so no per-row data
+        is copied and writing to the column raises instead of changing the
+        container. ``categorical=False`` gives plain string tickers for
+        editing widgets.
+        """
+        codes = self._codes[:self._size]
+        tickers = pd.Categorical.from_codes(codes, categories=pd.Index(self._symbols, dtype=object))
+        if not categorical:
+            tickers = np.asarray(tickers, dtype=object)
+        return pd.DataFrame({"ticker": tickers, "quantity": self.quantities}, copy=False)
+
+    def __repr__(self) -> str:
+        return f"Holdings({self._size} positions, {len(self._symbols)} symbols)"
+
+
+def as_holdings(portfolio: Optional[object]) -> Holdings:
+    """Coerce a session-state portfolio (container, frame or list of dicts) to :class:`Holdings`."""
+    if portfolio is None:
+        return Holdings()
+    if isinstance(portfolio, Holdings):
+        return portfolio
+    if isinstance(portfolio, pd.DataFrame):
+        return Holdings.from_frame(portfolio)
+    return Holdings.from_records(portfolio)
@@ -0,0 +1,283 @@
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+Prices = Union[pd.Series, pd.DataFrame]
+
+
+def _on_own_bars(prices: Prices, func: Callable[[pd.DataFrame], Any]) -> Any:
+    """
+    Apply a causal frame transform to each column's non-NaN bars only.
+
+    Columns of a wide frame usually come from different exchanges, so NaN gaps
+    from other markets' trading days must not count as window entries. Valid
+    values are packed to the top of each column (keeping their order),
+    ``func`` runs once on the packed frame, and results are scattered back to
+    the original rows. Works because rolling/ewm/cumulative ops never look
+    ahead, so the NaN padding at the bottom cannot leak into real rows.
+    ``func`` may return one frame or a dict of frames.
+    """
+    is_series = isinstance(prices, pd.Series)
+    frame = prices.to_frame() if is_series else prices
+    values = frame.to_numpy(dtype=float)
+    mask = ~np.isnan(values)
+    order = None if mask.all() else np.argsort(~mask, axis=0, kind="stable")
+    packed = values if order is None else np.take_along_axis(values, order, axis=0)
+
+    def scatter(result):
+        result = np.asarray(result, dtype=float)
+        if order is None:
+            out = result
+        else:
+            out = np.empty_like(values)
+            np.put_along_axis(out, order, result, axis=0)
+            out[~mask] = np.nan
+        out = pd.DataFrame(out, index=frame.index, columns=frame.columns)
+        return out.iloc[:, 0].rename(prices.name) if is_series else out
+
+    result = func(pd.DataFrame(packed))
+    if isinstance(result, dict):
+        return {key: scatter(value) for key, value in result.items()}
+    return scatter(result)
+
+
+def _window_sums(cumulative: np.ndarray, window: int) -> np.ndarray:
+    """Trailing ``window`` sums from a zero-prefixed cumulative sum, NaN until full."""
+    sums = np.full((cumulative.shape[0] - 1,) + cumulative.shape[1:], np.nan)
+    sums[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+def _mean_std(x: np.ndarray, windows: Iterable[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """Rolling mean and sample std for every window from one pair of cumulative sums."""
+    if not len(x):
+        return {w: (x.copy(), x.copy()) for w in windows}
+    ref = x[0]  # centring keeps the sum-of-squares difference numerically stable
+    centred = x - ref
+    zeros = np.zeros((1,) + x.shape[1:])
+    cs = np.concatenate([zeros, np.cumsum(centred, axis=0)])
+    cs2 = np.concatenate([zeros, np.cumsum(centred * centred, axis=0)])
+    stats = {}
+    for w in windows:
+        total, total_sq = _window_sums(cs, w), _window_sums(cs2, w)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.clip((total_sq - total * total / w) / (w - 1), 0, None)
+        stats[w] = (total / w + ref, np.sqrt(var))
+    return stats
+
+
+def rolling_stats(prices: Prices, windows: Iterable[int] = (20, 50, 200)) -> Dict[Tuple[str, int], Prices]:
+    """
+    Rolling mean and std for several windows in one pass.
+
+    All windows share a single cumulative sum and sum of squares, so adding a
+    window costs two vector subtractions instead of another rolling scan.
+    Returns ``{("mean", w): ..., ("std", w): ...}``.
+    """
+    windows = list(windows)
+
+    def compute(p):
+        stats = _mean_std(p.to_numpy(dtype=float), windows)
+        return {(name, w): stats[w][i] for w in windows for i, name in enumerate(("mean", "std"))}
+
+    return _on_own_bars(prices, compute)
+
+
+def technicals(prices: Prices, sma_windows: Iterable[int] = (50, 200), band_window: int = 20,
+               num_std: float = 2.0, vol_window: int = 30, rsi_window: int = 14) -> Dict[str, Prices]:
+    """
+    The dashboard's indicator set in a single pass over the prices.
+
+    Returns ``SMA_<w>`` per ``sma_windows``, ``Upper Band``/``Lower Band``,
+    annualized ``Volatility`` and Wilder ``RSI`` keyed by column name.
+    """
+    sma_windows = list(sma_windows)
+
+    def compute(p):
+        x = p.to_numpy(dtype=float)
+        stats = _mean_std(x, set(sma_windows) | {band_window})
+        vol = np.full_like(x, np.nan)
+        if len(x) > 1:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                returns = x[1:] / x[:-1] - 1
+            vol[1:] = _mean_std(returns, [vol_window])[vol_window][1] * np.sqrt(TRADING_DAYS)
+        mid, std = stats[band_window]
+        out = {f"SMA_{w}": stats[w][0] for w in sma_windows}
+        out["Upper Band"] = mid + num_std * std
+        out["Lower Band"] = mid - num_std * std
+        out["Volatility"] = vol
+        out["RSI"] = _wilder_rsi(p, rsi_window).to_numpy(dtype=float)
+        return out
+
+    return _on_own_bars(prices, compute)
+
+
+def sma(prices: Prices, window: int) -> Prices:
+    """Simple moving average over ``window`` bars."""
+    return _on_own_bars(prices, lambda p: p.rolling(window).mean())
+
+
+def bollinger_bands(prices: Prices, window: int = 20, num_std: float = 2.0) -> Tuple[Prices, Prices, Prices]:
+    """Middle, upper and lower Bollinger bands."""
+    middle = sma(prices, window)
+    std = _on_own_bars(prices, lambda p: p.rolling(window).std())
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def _wilder_rsi(p: pd.DataFrame, window: int) -> pd.DataFrame:
+    delta = p.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def rsi(prices: Prices, window: int = 14) -> Prices:
+    """Wilder's relative strength index (smoothing factor ``1 / window``)."""
+    return _on_own_bars(prices, lambda p: _wilder_rsi(p, window))
+
+
+def returns(prices: Prices) -> Prices:
+    """Simple daily returns, bar to bar within each column."""
+    return _on_own_bars(prices, lambda p: p.pct_change(fill_method=None))
+
+
+def rolling_volatility(prices: Prices, window: int = 30, annualize: bool = True) -> Prices:
+    """Rolling standard deviation of daily returns, annualized by default."""
+    scale = np.sqrt(TRADING_DAYS) if annualize else 1.0
+
+    def compute(p):
+        x = p.to_numpy(dtype=float)
+        vol = np.full_like(x, np.nan)
+        if len(x) > 1:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                returns = x[1:] / x[:-1] - 1
+            vol[1:] = _mean_std(returns, [window])[window][1] * scale
+        return vol
+
+    return _on_own_bars(prices, compute)
+
+
+def drawdown(prices: Prices) -> Prices:
+    """Fractional distance below the running peak (0 at new highs)."""
+    return _on_own_bars(prices, lambda p: p / p.cummax() - 1)
+
+
+class RollingIndicators:
+    """
+    Streaming version of :func:`technicals` for one price series.
+
+    Keeps running sums over ring buffers, so :meth:`update` costs O(1) per new
+    bar whatever the window lengths. ``replace_last=True`` revises the latest
+    bar instead (an intraday quote for a day already seen).
+    """
+
+    __slots__ = ("sma_windows", "band_window", "num_std", "vol_window", "rsi_window",
+                 "_prices", "_returns", "_count", "_sums", "_sq_sums", "_ret_sum", "_ret_sq_sum",
+                 "_avg_gain", "_avg_loss", "_ref", "_undo")
+
+    def __init__(self, sma_windows: Iterable[int] = (50, 200), band_window: int = 20,
+                 num_std: float = 2.0, vol_window: int = 30, rsi_window: int = 14):
+        self.sma_windows = list(sma_windows)
+        self.band_window = band_window
+        self.num_std = num_std
+        self.vol_window = vol_window
+        self.rsi_window = rsi_window
+        windows = set(self.sma_windows) | {band_window}
+        self._prices = [np.nan] * (max(windows) + 1)
+        self._returns = [np.nan] * (vol_window + 1)
+        self._count = 0
+        self._sums = dict.fromkeys(windows, 0.0)
+        self._sq_sums = dict.fromkeys(windows, 0.0)
+        self._ret_sum = self._ret_sq_sum = 0.0
+        self._avg_gain = self._avg_loss = np.nan
+        self._ref = None
+        self._undo = None
+
+    @classmethod
+    def from_prices(cls, prices: pd.Series, **params) -> "RollingIndicators":
+        state = cls(**params)
+        for price in prices.dropna().to_numpy(dtype=float):
+            state.update(price)
+        return state
+
+    def _price(self, back: int) -> float:
+        """Price ``back`` bars before the latest (0 = latest)."""
+        return self._prices[(self._count - 1 - back) % len(self._prices)]
+
+    def _ret(self, back: int) -> float:
+        return self._returns[(self._count - 1 - back) % len(self._returns)]
+
+    def update(self, price: float, replace_last: bool = False) -> Dict[str, float]:
+        """Add (or revise) one bar and return the indicator values at it."""
+        if replace_last and self._undo is not None:
+            (self._count, self._sums, self._sq_sums, self._ret_sum, self._ret_sq_sum,
+             self._avg_gain, self._avg_loss, slot_price, slot_return) = self._undo
+            self._prices[self._count % len(self._prices)] = slot_price
+            self._returns[self._count % len(self._returns)] = slot_return
+        n = self._count
+        self._undo = (n, dict(self._sums), dict(self._sq_sums), self._ret_sum, self._ret_sq_sum,
+                      self._avg_gain, self._avg_loss,
+                      self._prices[n % len(self._prices)], self._returns[n % len(self._returns)])
+        if self._ref is None:
+            self._ref = price
+        prev = self._price(0) if n else np.nan
+
+        x = price - self._ref
+        for w in self._sums:
+            self._sums[w] += x
+            self._sq_sums[w] += x * x
+            if n >= w:
+                old = self._price(w - 1) - self._ref
+                self._sums[w] -= old
+                self._sq_sums[w] -= old * old
+
+        ret = price / prev - 1 if n else np.nan
+        if n:
+            self._ret_sum += ret
+            self._ret_sq_sum += ret * ret
+            if n > self.vol_window:
+                old = self._ret(self.vol_window - 1)
+                self._ret_sum -= old
+                self._ret_sq_sum -= old * old
+
+            alpha = 1 / self.rsi_window
+            gain, loss = max(price - prev, 0.0), max(prev - price, 0.0)
+            if n == 1:
+                self._avg_gain, self._avg_loss = gain, loss
+            else:
+                self._avg_gain = (1 - alpha) * self._avg_gain + alpha * gain
+                self._avg_loss = (1 - alpha) * self._avg_loss + alpha * loss
+
+        self._prices[n % len(self._prices)] = price
+        self._returns[n % len(self._returns)] = ret
+        self._count = n + 1
+        return self.values()
+
+    def _mean_std(self, w: int) -> Tuple[float, float]:
+        if self._count < w:
+            return np.nan, np.nan
+        total, total_sq = self._sums[w], self._sq_sums[w]
+        var = max((total_sq - total * total / w) / (w - 1), 0.0)
+        return total / w + self._ref, np.sqrt(var)
+
+    def values(self) -> Dict[str, float]:
+        """Indicator values at the latest bar, keyed like :func:`technicals`."""
+        out = {f"SMA_{w}": self._mean_std(w)[0] for w in self.sma_windows}
+        mid, std = self._mean_std(self.band_window)
+        out["Upper Band"] = mid + self.num_std * std
+        out["Lower Band"] = mid - self.num_std * std
+        w = self.vol_window
+        if self._count > w:
+            var = max((self._ret_sq_sum - self._ret_sum ** 2 / w) / (w - 1), 0.0)
+            out["Volatility"] = np.sqrt(var) * np.sqrt(TRADING_DAYS)
+        else:
+            out["Volatility"] = np.nan
+        if self._count > self.rsi_window:
+            out["RSI"] = 100.0 if self._avg_loss == 0 else 100 - 100 / (1 + self._avg_gain / self._avg_loss)
+        else:
+            out["RSI"] = np.nan
+        return out
@@ -0,0 +1,186 @@
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from stock_dashboard.instrumentation import metrics
+from stock_dashboard.utils import data_dir
+
+# Fields that move with the market; everything not listed falls in "fundamentals".
+QUOTE_FIELDS = {
+    "regularMarketPrice", "currentPrice", "previousClose", "regularMarketPreviousClose",
+    "open", "dayHigh", "dayLow", "volume", "regularMarketVolume", "bid", "ask",
+    "marketCap", "trailingPE", "forwardPE", "dividendYield", "priceToBook",
+    "fiftyTwoWeekHigh", "fiftyTwoWeekLow", "fiftyDayAverage", "twoHundredDayAverage",
+}
+REFERENCE_FIELDS = {
+    "sector", "industry", "exchange", "fullExchangeName", "currency", "financialCurrency",
+    "country", "quoteType", "longName", "shortName", "symbol", "timeZoneFullName",
+}
+
+DEFAULT_TTLS = {
+    "quote": 60,
+    "fundamentals": 6 * 60 * 60,
+    "reference": 7 * 24 * 60 * 60,
+}
+
+# How long a process may hold the refresh claim on a ticker before another may retry.
+REFRESH_CLAIM_SECONDS = 60
+
+InfoFetcher = Callable[[List[str]], Dict[str, Dict[str, Any]]]
+
+
+def field_class(field: str) -> str:
+    if field in QUOTE_FIELDS:
+        return "quote"
+    if field in REFERENCE_FIELDS:
+        return "reference"
+    return "fundamentals"
+
+
+class InfoCache:
+    """
+    ``.info`` dicts in a SQLite file shared by every process on the host.
+
+    Freshness is judged per field class (``quote``, ``fundamentals``,
+    ``reference``) from the fields the caller asks for. Missing entries are
+    fetched inline; stale ones are returned at once and refreshed by a
+    background thread, with a claim row so only one process refetches.
+    """
+
+    def __init__(self, path=None, ttls: Optional[Dict[str, float]] = None, fetch: Optional[InfoFetcher] = None):
+        self.path = Path(path) if path else data_dir("cache") / "info.sqlite"
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.fetch = fetch
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="info-refresh")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS info ("
+                " ticker TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL, refreshing_until REAL DEFAULT 0)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, fields: Optional[Iterable[str]]) -> float:
+        """Shortest TTL among the classes of ``fields`` (``None`` = fundamentals)."""
+        classes = {field_class(f) for f in fields} if fields else {"fundamentals"}
+        return min(self.ttls[c] for c in classes)
+
+    def get(self, tickers: List[str], fields: Optional[Iterable[str]] = None, fetch: Optional[InfoFetcher] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Cached ``.info`` per ticker, fetching missing ones inline.
+
+        Args:
+            tickers (list): Symbols to look up.
+            fields (iterable, optional): Fields the caller reads; their class sets the TTL.
+            fetch (callable, optional): Batch fetcher overriding the one given at construction.
+
+        Returns:
+            dict: ``{ticker: info_dict}`` with ``{}`` for symbols that could not be fetched.
+        """
+        fetch = fetch or self.fetch
+        ttl = self.ttl_for(fields)
+        now = time.time()
+        rows = self._read(tickers)
+        result, missing, stale = {}, [], []
+        for t in tickers:
+            if t not in rows:
+                missing.append(t)
+                continue
+            payload, fetched_at = rows[t]
+            result[t] = payload
+            # A recorded miss is retried after the quote TTL whatever the fields asked for
+            if now - fetched_at >= (ttl if payload else min(ttl, self.ttls["quote"])):
+                stale.append(t)
+        metrics.record_cache("info_cache", len(tickers) - len(missing), len(missing))
+        if missing:
+            result.update(self._refresh(missing, fetch))
+        if stale:
+            self._refresh_in_background(stale, fetch)
+        return {t: result.get(t, {}) for t in tickers}
+
+    def invalidate(self, tickers: Optional[Iterable[str]] = None) -> None:
+        with self._connect() as conn:
+            if tickers is None:
+                conn.execute("DELETE FROM info")
+            else:
+                conn.executemany("DELETE FROM info WHERE ticker = ?", [(t,) for t in tickers])
+
+    def _read(self, tickers: List[str]) -> Dict[str, tuple]:
+        if not tickers:
+            return {}
+        with self._connect() as conn:
+            placeholders = ",".join("?" * len(tickers))
+            rows = conn.execute(
+                f"SELECT ticker, payload, fetched_at FROM info WHERE ticker IN ({placeholders})", tickers
+            ).fetchall()
+        return {t: (json.loads(payload), fetched_at) for t, payload, fetched_at in rows}
+
+    def _refresh(self, tickers: List[str], fetch: InfoFetcher) -> Dict[str, Dict[str, Any]]:
+        fetched = fetch(tickers)
+        now = time.time()
+        with self._connect() as conn:
+            for t in tickers:
+                info = fetched.get(t) or {}
+                if info:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO info (ticker, payload, fetched_at, refreshing_until)"
+                        " VALUES (?, ?, ?, 0)", (t, json.dumps(info, default=str), now),
+                    )
+                else:
+                    # Keep the last good payload; only record a miss for unknown symbols.
+                    conn.execute(
+                        "INSERT OR IGNORE INTO info (ticker, payload, fetched_at) VALUES (?, '{}', ?)", (t, now),
+                    )
+                    conn.execute("UPDATE info SET refreshing_until = 0 WHERE ticker = ?", (t,))
+        return {t: fetched.get(t) or {} for t in tickers}
+
+    def _claim(self, tickers: List[str]) -> List[str]:
+        """Atomically mark tickers as being refreshed by this process."""
+        now = time.time()
+        claimed = []
+        with self._connect() as conn:
+            for t in tickers:
+                cur = conn.execute(
+                    "UPDATE info SET refreshing_until = ? WHERE ticker = ? AND refreshing_until < ?",
+                    (now + REFRESH_CLAIM_SECONDS, t, now),
+                )
+                if cur.rowcount:
+                    claimed.append(t)
+        return claimed
+
+    def _refresh_in_background(self, tickers: List[str], fetch: InfoFetcher) -> None:
+        with self._lock:
+            wanted = [t for t in tickers if t not in self._pending]
+            self._pending.update(wanted)
+        claimed = self._claim(wanted) if wanted else []
+        with self._lock:
+            self._pending.difference_update(set(wanted) - set(claimed))
+        if not claimed:
+            return
+
+        def run():
+            try:
+                self._refresh(claimed, fetch)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._pending.difference_update(claimed)
+
+        self._executor.submit(run)
@@ -0,0 +1,234 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Operations slower than this are also written to the log.
+SLOW_SECONDS = float(os.environ.get("PORTFOLIO_SLOW_SECONDS", 2.0))
+
+logger = logging.getLogger(__name__)
+
+
+def diagnostics_enabled() -> bool:
+    """Whether the diagnostics sidebar is shown (``PORTFOLIO_DIAGNOSTICS=1``)."""
+    return os.environ.get("PORTFOLIO_DIAGNOSTICS", "").lower() in ("1", "true", "yes", "on")
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` past the last bucket)."""
+        if not self.count:
+            return float("nan")
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        total, out = 0, []
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+
+class Metrics:
+    """
+    Process-wide counters behind the diagnostics panel.
+
+    Records three things:
+    - latency histograms per ``(kind, name)``, e.g. ``("render", "Overview")``
+      or ``("upstream", "history")``
+    - upstream calls and symbols per endpoint and per ``(endpoint, symbol)``
+    - cache hits and misses per cache
+    All updates take one lock and are cheap enough for the hot path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency: Dict[Tuple[str, str], Histogram] = {}
+            self.upstream_calls: Counter = Counter()
+            self.upstream_symbols: Counter = Counter()
+            self.cache: Counter = Counter()
+            self.started = time.time()
+
+    def observe(self, kind: str, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.latency.get((kind, name))
+            if histogram is None:
+                histogram = self.latency[(kind, name)] = Histogram()
+            histogram.observe(seconds)
+        if seconds >= SLOW_SECONDS:
+            logger.warning("slow %s %s: %.2fs", kind, name, seconds)
+
+    def record_upstream(self, endpoint: str, symbols: Iterable[str], seconds: float) -> None:
+        symbols = list(symbols)
+        with self._lock:
+            self.upstream_calls[endpoint] += 1
+            self.upstream_symbols.update((endpoint, s) for s in symbols)
+        self.observe("upstream", endpoint, seconds)
+
+    def record_cache(self, cache: str, hits: int, misses: int) -> None:
+        if hits or misses:
+            with self._lock:
+                self.cache[(cache, "hit")] += hits
+                self.cache[(cache, "miss")] += misses
+
+    # ----- views -----
+    def hit_ratios(self) -> Dict[str, float]:
+        with self._lock:
+            names = {cache for cache, _ in self.cache}
+            return {
+                name: self.cache[(name, "hit")] / (self.cache[(name, "hit")] + self.cache[(name, "miss")])
+                for name in sorted(names)
+            }
+
+    def snapshot(self) -> dict:
+        """Everything recorded, as plain JSON-serialisable data."""
+        ratios = self.hit_ratios()
+        with self._lock:
+            return {
+                "uptime_seconds": time.time() - self.started,
+                "latency": [
+                    {"kind": kind, "name": name, "count": h.count, "sum": h.sum,
+                     "p50": h.quantile(0.5), "p95": h.quantile(0.95),
+                     "buckets": {str(bound): n for bound, n in h.cumulative()}}
+                    for (kind, name), h in sorted(self.latency.items())
+                ],
+                "upstream_calls": dict(self.upstream_calls),
+                "upstream_symbols": [
+                    {"endpoint": endpoint, "symbol": symbol, "count": n}
+                    for (endpoint, symbol), n in self.upstream_symbols.most_common()
+                ],
+                "cache": {
+                    name: {"hits": self.cache[(name, "hit")], "misses": self.cache[(name, "miss")],
+                           "hit_ratio": ratio}
+                    for name, ratio in ratios.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+    def to_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        def label(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        lines = ["# HELP portfolio_latency_seconds Latency of renders and upstream calls.",
+                 "# TYPE portfolio_latency_seconds histogram"]
+        with self._lock:
+            for (kind, name), h in sorted(self.latency.items()):
+                labels = f'kind="{label(kind)}",name="{label(name)}"'
+                for bound, n in h.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'portfolio_latency_seconds_bucket{{{labels},le="{le}"}} {n}')
+                lines.append(f"portfolio_latency_seconds_sum{{{labels}}} {h.sum}")
+                lines.append(f"portfolio_latency_seconds_count{{{labels}}} {h.count}")
+
+            lines += ["# HELP portfolio_upstream_calls_total Upstream requests per endpoint.",
+                      "# TYPE portfolio_upstream_calls_total counter"]
+            lines += [f'portfolio_upstream_calls_total{{endpoint="{label(e)}"}} {n}'
+                      for e, n in sorted(self.upstream_calls.items())]
+            lines += ["# HELP portfolio_upstream_symbols_total Symbols requested upstream per endpoint.",
+                      "# TYPE portfolio_upstream_symbols_total counter"]
+            lines += [f'portfolio_upstream_symbols_total{{endpoint="{label(e)}",symbol="{label(s)}"}} {n}'
+                      for (e, s), n in sorted(self.upstream_symbols.items())]
+            lines += ["# HELP portfolio_cache_requests_total Cache lookups by result.",
+                      "# TYPE portfolio_cache_requests_total counter"]
+            lines += [f'portfolio_cache_requests_total{{cache="{label(c)}",result="{r}"}} {n}'
+                      for (c, r), n in sorted(self.cache.items())]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def timed(kind: str, name: str):
+    """Record how long the ``with`` block takes under ``(kind, name)``, even when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(kind, name, time.perf_counter() - start)
+
+
+def upstream(endpoint: str, fetch):
+    """Wrap a batch fetcher so every real upstream call is timed and counted per symbol."""
+    def call(batch):
+        start = time.perf_counter()
+        try:
+            return fetch(batch)
+        finally:
+            metrics.record_upstream(endpoint, batch, time.perf_counter() - start)
+    return call
+
+
+def render_diagnostics(container=None) -> None:
+    """
+    Diagnostics panel: where render time went, upstream calls and cache hit ratios.
+
+    Comparing a tab's render time with the upstream latency it caused shows
+    whether a slow render is network-bound or compute-bound.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    container = container or st.sidebar
+    snapshot = metrics.snapshot()
+    with container.expander("Diagnostics", expanded=False):
+        latency = pd.DataFrame(snapshot["latency"])
+        if not latency.empty:
+            latency["mean ms"] = latency["sum"] / latency["count"] * 1000
+            latency["total s"] = latency["sum"]
+            st.markdown("**Latency**")
+            st.dataframe(latency[["kind", "name", "count", "mean ms", "p95", "total s"]]
+                         .rename(columns={"p95": "p95 ≤ s"}), hide_index=True, use_container_width=True)
+
+        renders = latency[latency["kind"] == "render"]["sum"].sum() if not latency.empty else 0.0
+        network = latency[latency["kind"] == "upstream"]["sum"].sum() if not latency.empty else 0.0
+        st.markdown(f"**Render time:** {renders:.2f}s, of which upstream wait up to {network:.2f}s")
+
+        if snapshot["cache"]:
+            st.markdown("**Cache hit ratio**")
+            st.dataframe(pd.DataFrame(snapshot["cache"]).T, use_container_width=True)
+
+        if snapshot["upstream_symbols"]:
+            st.markdown("**Most fetched symbols**")
+            st.dataframe(pd.DataFrame(snapshot["upstream_symbols"]).head(20), hide_index=True,
+                         use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        col1.download_button("JSON", metrics.to_json(), file_name="metrics.json", mime="application/json")
+        col2.download_button("Prometheus", metrics.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+        if st.button("Reset counters", key="diagnostics_reset"):
+            metrics.reset()
@@ -0,0 +1,441 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard.fetch_executor import FetchExecutor, get_executor
+from stock_dashboard.fetch_service import get_fetch_service
+from stock_dashboard.info_cache import InfoCache
+from stock_dashboard.instrumentation import metrics, upstream
+from stock_dashboard.price_store import PriceStore
+from stock_dashboard.utils import data_dir
+
+OHLCV_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+ACTION_FIELDS = ["Dividends", "Stock Splits"]  # per-day corporate actions, 0 on days without one
+HISTORY_FIELDS = OHLCV_FIELDS + ACTION_FIELDS
+DEFAULT_REFRESH_SECONDS = 300
+DOWNLOAD_CHUNK = 100  # symbols per yf.download request
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def unique_tickers(tickers: Iterable[str]) -> List[str]:
+    """Drop blanks and duplicates while keeping the caller's order."""
+    return list(dict.fromkeys(t for t in tickers if isinstance(t, str) and t.strip()))
+
+
+def slice_period(frame: pd.DataFrame, period: Optional[str] = None, start=None) -> pd.DataFrame:
+    """
+    Cut a date-indexed frame down to a yfinance-style ``period`` or ``start``.
+
+    ``"Nd"`` periods count trading bars (as Yahoo's ``range`` does), while
+    ``wk``/``mo``/``y``/``ytd`` are calendar offsets back from the last bar.
+    """
+    if frame.empty:
+        return frame
+    if start is not None:
+        return frame.loc[frame.index >= pd.Timestamp(start)]
+    if period in (None, "max"):
+        return frame
+    end = frame.index[-1]
+    if period == "ytd":
+        return frame.loc[frame.index >= pd.Timestamp(year=end.year, month=1, day=1)]
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return frame.iloc[-amount:]
+    offset = {
+        "wk": pd.DateOffset(weeks=amount),
+        "mo": pd.DateOffset(months=amount),
+        "y": pd.DateOffset(years=amount),
+    }[unit]
+    return frame.loc[frame.index >= end - offset]
+
+
+def window_start(period: Optional[str] = None, start=None, today=None) -> Optional[pd.Timestamp]:
+    """
+    Earliest calendar date a window can reach, or ``None`` for ``"max"``.
+
+    ``"Nd"`` trading-bar windows are padded for weekends and holidays so a
+    frame fetched from this date always holds at least ``N`` bars.
+    """
+    if start is not None:
+        return pd.Timestamp(start).normalize()
+    if period in (None, "max"):
+        return None
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return today - pd.DateOffset(days=amount * 7 // 5 + 7)
+    return today - {
+        "wk": pd.DateOffset(weeks=amount),
+        "mo": pd.DateOffset(months=amount),
+        "y": pd.DateOffset(years=amount),
+    }[unit]
+
+
+def widest_window(periods: Iterable[str]) -> str:
+    """The period in ``periods`` reaching furthest back (``"max"`` beats all)."""
+    periods = list(periods)
+    if "max" in periods:
+        return "max"
+    return min(periods, key=window_start)
+
+
+def _normalize_history(hist: pd.DataFrame) -> pd.DataFrame:
+    """Keep OHLCV and action columns on a tz-naive daily index so exchanges align."""
+    if hist is None or hist.empty:
+        return pd.DataFrame(columns=OHLCV_FIELDS)
+    hist = hist[[c for c in HISTORY_FIELDS if c in hist.columns]].dropna(how="all")
+    index = pd.DatetimeIndex(hist.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    hist = hist.set_axis(index.normalize().rename("Date"))
+    return hist[~hist.index.duplicated(keep="last")].sort_index()
+
+
+class MarketDataProvider:
+    """
+    Batched access to quotes, ``.info`` dicts and daily OHLCV history.
+
+    Backends implement the ``_fetch_*`` hooks for a list of symbols. The public
+    methods memoise every result per symbol, so each symbol hits the backend at
+    most once per ``refresh_seconds`` no matter how many tabs ask for it, and
+    misses go through the shared :class:`FetchService` so sessions asking for
+    the same symbol at the same moment share one upstream call. Bars
+    are kept as one widest-window frame per symbol and narrower windows are
+    sliced from it.
+    """
+
+    info_cache: Optional[InfoCache] = None
+
+    def __init__(self, refresh_seconds: float = DEFAULT_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._memo: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    # ----- public API -----
+    def quotes(self, tickers: Iterable[str], max_age: Optional[float] = None) -> pd.DataFrame:
+        """
+        Latest ``price`` and ``previous_close`` per ticker (NaN when unknown).
+
+        ``max_age`` (seconds) tightens the memo for callers polling live
+        quotes; by default a quote is reused for ``refresh_seconds``.
+        """
+        symbols = unique_tickers(tickers)
+        found = self._cached("quote", symbols, None, self._fetch_quotes, max_age)
+        frame = pd.DataFrame.from_dict(
+            {t: found.get(t) or {} for t in symbols}, orient="index",
+            columns=["price", "previous_close"],
+        )
+        return frame.astype(float)
+
+    def info(self, tickers: Iterable[str], fields: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        The yfinance ``.info`` dict for each ticker (empty on failure).
+
+        With an :class:`InfoCache` attached, ``fields`` names what the caller
+        reads so the cache can apply that field class's TTL.
+        """
+        symbols = unique_tickers(tickers)
+        if self.info_cache is not None:
+            return self.info_cache.get(
+                symbols, fields, fetch=lambda missing: self._coalesce("info", missing, None, self._fetch_info)
+            )
+        found = self._cached("info", symbols, None, self._fetch_info)
+        return {t: found.get(t) or {} for t in symbols}
+
+    def ticker_info(self, ticker: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        return self.info([ticker], fields).get(ticker, {})
+
+    def history(self, tickers: Iterable[str], period: str = "1y", start=None) -> pd.DataFrame:
+        """
+        Daily OHLCV bars for many tickers as one frame.
+
+        Columns are a ``(field, ticker)`` MultiIndex like ``yf.download``, so
+        ``history(...)["Close"]`` is the aligned wide close matrix. The
+        ``Dividends`` and ``Stock Splits`` fields are included when the
+        backend recorded them.
+        """
+        symbols = unique_tickers(tickers)
+        found = self._history_frames(symbols, window_start(period, start))
+        found = {t: slice_period(hist, period, start) for t, hist in found.items()}
+        frames = {t: found[t] for t in symbols if t in found and not found[t].empty}
+        if not frames:
+            return pd.DataFrame(columns=pd.MultiIndex.from_product([OHLCV_FIELDS, []]))
+        fields = [f for f in HISTORY_FIELDS if f in OHLCV_FIELDS or any(f in hist for hist in frames.values())]
+        return pd.concat(
+            {f: pd.DataFrame({t: hist[f] for t, hist in frames.items() if f in hist}) for f in fields},
+            axis=1,
+        )
+
+    def history_windows(self, tickers: Iterable[str], periods: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch the widest of ``periods`` once for all tickers and slice the rest.
+
+        Returns one :meth:`history`-shaped frame per requested period, every
+        one of them cut in memory from the single batched download.
+        """
+        symbols, periods = unique_tickers(tickers), list(dict.fromkeys(periods))
+        self._history_frames(symbols, window_start(widest_window(periods)))
+        return {period: self.history(symbols, period=period) for period in periods}
+
+    def close(self, tickers: Iterable[str], period: str = "1y", start=None) -> pd.DataFrame:
+        """Wide close-price matrix (dates x tickers)."""
+        hist = self.history(tickers, period=period, start=start)
+        return hist["Close"] if "Close" in hist.columns.get_level_values(0) else pd.DataFrame()
+
+    def ohlcv(self, ticker: str, period: str = "1y", start=None) -> pd.DataFrame:
+        """OHLCV bars for a single ticker."""
+        hist = self.history([ticker], period=period, start=start)
+        if hist.empty:
+            return pd.DataFrame(columns=OHLCV_FIELDS)
+        return hist.xs(ticker, axis=1, level=1).dropna(how="all")
+
+    def invalidate(self) -> None:
+        """Forget everything memoised so the next call refetches."""
+        with self._lock:
+            self._memo.clear()
+
+    # ----- backend hooks -----
+    def _fetch_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        raise NotImplementedError
+
+    def _fetch_info(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _fetch_history(self, tickers: List[str], period: Optional[str], start: Optional[str]) -> Dict[str, pd.DataFrame]:
+        raise NotImplementedError
+
+    # ----- memoisation -----
+    def _coalesce(self, endpoint: str, tickers: List[str], window, fetch: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a backend fetch through the shared service so concurrent sessions share it."""
+        fetched = get_fetch_service().fetch(endpoint, tickers, (id(self), window), upstream(endpoint, fetch))
+        return {t: v for t, v in fetched.items() if v is not None}
+
+    def _history_frames(self, tickers: List[str], need: Optional[pd.Timestamp]) -> Dict[str, pd.DataFrame]:
+        """
+        Per-symbol bars reaching back to ``need`` (``None`` = full history).
+
+        One frame is kept per symbol. A request it already covers is served
+        from memory; otherwise every uncovered symbol is fetched in one batch
+        from ``need`` and replaces the narrower frame.
+        """
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for t in tickers:
+                hit = self._memo.get(("history", t))
+                if (hit is not None and now - hit[0] < self.refresh_seconds
+                        and (hit[1] is None or (need is not None and hit[1] <= need))):
+                    if hit[2] is not None:
+                        found[t] = hit[2]
+                else:
+                    missing.append(t)
+        metrics.record_cache("memo:history", len(tickers) - len(missing), len(missing))
+        if missing:
+            if need is None:
+                fetch = lambda batch: self._fetch_history(batch, "max", None)
+            else:
+                fetch = lambda batch: self._fetch_history(batch, None, str(need.date()))
+            fetched = self._coalesce("history", missing, need, fetch)
+            with self._lock:
+                for t in missing:
+                    hist = fetched.get(t)
+                    self._memo[("history", t)] = (now, need, hist)
+                    if hist is not None:
+                        found[t] = hist
+        return found
+
+    def _cached(self, endpoint: str, tickers: List[str], key, fetch: Callable[[List[str]], Dict[str, Any]],
+                max_age: Optional[float] = None) -> Dict[str, Any]:
+        now = time.monotonic()
+        max_age = self.refresh_seconds if max_age is None else min(max_age, self.refresh_seconds)
+        result, missing = {}, []
+        with self._lock:
+            for t in tickers:
+                hit = self._memo.get((endpoint, t, key))
+                if hit is not None and now - hit[0] < max_age:
+                    result[t] = hit[1]
+                else:
+                    missing.append(t)
+        metrics.record_cache(f"memo:{endpoint}", len(tickers) - len(missing), len(missing))
+        if missing:
+            fetched = self._coalesce(endpoint, missing, key, fetch)
+            with self._lock:
+                for t in missing:
+                    # Failures are memoised too, so a bad symbol is not retried by every widget.
+                    value = fetched.get(t)
+                    self._memo[(endpoint, t, key)] = (now, value)
+                    result[t] = value
+        return {t: v for t, v in result.items() if v is not None}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live backend running its upstream requests on a :class:`FetchExecutor`,
+    so the shared token bucket keeps us inside Yahoo's throttling. Prices are
+    downloaded in batched ``yf.download`` chunks of :data:`DOWNLOAD_CHUNK`
+    symbols, one token per chunk; ``.info`` has no batch endpoint and is
+    requested per symbol.
+
+    With a :class:`PriceStore` attached, history requests are served from disk
+    and only the bars after the last stored date are downloaded; with an
+    :class:`InfoCache`, ``.info`` is shared across processes with per-field TTLs.
+    """
+
+    def __init__(self, refresh_seconds: float = DEFAULT_REFRESH_SECONDS, store: Optional[PriceStore] = None,
+                 info_cache: Optional[InfoCache] = None, executor: Optional[FetchExecutor] = None):
+        super().__init__(refresh_seconds)
+        self.store = store
+        self.info_cache = info_cache
+        self.executor = executor or get_executor()
+
+    def _fetch_quotes(self, tickers):
+        quotes = {}
+        for t, hist in self._download(tickers, "5d", None).items():
+            closes = hist["Close"].dropna()
+            if closes.empty:
+                continue
+            quotes[t] = {
+                "price": float(closes.iloc[-1]),
+                "previous_close": float(closes.iloc[-2]) if len(closes) > 1 else np.nan,
+            }
+        return quotes
+
+    def _fetch_info(self, tickers):
+        import yfinance as yf
+
+        def fetch(ticker):
+            return yf.Ticker(ticker).info or {}
+        return self.executor.map(fetch, tickers, default={})
+
+    def _fetch_history(self, tickers, period, start):
+        if self.store is None:
+            return self._download(tickers, period, start)
+        since = None if start is None else pd.Timestamp(start)
+        if since is None and period != "max":
+            since = window_start(period)
+        return self.store.refresh(tickers, since, self._download)
+
+    def _download(self, tickers, period, start):
+        """One rate-limited ``yf.download`` request per chunk, chunks run concurrently."""
+        import yfinance as yf
+
+        def fetch(chunk):
+            data = yf.download(
+                list(chunk), period=None if start else period, start=start, auto_adjust=True, actions=True,
+                group_by="ticker", progress=False, threads=True, timeout=self.executor.timeout,
+            )
+            if data is None or data.empty:
+                return {}
+            if not isinstance(data.columns, pd.MultiIndex):
+                return {chunk[0]: _normalize_history(data)}
+            present = set(data.columns.get_level_values(0))
+            return {t: _normalize_history(data[t]) for t in chunk if t in present}
+
+        tickers = list(tickers)
+        chunks = [tuple(tickers[i:i + DOWNLOAD_CHUNK]) for i in range(0, len(tickers), DOWNLOAD_CHUNK)]
+        histories = {}
+        for fetched in self.executor.map(fetch, chunks, default={}).values():
+            histories.update({t: hist for t, hist in fetched.items() if not hist.empty})
+        return histories
+
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    Offline backend replaying recorded responses from a directory.
+
+    Layout: ``info/<SYMBOL>.json`` holds the ``.info`` dict and
+    ``history/<SYMBOL>.csv`` the daily OHLCV bars (``Date`` first column,
+    optionally followed by ``Dividends`` and ``Stock Splits``).
+    Quotes come from ``regularMarketPrice``/``previousClose`` when recorded,
+    otherwise from the last two stored closes.
+    """
+
+    def __init__(self, root=None, refresh_seconds: float = DEFAULT_REFRESH_SECONDS):
+        super().__init__(refresh_seconds)
+        self.root = Path(root) if root else data_dir("market_data")
+
+    def save(self, ticker: str, info: Optional[dict] = None, history: Optional[pd.DataFrame] = None) -> None:
+        """Record an ``.info`` dict and/or OHLCV frame for ``ticker``."""
+        if info is not None:
+            path = self.root / "info" / f"{ticker}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(info, default=str))
+        if history is not None:
+            path = self.root / "history" / f"{ticker}.csv"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _normalize_history(history).to_csv(path)
+
+    def _fetch_quotes(self, tickers):
+        infos = self._fetch_info(tickers)
+        histories = self._fetch_history(tickers, "5d", None)
+        quotes = {}
+        for t in tickers:
+            info = infos.get(t, {})
+            closes = histories[t]["Close"].dropna() if t in histories else pd.Series(dtype=float)
+            price = info.get("regularMarketPrice", closes.iloc[-1] if len(closes) else np.nan)
+            prev = info.get("previousClose", closes.iloc[-2] if len(closes) > 1 else np.nan)
+            if pd.notna(price):
+                quotes[t] = {"price": float(price), "previous_close": float(prev)}
+        return quotes
+
+    def _fetch_info(self, tickers):
+        infos = {}
+        for t in tickers:
+            path = self.root / "info" / f"{t}.json"
+            infos[t] = json.loads(path.read_text()) if path.exists() else {}
+        return infos
+
+    def _fetch_history(self, tickers, period, start):
+        histories = {}
+        for t in tickers:
+            path = self.root / "history" / f"{t}.csv"
+            if not path.exists():
+                continue
+            hist = pd.read_csv(path, index_col=0, parse_dates=True)
+            histories[t] = slice_period(_normalize_history(hist), period, start)
+        return histories
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    Return the process-wide provider shared by every tab and session.
+
+    ``PORTFOLIO_DATA_BACKEND=local`` selects the offline file backend (rooted
+    at ``PORTFOLIO_MARKET_DATA`` if set); anything else uses yfinance backed
+    by the on-disk :class:`PriceStore` and the shared :class:`InfoCache`.
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if os.environ.get("PORTFOLIO_DATA_BACKEND", "yfinance").lower() == "local":
+                _provider = LocalFileProvider(os.environ.get("PORTFOLIO_MARKET_DATA"))
+            else:
+                _provider = YFinanceProvider(store=PriceStore(), info_cache=InfoCache())
+        return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """Swap the shared provider (``None`` resets to the environment default)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -1,12 +1,15 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import yfinance as yf
-import numpy as np
 import pandas as pd
-from stock_dashboard.Get_stock_region import stock_region_diversification
+from stock_dashboard.analytics import BENCHMARK
+from stock_dashboard.compute import compute_overview, reprice, weighted_average
+from stock_dashboard.fx import base_currency, currency_symbol
+from stock_dashboard.market_data import get_provider
 
-def render_overview_tab(df):
+LIVE_REFRESH_SECONDS = 15
+
+def render_overview_tab(df, analytics=None):
     st.title("Portfolio Overview")
 
     # ----- STYLING -----
@@ -40,52 +43,39 @@ def render_overview_tab(df):
     """, unsafe_allow_html=True)
 
     # ----- CALCULATIONS -----
-    df = df.copy()
-    df["prev_close"] = df["ticker"].apply(lambda t: yf.Ticker(t).info.get("previousClose", np.nan))
-    df["daily_change_pct"] = ((df["price"] - df["prev_close"]) / df["prev_close"]) * 100
-    portfolio_daily_change = np.average(df["daily_change_pct"], weights=df["value"])
-
-    @st.cache_data
-    def get_volatility(ticker):
-        try:
-            hist = yf.Ticker(ticker).history(period="30d")
-            returns = hist["Close"].pct_change().dropna()
-            return np.std(returns)
-        except:
-            return np.nan
-    df["volatility"] = df["ticker"].apply(get_volatility)
-    portfolio_volatility = np.average(df["volatility"], weights=df["value"])
-
-    df["div_yield"] = df["ticker"].apply(lambda t: yf.Ticker(t).info.get("dividendYield", 0))
-    weighted_div_yield = np.average(df["div_yield"].fillna(0), weights=df["value"])
-
-    @st.cache_data
-    def get_sectors(tickers):
-        sector_map = {}
-        for ticker in tickers:
-            try:
-                info = yf.Ticker(ticker).info
-                sector_map[ticker] = info.get("sector", "Unknown")
-            except:
-                sector_map[ticker] = "Unknown"
-        return sector_map
-    sector_map = get_sectors(df["ticker"].tolist())
-    df["sector"] = df["ticker"].map(sector_map)
-    sector_count = df["sector"].nunique()
-    top_holding = df.loc[df['value'].idxmax()]["ticker"] if not df.empty else "N/A"
+    provider = get_provider()
+    result = compute_overview(df, analytics, provider)
+    df = result.holdings
+
+    # Live mode polls quotes on a timer; only the price-driven parts below rerun on each tick,
+    # while sector, region and volatility keep their cached values until their own TTL
+    live = st.toggle(
+        "Live mode", key="overview_live",
+        help=f"Refresh prices every {LIVE_REFRESH_SECONDS} seconds. Sector, region and volatility stay cached."
+    )
+    run_every = LIVE_REFRESH_SECONDS if live else None
+
+    def live_values(max_age):
+        return reprice(df, provider.quotes(result.tickers + [BENCHMARK], max_age=max_age))
 
     # ----- METRICS INLINE -----
-    st.markdown(f"""
-    <div style="margin-top: 10px; margin-bottom: 30px;">
-        <div class="metric-inline"><span class="metric-label">Total Value:</span> ${df["value"].sum():,.2f}</div>
-        <div class="metric-inline"><span class="metric-label">Holdings:</span> {len(df)}</div>
-        <div class="metric-inline"><span class="metric-label">Top Holding:</span> {top_holding}</div>
-        <div class="metric-inline"><span class="metric-label">Daily Change:</span> {portfolio_daily_change:.2f}%</div>
-        <div class="metric-inline"><span class="metric-label">Volatility:</span> {portfolio_volatility:.2%}</div>
-        <div class="metric-inline"><span class="metric-label">Dividend Yield:</span> {weighted_div_yield * 100:.2f}%</div>
-        <div class="metric-inline"><span class="metric-label">Sectors:</span> {sector_count}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    @st.fragment(run_every=run_every)
+    def render_metrics():
+        value, daily_change_pct, _ = live_values(run_every)
+        portfolio_daily_change = weighted_average(daily_change_pct, value)
+        st.markdown(f"""
+        <div style="margin-top: 10px; margin-bottom: 30px;">
+            <div class="metric-inline"><span class="metric-label">Total Value:</span> {currency_symbol(base_currency())}{value.sum():,.2f}</div>
+            <div class="metric-inline"><span class="metric-label">Holdings:</span> {len(df)}</div>
+            <div class="metric-inline"><span class="metric-label">Top Holding:</span> {result.top_holding}</div>
+            <div class="metric-inline"><span class="metric-label">Daily Change:</span> {portfolio_daily_change:.2f}%</div>
+            <div class="metric-inline"><span class="metric-label">Volatility:</span> {result.portfolio_volatility:.2%}</div>
+            <div class="metric-inline"><span class="metric-label">Dividend Yield:</span> {result.dividend_yield * 100:.2f}%</div>
+            <div class="metric-inline"><span class="metric-label">Sectors:</span> {result.sector_count}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    render_metrics()
 
     # ----- CHART STYLING -----
     def update_plot_style(fig):
@@ -106,12 +96,11 @@ def render_overview_tab(df):
     fig_alloc = update_plot_style(fig_alloc)
 
     # ----- REGIONAL DIVERSIFICATION -----
-    tickers_qty = dict(zip(df["ticker"], df["quantity"]))
-    region_data = stock_region_diversification(tickers_qty)
-    if isinstance(region_data, dict):
+    region_data = result.regions
+    if not region_data.empty:
         fig_region = px.pie(
-            names=list(region_data.keys()),
-            values=list(region_data.values()),
+            names=region_data.index,
+            values=region_data.to_numpy(),
             hole=0.4,
             title="Regional Diversification"
         )
@@ -120,52 +109,51 @@ def render_overview_tab(df):
         fig_region = None
 
     # ----- SECTOR ALLOCATION -----
-    sector_group = df.groupby("sector")["value"].sum().reset_index().sort_values("value", ascending=False)
-    fig_sector = px.pie(sector_group, names="sector", values="value", hole=0.4, title="Sector Allocation")
+    fig_sector = px.pie(result.sectors, names="sector", values="value", hole=0.4, title="Sector Allocation")
     fig_sector = update_plot_style(fig_sector)
 
     # ----- HISTORICAL PORTFOLIO PERFORMANCE -----
-    @st.cache_data(show_spinner=True)
-    def get_historical_values(tickers, qty_dict):
-        hist_df = pd.DataFrame()
-        for ticker in tickers:
-            try:
-                hist = yf.Ticker(ticker).history(period="30d")["Close"]
-                hist_df[ticker] = hist * qty_dict[ticker]
-            except:
-                continue
-        hist_df["portfolio"] = hist_df.sum(axis=1)
-        spy = yf.Ticker("SPY").history(period="30d")["Close"]
-        combined = pd.DataFrame({
-            "Date": hist_df.index,
-            "Portfolio Value": hist_df["portfolio"] / hist_df["portfolio"].iloc[0],
-            "S&P 500 (SPY)": spy / spy.iloc[0]
-        }).dropna()
-        return combined
-
-    hist_chart_data = get_historical_values(df["ticker"].tolist(), tickers_qty)
-    fig_hist = go.Figure()
-    fig_hist.add_trace(go.Scatter(
-        x=hist_chart_data["Date"],
-        y=hist_chart_data["Portfolio Value"],
-        mode='lines',
-        name="Portfolio",
-        hovertemplate='Date: %{x|%b %d}<br>Value: %{y:.2f}<extra></extra>'
-    ))
-    fig_hist.add_trace(go.Scatter(
-        x=hist_chart_data["Date"],
-        y=hist_chart_data["S&P 500 (SPY)"],
-        mode='lines',
-        name="S&P 500",
-        line=dict(dash='dash'),
-        hovertemplate='Date: %{x|%b %d}<br>S&P 500: %{y:.2f}<extra></extra>'
-    ))
-    fig_hist.update_layout(
-        title="Portfolio vs S&P 500 (30-Day Normalized)",
-        xaxis_title="Date",
-        yaxis_title="Normalized Value",
-    )
-    update_plot_style(fig_hist)
+    hist_values = result.history
+
+    def render_history_chart(hist_values):
+        if hist_values.empty:
+            st.info("No price history to chart for the last 30 days.")
+            return
+        hist_chart_data = (hist_values / hist_values.iloc[0]).rename_axis("Date").reset_index()
+        fig_hist = go.Figure()
+        fig_hist.add_trace(go.Scatter(
+            x=hist_chart_data["Date"],
+            y=hist_chart_data["Portfolio Value"],
+            mode='lines',
+            name="Portfolio",
+            hovertemplate='Date: %{x|%b %d}<br>Value: %{y:.2f}<extra></extra>'
+        ))
+        fig_hist.add_trace(go.Scatter(
+            x=hist_chart_data["Date"],
+            y=hist_chart_data["S&P 500 (SPY)"],
+            mode='lines',
+            name="S&P 500",
+            line=dict(dash='dash'),
+            hovertemplate='Date: %{x|%b %d}<br>S&P 500: %{y:.2f}<extra></extra>'
+        ))
+        fig_hist.update_layout(
+            title="Portfolio vs S&P 500 (30-Day Normalized)",
+            xaxis_title="Date",
+            yaxis_title="Normalized Value",
+        )
+        update_plot_style(fig_hist)
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+    @st.fragment(run_every=run_every)
+    def render_live_history():
+        # Only today's point moves: the stored 30-day series is reused and its last row replaced
+        chart_values = hist_values
+        if live and not hist_values.empty:
+            value, _, spy_price = live_values(run_every)
+            today = pd.Timestamp.today().normalize()
+            chart_values = hist_values[hist_values.index < today].copy()
+            chart_values.loc[today] = [value.sum(), spy_price]
+        render_history_chart(chart_values.dropna())
 
     # ----- CHART LAYOUT -----
     col1, col2 = st.columns(2)
@@ -185,6 +173,6 @@ def render_overview_tab(df):
 
     with col4:
         st.subheader("Portfolio vs S&P 500")
-        st.plotly_chart(fig_hist, use_container_width=True)
+        render_live_history()
 
     return fig_alloc, fig_region, df["value"].sum()
@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import yfinance as yf
 import sys
 import os
+import time
 
 # Add the project root to sys.path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from stock_dashboard.analytics import PortfolioAnalytics
+from stock_dashboard.compute import price_holdings, unconverted_tickers
+from stock_dashboard.fx import base_currency
+from stock_dashboard.holdings import Holdings, as_holdings
+from stock_dashboard.instrumentation import diagnostics_enabled, render_diagnostics, timed
+from stock_dashboard.market_data import get_provider
 from stock_dashboard.overview_tab import render_overview_tab
 from stock_dashboard.price_change_tab import render_price_change_tab
 from stock_dashboard.value_over_time_tab import render_value_over_time_tab
@@ -99,10 +105,10 @@ h3 {
 
 # -------------------- SHARED DATA PREPARATION --------------------
 # Initialize portfolio
-portfolio = st.session_state.get("portfolio", [])
-if not portfolio:
+holdings = as_holdings(st.session_state.get("portfolio"))
+if not len(holdings):
     st.warning("No portfolio found. Using sample data.")
-    portfolio = [
+    holdings = Holdings.from_records([
         {"ticker": "AAPL", "quantity": 10}, {"ticker": "MSFT", "quantity": 5},
         {"ticker": "TSLA", "quantity": 3}, {"ticker": "AMZN", "quantity": 8},
         {"ticker": "GOOGL", "quantity": 6}, {"ticker": "NESN.SW", "quantity": 12},
@@ -111,26 +117,33 @@ if not portfolio:
         {"ticker": "7203.T", "quantity": 15}, {"ticker": "005930.KS", "quantity": 1},
         {"ticker": "9988.HK", "quantity": 10}, {"ticker": "TCS.NS", "quantity": 5},
         {"ticker": "0700.HK", "quantity": 8}
-    ]
-
-# Create portfolio DataFrame
-df = pd.DataFrame(portfolio)
-df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce")
-df.dropna(subset=["quantity"], inplace=True)
-
-# Fetch prices and calculate values
-@st.cache_data(show_spinner=True)
-def fetch_price(ticker):
-    try:
-        stock_info = yf.Ticker(ticker).info
-        return stock_info.get("regularMarketPrice", 0)
-    except:
-        return 0
-
-df["price"] = df["ticker"].apply(fetch_price)
-df["value"] = df["price"] * df["quantity"]
-df = df[df["price"] > 0]
+    ])
+
+# Fetch prices (one batched quote lookup per distinct symbol), convert them to the
+# base currency at the latest FX rates and calculate values
+with timed("prep", "prices"):
+    df = price_holdings(holdings)
 total_value = df["value"].sum()
+unconverted = unconverted_tickers(df)
+if unconverted:
+    st.warning(f"No {base_currency()} exchange rate for {', '.join(unconverted)}. "
+               "These holdings are shown without a value and left out of the totals.")
+
+# Portfolio analytics: built once per data refresh and shared by every tab
+def get_analytics(df):
+    provider = get_provider()
+    key = (
+        int(pd.util.hash_pandas_object(df[["ticker", "quantity", "price"]], index=False).sum()),
+        int(time.time() // provider.refresh_seconds),
+    )
+    cached = st.session_state.get("portfolio_analytics")
+    if cached is None or cached[0] != key:
+        cached = (key, PortfolioAnalytics.from_provider(df, provider))
+        st.session_state["portfolio_analytics"] = cached
+    return cached[1]
+
+with timed("prep", "analytics"):
+    analytics = get_analytics(df)
 
 # Generate charts
 fig_alloc = px.pie(df, values="value", names="ticker", title="Portfolio Allocation")
@@ -156,15 +169,21 @@ volatility_chart = None
 pe_chart = None
 
 # -------------------- RENDER SELECTED TAB --------------------
-if selected_tab == "Overview":
-    fig_alloc, fig_region, total_value = render_overview_tab(df)
-elif selected_tab == "Price Change":
-    render_price_change_tab(df)
-elif selected_tab == "Value Over Time":
-    render_value_over_time_tab(df)
-elif selected_tab == "Portfolio Classification":
-    key_metrics, volatility_chart = render_risk_classification_tab(df)
-elif selected_tab == "Summary":
-    sector_chart, pe_chart = render_summary_tab(df)
-elif selected_tab == "Export":
-    render_export_tab(df)
\ No newline at end of file
+# Each render is timed (see the Diagnostics panel) to tell network-bound from compute-bound tabs
+with timed("render", selected_tab):
+    if selected_tab == "Overview":
+        fig_alloc, fig_region, total_value = render_overview_tab(df, analytics)
+    elif selected_tab == "Price Change":
+        render_price_change_tab(df, analytics)
+    elif selected_tab == "Value Over Time":
+        render_value_over_time_tab(df)
+    elif selected_tab == "Portfolio Classification":
+        key_metrics, volatility_chart = render_risk_classification_tab(df, analytics)
+    elif selected_tab == "Summary":
+        sector_chart, pe_chart = render_summary_tab(df)
+    elif selected_tab == "Export":
+        render_export_tab(df)
+
+# -------------------- DIAGNOSTICS --------------------
+if diagnostics_enabled():
+    render_diagnostics()
@@ -0,0 +1,190 @@
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.market_data import MarketDataProvider, get_provider
+
+CHUNK_ROWS = 50_000
+MAX_REJECTED = 1_000  # rejected rows kept for the report
+
+# Header spellings seen in broker exports, compared case- and punctuation-insensitively.
+TICKER_COLUMNS = ("ticker", "symbol", "tickersymbol", "instrument", "security", "code")
+QUANTITY_COLUMNS = ("quantity", "qty", "shares", "units", "position", "holding", "amount")
+
+TICKER_RE = re.compile(r"^[A-Z0-9^][A-Z0-9.\-=^&]{0,19}$")  # "&" as in M&M.NS
+THOUSANDS_RE = re.compile(r"[+-]?\d{1,3}(?:,\d{3})+(?:\.\d+)?")  # 1,500 or 12,345.5
+DECIMAL_COMMA_RE = re.compile(r"^([+-]?\d*),(\d+)$")  # 1,5 as written in most of Europe
+SUPPORTED_TYPES = ("csv", "txt", "xlsx", "parquet")
+
+
+def _key(column) -> str:
+    return re.sub(r"[^a-z]", "", str(column).lower())
+
+
+def _pick(columns: List, aliases) -> Optional[Any]:
+    keys = {_key(c): c for c in columns}
+    return next((keys[a] for a in aliases if a in keys), None)
+
+
+def _file_type(source, name: Optional[str]) -> str:
+    name = name or getattr(source, "name", None) or (str(source) if isinstance(source, (str, os.PathLike)) else "")
+    extension = os.path.splitext(str(name))[1].lstrip(".").lower()
+    if extension not in SUPPORTED_TYPES:
+        raise ValueError(f"Unsupported file type '{extension or name}'. Use one of: {', '.join(SUPPORTED_TYPES)}.")
+    return extension
+
+
+def _excel_chunks(source, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Stream sheet rows in read-only mode instead of loading the whole workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) >= chunksize:
+                yield pd.DataFrame(block, columns=header)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=header)
+    finally:
+        workbook.close()
+
+
+def _parquet_chunks(source, chunksize: int) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(source)
+    names = parquet.schema_arrow.names
+    columns = [c for c in (_pick(names, TICKER_COLUMNS), _pick(names, QUANTITY_COLUMNS)) if c is not None]
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns or None):
+        yield batch.to_pandas()
+
+
+def read_chunks(source, name: Optional[str] = None, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Raw rows of a holdings file, ``chunksize`` rows at a time.
+
+    Args:
+        source: A path or binary file object (e.g. a Streamlit upload).
+        name (str, optional): File name used to detect the format when ``source`` has none.
+        chunksize (int): Rows per yielded frame.
+
+    Yields:
+        pd.DataFrame: Chunks with the file's own column names.
+    """
+    file_type = _file_type(source, name)
+    if file_type in ("csv", "txt"):
+        # sep=None sniffs commas, semicolons and tabs; strings are parsed by normalize_chunk
+        yield from pd.read_csv(source, sep=None, engine="python", dtype=str, chunksize=chunksize,
+                               skipinitialspace=True)
+    elif file_type == "xlsx":
+        yield from _excel_chunks(source, chunksize)
+    else:
+        yield from _parquet_chunks(source, chunksize)
+
+
+def normalize_chunk(chunk: pd.DataFrame):
+    """
+    Validate one chunk of raw rows.
+
+    Tickers are stripped and upper-cased. Quantities accept comma thousands
+    separators where every group has three digits (``1,500``); otherwise a
+    single comma is read as the decimal separator (``1,5`` is 1.5), and any
+    other use of commas makes the quantity invalid. Rows with a malformed
+    ticker or a missing, non-positive quantity are rejected with a reason and
+    their 1-based row in the chunk.
+
+    Returns:
+        tuple: ``(valid, rejected)`` frames; ``valid`` has ``ticker`` and ``quantity``.
+    """
+    ticker_col = _pick(list(chunk.columns), TICKER_COLUMNS)
+    quantity_col = _pick(list(chunk.columns), QUANTITY_COLUMNS)
+    if ticker_col is None or quantity_col is None:
+        raise ValueError(
+            "Could not find ticker and quantity columns "
+            f"(expected one of {TICKER_COLUMNS} and one of {QUANTITY_COLUMNS})."
+        )
+
+    tickers = chunk[ticker_col].astype("string").str.strip().str.upper().fillna("")
+    quantities = chunk[quantity_col]
+    if not pd.api.types.is_numeric_dtype(quantities):
+        text = quantities.astype("string").str.replace(r"\s", "", regex=True)
+        grouped = text.str.fullmatch(THOUSANDS_RE).fillna(False)
+        text = text.where(~grouped, text.str.replace(",", "", regex=False))
+        quantities = text.str.replace(DECIMAL_COMMA_RE, r"\1.\2", regex=True)
+    quantities = pd.to_numeric(quantities, errors="coerce").astype(float)
+
+    bad_ticker = ~tickers.str.match(TICKER_RE).fillna(False).to_numpy(dtype=bool)
+    bad_quantity = ~(quantities.to_numpy() > 0)
+    bad = bad_ticker | bad_quantity
+
+    valid = pd.DataFrame({"ticker": tickers[~bad].to_numpy(dtype=object), "quantity": quantities[~bad].to_numpy()})
+    rejected = pd.DataFrame({
+        "row": np.flatnonzero(bad) + 1,
+        "ticker": chunk[ticker_col][bad].to_numpy(),
+        "quantity": chunk[quantity_col][bad].to_numpy(),
+        "reason": np.where(bad_ticker[bad], "invalid ticker", "invalid quantity"),
+    })
+    return valid, rejected
+
+
+def import_holdings(source, name: Optional[str] = None, provider: Optional[MarketDataProvider] = None,
+                    resolve: bool = True, chunksize: int = CHUNK_ROWS):
+    """
+    Load a CSV, Excel or Parquet holdings file into a :class:`Holdings` container.
+
+    The file is read and validated chunk by chunk, so memory stays bounded by
+    ``chunksize`` plus the compact container. The distinct symbols are then
+    resolved against the market-data layer with a single batched quote
+    lookup, and positions whose symbol has no price are dropped.
+
+    Args:
+        source: A path or binary file object.
+        name (str, optional): File name used to detect the format.
+        provider (MarketDataProvider, optional): Defaults to :func:`get_provider`.
+        resolve (bool): Check symbols against the provider.
+        chunksize (int): Rows validated at a time.
+
+    Returns:
+        tuple: ``(holdings, report)`` where ``report`` holds row counts, the
+        ``rejected`` rows (first ``MAX_REJECTED``, with their line in the file,
+        or record number for Parquet) and ``unresolved`` symbols.
+    """
+    holdings = Holdings()
+    rejected: List[pd.DataFrame] = []
+    report: Dict[str, Any] = {"rows": 0, "rejected_count": 0}
+    # Text and sheet rows are reported as file lines (the header is line 1); Parquet has no lines
+    header_lines = 0 if _file_type(source, name) == "parquet" else 1
+    for chunk in read_chunks(source, name, chunksize):
+        valid, bad = normalize_chunk(chunk)
+        bad["row"] += report["rows"] + header_lines
+        report["rows"] += len(chunk)
+        report["rejected_count"] += len(bad)
+        if len(bad) and sum(map(len, rejected)) < MAX_REJECTED:
+            rejected.append(bad)
+        holdings.extend(valid["ticker"], valid["quantity"])
+
+    unresolved: List[str] = []
+    if resolve and len(holdings):
+        symbols = holdings.symbols
+        prices = (provider or get_provider()).quotes(symbols)["price"].reindex(symbols)
+        unresolved = prices.index[~(prices > 0)].tolist()
+        if unresolved:
+            frame = holdings.to_frame()
+            holdings = Holdings.from_frame(frame[~frame["ticker"].isin(unresolved)])
+
+    report["imported"] = len(holdings)
+    report["unresolved"] = unresolved
+    report["rejected"] = (pd.concat(rejected, ignore_index=True).head(MAX_REJECTED) if rejected
+                          else pd.DataFrame(columns=["row", "ticker", "quantity", "reason"]))
+    return holdings, report
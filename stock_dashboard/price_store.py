@@ -0,0 +1,129 @@
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from stock_dashboard.utils import data_dir
+
+# Relative move on an overlapping, already-closed bar that means the upstream
+# adjusted history (split or dividend) and the stored series must be rebuilt.
+ADJUSTMENT_TOLERANCE = 0.005
+
+HistoryFetcher = Callable[[List[str], Optional[str], Optional[str]], Dict[str, pd.DataFrame]]
+
+
+class PriceStore:
+    """
+    On-disk daily OHLCV bars, one Parquet file per symbol.
+
+    Each ``<SYMBOL>.parquet`` holds bars on a tz-naive ``Date`` index and a
+    ``<SYMBOL>.json`` sidecar records how far back the series was fetched
+    (``null`` for full history). :meth:`refresh` then only downloads bars after
+    the last stored date, so a cold start costs one small delta per symbol.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else data_dir("prices")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, ticker: str, suffix: str) -> Path:
+        return self.root / f"{ticker.replace(os.sep, '_')}{suffix}"
+
+    def load(self, ticker: str) -> pd.DataFrame:
+        """Stored bars for ``ticker`` (empty frame if none)."""
+        path = self._path(ticker, ".parquet")
+        if not path.exists():
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return pd.DataFrame()
+
+    def last_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        bars = self.load(ticker)
+        return bars.index[-1] if not bars.empty else None
+
+    def coverage(self, ticker: str):
+        """Start the stored series was fetched from; ``None`` = full history, ``False`` = not stored."""
+        path = self._path(ticker, ".json")
+        if not path.exists():
+            return False
+        try:
+            since = json.loads(path.read_text()).get("since")
+        except Exception:
+            return False
+        return pd.Timestamp(since) if since else None
+
+    def save(self, ticker: str, bars: pd.DataFrame, since: Optional[pd.Timestamp]) -> None:
+        """Replace the stored series (written atomically)."""
+        bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+        path = self._path(ticker, ".parquet")
+        tmp = path.with_suffix(".parquet.tmp")
+        bars.to_parquet(tmp)
+        os.replace(tmp, path)
+        self._path(ticker, ".json").write_text(
+            json.dumps({"since": None if since is None else str(since.date())})
+        )
+
+    def append(self, ticker: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """Merge newer bars into the stored series; later rows win on overlap."""
+        merged = pd.concat([self.load(ticker), bars])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        coverage = self.coverage(ticker)
+        self.save(ticker, merged, coverage if coverage is not False else bars.index[0])
+        return merged
+
+    def refresh(self, tickers: List[str], start: Optional[pd.Timestamp], fetch: HistoryFetcher) -> Dict[str, pd.DataFrame]:
+        """
+        Bring ``tickers`` up to date from ``start`` (``None`` = full history).
+
+        Symbols whose stored series already reaches ``start`` are grouped by
+        their resume date and delta-fetched in one batch per group; the rest
+        are fetched in full. ``fetch`` has the provider ``_fetch_history``
+        signature. Returns the stored bars from ``start`` per symbol.
+        """
+        stored = {t: self.load(t) for t in tickers}
+        resume_groups: Dict[pd.Timestamp, List[str]] = {}
+        full: List[str] = []
+        for t in tickers:
+            since = self.coverage(t)
+            covered = since is None or (since is not False and start is not None and since <= start)
+            if covered and len(stored[t]) >= 2:
+                # Refetch the last two bars: the newest may have been partial and the
+                # one before it is a closed bar we can check for adjustments.
+                resume_groups.setdefault(stored[t].index[-2], []).append(t)
+            else:
+                full.append(t)
+
+        for resume, group in resume_groups.items():
+            fetched = fetch(group, None, str(resume.date()))
+            for t in group:
+                bars = fetched.get(t)
+                if bars is None or bars.empty:
+                    continue
+                old_close = stored[t]["Close"].get(resume)
+                new_close = bars["Close"].get(resume)
+                if (old_close and pd.notna(new_close)
+                        and abs(new_close / old_close - 1) > ADJUSTMENT_TOLERANCE):
+                    full.append(t)
+                    continue
+                stored[t] = self.append(t, bars)
+
+        if full:
+            fetched = fetch(full, "max" if start is None else None, None if start is None else str(start.date()))
+            for t in full:
+                bars = fetched.get(t)
+                if bars is None or bars.empty:
+                    continue
+                self.save(t, bars, start)
+                stored[t] = bars
+
+        result = {}
+        for t in tickers:
+            bars = stored[t]
+            if bars.empty:
+                continue
+            result[t] = bars if start is None else bars.loc[bars.index >= start]
+        return result
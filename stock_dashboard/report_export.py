@@ -0,0 +1,402 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO, TextIOWrapper
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from stock_dashboard import indicators
+from stock_dashboard.market_data import HISTORY_FIELDS, MarketDataProvider, get_provider, unique_tickers
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+EXPORT_PERIOD = "1y"
+MAX_CACHED_EXPORTS = 8
+MAX_CHART_WORKERS = 4
+CHART_SIZE = (1000, 600)  # width, height in pixels
+PRICE_CHART_TICKERS = 10  # largest holdings drawn on the normalized price chart
+BLOCK_TICKERS = 50  # tickers whose technicals are computed and held at once
+EXCEL_MAX_ROWS = 1_048_576
+SIDECAR_FORMATS = ("parquet", "csv")
+
+TECHNICAL_INDICATORS = ["SMA_50", "SMA_200", "Volatility", "RSI"]
+TECHNICALS_COLUMNS = ["Date", *HISTORY_FIELDS, *TECHNICAL_INDICATORS, "Ticker"]
+
+XLSX_NAME = "portfolio_report.xlsx"
+PDF_NAME = "portfolio_summary.pdf"
+CHART_DIR = "charts"
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def collect_fundamentals(tickers: Iterable[str], provider: Optional[MarketDataProvider] = None) -> pd.DataFrame:
+    """One row of fundamentals per ticker that has ``.info``."""
+    provider = provider or get_provider()
+    tickers = unique_tickers(tickers)
+    infos = provider.info(tickers)
+    fundamentals = []
+    for t in tickers:
+        info = infos.get(t)
+        if not info:
+            continue
+        fundamentals.append({
+            "Ticker": t,
+            "Sector": info.get("sector"),
+            "Industry": info.get("industry"),
+            "Exchange": info.get("exchange"),
+            "Market Cap": info.get("marketCap"),
+            "P/E": info.get("trailingPE"),
+            "Forward EPS": info.get("forwardEps"),
+            "Dividend Yield": info.get("dividendYield"),
+            "Beta": info.get("beta"),
+            "Price to Book": info.get("priceToBook"),
+            "52W High": info.get("fiftyTwoWeekHigh"),
+            "52W Low": info.get("fiftyTwoWeekLow")
+        })
+    return pd.DataFrame(fundamentals)
+
+
+def iter_technicals(tickers: Iterable[str], provider: Optional[MarketDataProvider] = None,
+                    block: int = BLOCK_TICKERS) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    ``(ticker, technicals)`` per ticker, in portfolio order, one block of tickers at a time.
+
+    Each frame has the ``Date, OHLCV, Dividends, Stock Splits, SMA_50, SMA_200,
+    Volatility, RSI, Ticker`` columns for one ticker's days with a close; the
+    action columns are blank where the backend recorded none. Indicators are computed for a
+    whole block at once on its wide close matrix, and only that block is held
+    at any time, so memory depends on ``block`` rather than on the portfolio.
+    """
+    provider = provider or get_provider()
+    tickers = unique_tickers(tickers)
+    for i in range(0, len(tickers), block):
+        history = provider.history(tickers[i:i + block], period=EXPORT_PERIOD)
+        if history.empty:
+            continue
+        close = history["Close"]
+        computed = indicators.technicals(close, sma_windows=(50, 200), vol_window=30, rsi_window=14)
+        for t in close.columns:
+            columns = {field: history[field][t] for field in HISTORY_FIELDS if (field, t) in history.columns}
+            columns.update({name: computed[name][t] for name in TECHNICAL_INDICATORS})
+            frame = pd.DataFrame(columns).reindex(columns=TECHNICALS_COLUMNS[1:-1]).dropna(subset=["Close"])
+            if frame.empty:
+                continue
+            frame = frame.rename_axis("Date").reset_index()
+            frame["Ticker"] = t
+            yield t, frame[TECHNICALS_COLUMNS]
+
+
+def export_key(ticker_df: pd.DataFrame, provider: Optional[MarketDataProvider] = None, *options) -> str:
+    """
+    Cache key for an export: the holdings' content hash, the data version and any export ``options``.
+
+    The data version advances once per provider ``refresh_seconds``, the same
+    window in which the provider itself serves memoized market data, so a
+    repeat export inside it would produce identical files.
+    """
+    provider = provider or get_provider()
+    digest = hashlib.sha1(pd.util.hash_pandas_object(ticker_df, index=False).to_numpy().tobytes())
+    digest.update(str(int(time.time() // provider.refresh_seconds)).encode())
+    digest.update(repr(options).encode())
+    return digest.hexdigest()
+
+
+def cached_export(key: str) -> Optional[bytes]:
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+        return _cache.get(key)
+
+
+def _store(key: str, archive: bytes) -> None:
+    with _cache_lock:
+        _cache[key] = archive
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_EXPORTS:
+            _cache.popitem(last=False)
+
+
+# === Charts ===
+def report_figures(ticker_df: pd.DataFrame, fundamentals: pd.DataFrame,
+                   provider: Optional[MarketDataProvider] = None) -> Dict[str, "go.Figure"]:
+    """The report's charts, keyed by file stem."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    provider = provider or get_provider()
+    figures = {}
+    holdings = ticker_df.assign(ticker=ticker_df["ticker"].astype(str))
+    if "value" in holdings and holdings["value"].sum() > 0:
+        values = holdings.groupby("ticker", sort=False)["value"].sum().sort_values(ascending=False)
+        figures["allocation"] = px.pie(names=values.index, values=values.to_numpy(), title="Allocation by Ticker")
+
+        if not fundamentals.empty:
+            sectors = fundamentals.set_index("Ticker")["Sector"].fillna("Unknown")
+            by_sector = values.groupby(values.index.map(sectors).fillna("Unknown")).sum().sort_values(ascending=False)
+            figures["sectors"] = px.pie(names=by_sector.index, values=by_sector.to_numpy(), hole=0.4,
+                                        title="Sector Allocation")
+        largest = values.index[:PRICE_CHART_TICKERS]
+    else:
+        largest = unique_tickers(holdings["ticker"])[:PRICE_CHART_TICKERS]
+
+    close = provider.close(list(largest), period=EXPORT_PERIOD)
+    if not close.empty:
+        normalized = close / close.bfill().iloc[0] * 100
+        fig = go.Figure([go.Scatter(x=normalized.index, y=normalized[t].to_numpy(), mode="lines", name=t)
+                         for t in normalized.columns])
+        fig.update_layout(title=f"Normalized Close, Largest Holdings ({EXPORT_PERIOD})",
+                          xaxis_title="Date", yaxis_title="Normalized Price")
+        figures["normalized_prices"] = fig
+    return figures
+
+
+def _render_png(fig_json: str) -> Optional[bytes]:
+    """Process-pool worker: one figure (as Plotly JSON) to PNG bytes, or ``None`` if kaleido cannot render."""
+    import plotly.io as pio
+
+    try:
+        width, height = CHART_SIZE
+        return pio.to_image(pio.from_json(fig_json), format="png", width=width, height=height)
+    except Exception:
+        return None
+
+
+def render_images(figures: Dict[str, "go.Figure"]) -> Dict[str, bytes]:
+    """
+    PNG bytes per figure, rendered concurrently in worker processes.
+
+    Kaleido drives a headless browser per render, which is CPU-bound and far
+    slower than building the workbook, so each chart gets its own process.
+    Figures travel as JSON; charts that fail to render (no kaleido or Chrome)
+    are left out rather than failing the export.
+    """
+    if not figures:
+        return {}
+    payloads = {name: fig.to_json() for name, fig in figures.items()}
+    if multiprocessing.parent_process() is not None:
+        # Already a worker (the batch runner's pool): render here rather than nest another pool
+        images = {name: _render_png(payload) for name, payload in payloads.items()}
+    else:
+        workers = min(len(figures), MAX_CHART_WORKERS, os.cpu_count() or 1)
+        try:
+            # "spawn" keeps the workers clear of the parent's threads (Streamlit, fetch pool)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                images = dict(zip(payloads, pool.map(_render_png, payloads.values())))
+        except (BrokenProcessPool, RuntimeError, OSError):
+            # No usable pool: spawn needs an importable __main__ (scripts without a main guard,
+            # notebooks, some embedders), so render in this process instead
+            images = {name: _render_png(payload) for name, payload in payloads.items()}
+    return {name: png for name, png in images.items() if png}
+
+
+# === Files ===
+def _sheet_name(name: str, taken: set) -> str:
+    """An Excel-safe worksheet name (31 chars, no ``[]:*?/\\``) not already in ``taken``."""
+    base = re.sub(r"[\[\]:*?/\\]", "_", name)[:31] or "Sheet"
+    candidate, n = base, 1
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{base[:31 - len(str(n)) - 1]}~{n}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+class _SheetWriter:
+    """Appends frames to a worksheet row by row, starting a continuation sheet when one fills up."""
+
+    def __init__(self, workbook, name: str, columns: List[str], header_format, taken: set):
+        self.workbook, self.name, self.columns = workbook, name, columns
+        self.header_format, self.taken = header_format, taken
+        self.sheets = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self.sheets += 1
+        name = self.name if self.sheets == 1 else f"{self.name} ({self.sheets})"
+        self.sheet = self.workbook.add_worksheet(_sheet_name(name, self.taken))
+        self.sheet.write_row(0, 0, self.columns, self.header_format)
+        self.row = 1
+
+    def write(self, frame: pd.DataFrame) -> None:
+        # Plain Python values: NaN becomes a blank cell, timestamps become Excel dates
+        values = frame.astype(object).where(frame.notna(), None)
+        for record in values.itertuples(index=False, name=None):
+            if self.row >= EXCEL_MAX_ROWS:
+                self._new_sheet()
+            self.sheet.write_row(self.row, 0, record)
+            self.row += 1
+
+
+def write_excel(fh, ticker_df: pd.DataFrame, fundamentals: pd.DataFrame,
+                technicals: Iterable[Tuple[str, pd.DataFrame]], images: Dict[str, bytes],
+                per_ticker_sheets: bool = False) -> List[str]:
+    """
+    Stream the workbook to the open binary file ``fh``.
+
+    The workbook is opened in xlsxwriter's ``constant_memory`` mode, so each
+    row is flushed as soon as the next one starts and technicals are written
+    block by block as ``technicals`` yields them, into one sheet (continued
+    past Excel's row limit) or one sheet per ticker. Fundamentals are limited
+    to the tickers that had technicals, and the charts get their own sheet.
+
+    Returns:
+        list: The tickers written to the technicals sheets.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(fh, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd",
+        "remove_timezone": True,
+    })
+    header = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    taken = set()
+
+    # Sheet order is fixed at creation; constant_memory only needs each sheet's own rows in order
+    fundamentals_sheet = workbook.add_worksheet(_sheet_name("Fundamentals", taken))
+    technicals_sheet = None if per_ticker_sheets else _SheetWriter(workbook, "Technicals", TECHNICALS_COLUMNS,
+                                                                    header, taken)
+    written = []
+    for ticker, frame in technicals:
+        if per_ticker_sheets:
+            _SheetWriter(workbook, ticker, TECHNICALS_COLUMNS, header, taken).write(frame)
+        else:
+            technicals_sheet.write(frame)
+        written.append(ticker)
+
+    if not fundamentals.empty:
+        fundamentals = fundamentals[fundamentals["Ticker"].isin(written)]
+        fundamentals_sheet.write_row(0, 0, list(fundamentals.columns), header)
+        for row, record in enumerate(fundamentals.astype(object).where(fundamentals.notna(), None)
+                                     .itertuples(index=False, name=None), start=1):
+            fundamentals_sheet.write_row(row, 0, record)
+
+    original = _SheetWriter(workbook, "Original Input", [str(c) for c in ticker_df.columns], header, taken)
+    original.write(ticker_df)
+
+    if images:
+        sheet = workbook.add_worksheet(_sheet_name("Charts", taken))
+        rows_per_chart = CHART_SIZE[1] // 20 + 2  # default row height is 20px
+        for i, (name, png) in enumerate(images.items()):
+            sheet.insert_image(i * rows_per_chart, 0, f"{name}.png", {"image_data": BytesIO(png)})
+
+    workbook.close()
+    return written
+
+
+def write_sidecar(fh, technicals: Iterable[Tuple[str, pd.DataFrame]], fmt: str) -> None:
+    """
+    Stream technicals to ``fh`` as one Parquet file (a row group per ticker) or one CSV.
+
+    Both formats are written append-only, so only the current ticker's rows
+    are in memory.
+    """
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for _, frame in technicals:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(fh, table.schema)
+            writer.write_table(table.cast(writer.schema))
+        if writer is not None:
+            writer.close()
+    elif fmt == "csv":
+        text = TextIOWrapper(fh, encoding="utf-8", newline="")
+        header = True
+        for _, frame in technicals:
+            frame.to_csv(text, index=False, header=header)
+            header = False
+        text.flush()
+        text.detach()
+    else:
+        raise ValueError(f"Unsupported sidecar format: {fmt!r}")
+
+
+def generate_pdf(fundamentals: pd.DataFrame, images: Optional[Dict[str, bytes]] = None) -> bytes:
+    """The PDF summary: fundamentals per ticker, then the rendered chart ``images`` (PNG bytes)."""
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(200, 10, "Portfolio Summary Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.ln(10)
+
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.cell(200, 10, "Fundamentals Overview", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", size=11)
+    for _, row in fundamentals.iterrows():
+        line = f"{row['Ticker']} | Sector: {row['Sector']} | P/E: {row['P/E']} | Yield: {(row['Dividend Yield'] or 0) * 100:.2f}%"
+        pdf.multi_cell(0, 8, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(5)
+
+    if images:
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 14)
+        pdf.cell(200, 10, "Charts", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        # fpdf2 decodes the PNG straight from memory, no temporary files
+        for png in images.values():
+            pdf.image(BytesIO(png), w=190)
+            pdf.ln(5)
+
+    return bytes(pdf.output())
+
+
+def build_export(ticker_df: pd.DataFrame, provider: Optional[MarketDataProvider] = None,
+                 per_ticker_sheets: bool = False, sidecar: Optional[str] = None) -> bytes:
+    """
+    The full report package (Excel, PDF, chart PNGs and optional sidecar) as ZIP bytes.
+
+    Charts are rendered in worker processes, then the workbook and PDF are
+    streamed straight into their ZIP entries. Technicals are produced one
+    block of tickers at a time and written as they are computed, so peak
+    memory stays bounded however many tickers are exported; a ``"parquet"``
+    or ``"csv"`` sidecar re-runs the same stream into its own entry.
+
+    Results are cached by :func:`export_key`, so exporting the same portfolio
+    with the same options again within one data version returns immediately.
+    """
+    provider = provider or get_provider()
+    key = export_key(ticker_df, provider, per_ticker_sheets, sidecar)
+    archive = cached_export(key)
+    if archive is not None:
+        return archive
+
+    tickers = unique_tickers(ticker_df["ticker"].dropna().astype(str))
+    fundamentals = collect_fundamentals(tickers, provider)
+    images = render_images(report_figures(ticker_df, fundamentals, provider))
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        with zf.open(XLSX_NAME, "w", force_zip64=True) as fh:
+            written = write_excel(fh, ticker_df, fundamentals, iter_technicals(tickers, provider), images,
+                                  per_ticker_sheets=per_ticker_sheets)
+        if not fundamentals.empty:
+            fundamentals = fundamentals[fundamentals["Ticker"].isin(written)]
+        with zf.open(PDF_NAME, "w") as fh:
+            fh.write(generate_pdf(fundamentals, images))
+        if sidecar:
+            # The provider memoizes the history, so the second pass costs only the indicators
+            with zf.open(f"technicals.{sidecar}", "w", force_zip64=True) as fh:
+                write_sidecar(fh, iter_technicals(written, provider), sidecar)
+        for name, png in images.items():
+            zf.writestr(f"{CHART_DIR}/{name}.png", png)
+
+    archive = buffer.getvalue()
+    _store(key, archive)
+    return archive
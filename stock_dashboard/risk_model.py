@@ -0,0 +1,249 @@
+import argparse
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_dashboard import indicators
+from stock_dashboard.market_data import MarketDataProvider, get_provider, unique_tickers
+from stock_dashboard.utils import data_dir
+
+FEATURES = ["Volatility", "Beta", "P/E Ratio", "Dividend Yield", "Price Std Dev"]
+RISK_LEVELS = ["Low", "Moderate", "High"]
+FEATURE_PERIOD = "6mo"
+N_ESTIMATORS = 100
+
+SNAPSHOT_DIR = "risk_features"
+MODEL_DIR = "models"
+ARTIFACT_RE = re.compile(r"^risk_model-v(\d+)\.joblib$")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def extract_features(tickers: Iterable[str], provider: Optional[MarketDataProvider] = None,
+                     analytics=None) -> pd.DataFrame:
+    """
+    Risk features per ticker: ``ticker``, :data:`FEATURES` and ``Return``.
+
+    Rows missing any of :data:`FEATURES` are dropped; ``Return`` is NaN when
+    a ticker has no usable return window.
+
+    Price features come from the last ``FEATURE_PERIOD`` of ``analytics``
+    (a :class:`PortfolioAnalytics`, built for ``tickers`` when not given) and
+    are computed column-wise over its aligned close matrix, so the cost
+    barely grows with the number of tickers. Those closes are in the base
+    currency, so volatility and ``Price Std Dev`` include FX moves and the
+    latter is in base-currency units.
+    """
+    from stock_dashboard.analytics import PortfolioAnalytics
+
+    provider = provider or get_provider()
+    tickers = unique_tickers(tickers)
+    portfolio = analytics or PortfolioAnalytics.from_provider(pd.DataFrame({"ticker": tickers}), provider)
+    infos = provider.info(tickers, fields=["beta", "trailingPE", "dividendYield"])
+    info = pd.DataFrame.from_dict(infos, orient="index").reindex(
+        index=tickers, columns=["beta", "trailingPE", "dividendYield"]).astype(float)
+
+    closes = portfolio.window(FEATURE_PERIOD).reindex(columns=tickers)
+    features = pd.DataFrame({
+        "ticker": tickers,
+        "Volatility": indicators.rolling_volatility(closes, 30).mean().to_numpy(),
+        "Beta": info["beta"].to_numpy(),
+        "P/E Ratio": info["trailingPE"].to_numpy(),
+        "Dividend Yield": info["dividendYield"].fillna(0).to_numpy() * 100,
+        "Price Std Dev": closes.std().to_numpy(),
+        "Return": (closes.ffill().iloc[-1] / closes.bfill().iloc[0] - 1).to_numpy() * 100
+        if not closes.empty else np.nan,
+    })
+    # Tickers without any .info are skipped, as before, rather than scored on defaults
+    features = features[info.notna().any(axis=1).to_numpy()]
+    return features.dropna(subset=FEATURES).reset_index(drop=True)
+
+
+def label_risk(features: pd.DataFrame) -> pd.Series:
+    """
+    Rule-based risk level for every row of ``features`` at once.
+
+    Two points for volatility above 35% or beta above 1.2, one for a P/E
+    above 30 and one for a dividend yield under 1%: 3+ is High, 2 Moderate,
+    anything less Low.
+    """
+    score = (
+        np.where((features["Volatility"] > 0.35) | (features["Beta"] > 1.2), 2, 0)
+        + (features["P/E Ratio"] > 30).to_numpy(dtype=int)
+        + (features["Dividend Yield"] < 1).to_numpy(dtype=int)
+    )
+    return pd.Series(np.select([score >= 3, score == 2], ["High", "Moderate"], "Low"), index=features.index)
+
+
+# ----- snapshots -----
+def save_snapshot(features: pd.DataFrame, as_of=None, root=None) -> Path:
+    """
+    Store a feature frame as ``<root>/<YYYY-MM-DD>.parquet``.
+
+    Several snapshots on the same day are merged, the latest row per ticker
+    winning, so a universe can be collected in batches.
+    """
+    root = Path(root) if root else data_dir(SNAPSHOT_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    path = root / f"{as_of:%Y-%m-%d}.parquet"
+    features = features[["ticker", *FEATURES]]
+    if path.exists():
+        features = pd.concat([pd.read_parquet(path), features]).drop_duplicates("ticker", keep="last")
+    features.reset_index(drop=True).to_parquet(path, index=False)
+    return path
+
+
+def load_snapshots(root=None) -> pd.DataFrame:
+    """Every stored snapshot in one frame, with an ``as_of`` date column."""
+    root = Path(root) if root else data_dir(SNAPSHOT_DIR)
+    frames = [pd.read_parquet(path).assign(as_of=pd.Timestamp(path.stem)) for path in sorted(root.glob("*.parquet"))]
+    if not frames:
+        return pd.DataFrame(columns=["ticker", *FEATURES, "as_of"])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ----- artifacts -----
+def artifact_versions(root=None) -> List[int]:
+    root = Path(root) if root else data_dir(MODEL_DIR)
+    return sorted(int(m.group(1)) for m in (ARTIFACT_RE.match(p.name) for p in root.glob("*.joblib")) if m)
+
+
+def train(snapshots: Optional[pd.DataFrame] = None, root=None, n_estimators: int = N_ESTIMATORS,
+          random_state: int = 42) -> Path:
+    """
+    Fit the classifier on stored snapshots and save it as the next artifact version.
+
+    Labels are the rule-based levels of :func:`label_risk`; the forest learns
+    them from the whole snapshot universe, not from any one portfolio.
+
+    Returns:
+        Path: The new ``risk_model-v<N>.joblib``.
+    """
+    import joblib
+    import sklearn
+    from sklearn.ensemble import RandomForestClassifier
+
+    snapshots = load_snapshots() if snapshots is None else snapshots
+    snapshots = snapshots.dropna(subset=FEATURES)
+    if snapshots.empty:
+        raise ValueError("No feature snapshots to train on; run the 'snapshot' command first.")
+
+    X = snapshots[FEATURES].to_numpy(dtype=float)
+    y = label_risk(snapshots).to_numpy()
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=-1)
+    model.fit(X, y)
+    model.set_params(n_jobs=1)  # inference batches are small; skip the worker start-up
+
+    root = Path(root) if root else data_dir(MODEL_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    version = (artifact_versions(root) or [0])[-1] + 1
+    path = root / f"risk_model-v{version:04d}.joblib"
+    tmp = path.with_suffix(".tmp")
+    joblib.dump({
+        "model": model,
+        "version": version,
+        "features": FEATURES,
+        "trained_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "samples": len(snapshots),
+        "tickers": int(snapshots["ticker"].nunique()),
+        "sklearn": sklearn.__version__,
+    }, tmp)
+    tmp.replace(path)
+    return path
+
+
+class RiskModel:
+    """A loaded classifier artifact; :meth:`predict` labels any number of holdings in one call."""
+
+    def __init__(self, artifact: dict, path: Optional[Path] = None):
+        self.model = artifact["model"]
+        self.version = artifact["version"]
+        self.trained_at = artifact.get("trained_at")
+        self.path = path
+
+    @classmethod
+    def load(cls, root=None) -> Optional["RiskModel"]:
+        """The newest artifact whose feature layout matches :data:`FEATURES`, or ``None``."""
+        import joblib
+
+        root = Path(root) if root else data_dir(MODEL_DIR)
+        for version in reversed(artifact_versions(root)):
+            path = root / f"risk_model-v{version:04d}.joblib"
+            try:
+                artifact = joblib.load(path)
+            except Exception:
+                continue
+            if artifact.get("features") == FEATURES:
+                return cls(artifact, path)
+        return None
+
+    def predict(self, features: pd.DataFrame) -> pd.Series:
+        if features.empty:
+            return pd.Series(dtype=object, index=features.index)
+        return pd.Series(self.model.predict(features[FEATURES].to_numpy(dtype=float)), index=features.index)
+
+
+def get_model() -> Optional[RiskModel]:
+    """
+    The process-wide model, loaded on first use.
+
+    Once an artifact is loaded it is kept for the life of the process; while
+    none exists the (cheap) directory scan is repeated, so a model trained
+    later is picked up without a restart.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = RiskModel.load()
+    return _model
+
+
+def predict_risk(features: pd.DataFrame) -> pd.Series:
+    """Risk level per row from the trained model, or from the rules when no artifact exists."""
+    model = get_model()
+    if model is None:
+        return label_risk(features)
+    return model.predict(features)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect risk features and train the risk classifier offline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="Compute features for a ticker universe and store them.")
+    snapshot.add_argument("tickers", nargs="*", help="Ticker symbols.")
+    snapshot.add_argument("--file", help="Text file with one ticker per line.")
+
+    train_cmd = commands.add_parser("train", help="Fit the classifier on every stored snapshot.")
+    train_cmd.add_argument("--trees", type=int, default=N_ESTIMATORS)
+
+    args = parser.parse_args(argv)
+    if args.command == "snapshot":
+        tickers = list(args.tickers)
+        if args.file:
+            tickers += [line.strip() for line in Path(args.file).read_text().splitlines() if line.strip()]
+        if not tickers:
+            parser.error("give tickers or --file")
+        features = extract_features(tickers)
+        path = save_snapshot(features)
+        print(f"Stored features for {len(features)} of {len(unique_tickers(tickers))} tickers in {path}")
+    elif args.command == "train":
+        try:
+            path = train(n_estimators=args.trees)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,7 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import yfinance as yf
 import plotly.graph_objects as go
 import plotly.express as px
+from stock_dashboard.compute import compute_summary
 
 def render_summary_tab(df):
     # === Full Dark Theme + White Text Styling ===
@@ -42,25 +40,13 @@ def render_summary_tab(df):
     tickers = df["ticker"].dropna().unique().tolist()
     selected = st.selectbox("Select a stock to analyze", tickers)
 
-    @st.cache_data
-    def get_stock_data(ticker):
-        t = yf.Ticker(ticker)
-        info = t.info
-        hist = t.history(period="1y", auto_adjust=True)
-        hist["SMA_50"] = hist["Close"].rolling(50).mean()
-        hist["SMA_200"] = hist["Close"].rolling(200).mean()
-        hist["Volatility"] = hist["Close"].pct_change().rolling(30).std() * np.sqrt(252)
-        hist["RSI"] = 100 - (100 / (1 + hist["Close"].pct_change().rolling(14).apply(
-            lambda x: (x[x > 0].sum() / abs(x[x < 0].sum())) if abs(x[x < 0].sum()) > 0 else 0)))
-        hist["Upper Band"] = hist["Close"].rolling(20).mean() + 2 * hist["Close"].rolling(20).std()
-        hist["Lower Band"] = hist["Close"].rolling(20).mean() - 2 * hist["Close"].rolling(20).std()
-        return info, hist
-
-    info, hist = get_stock_data(selected)
-    current_price = hist["Close"].iloc[-1]
-    avg_volume = hist["Volume"].rolling(20).mean().iloc[-1]
+    # Live refresh: the previous result for this ticker carries the streaming indicator state,
+    # so only bars newer than it are computed
+    cache = st.session_state.setdefault("summary_indicators", {})
+    result = cache[selected] = compute_summary(selected, previous=cache.get(selected))
+    info, hist = result.info, result.history
+    current_price, avg_volume, rsi = result.price, result.avg_volume, result.rsi
     earnings = info.get("nextEarningsDate", "N/A")
-    rsi = hist["RSI"].iloc[-1]
 
     # === Summary Metrics ===
     col1, col2, col3, col4 = st.columns(4)
@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+
+
+def data_dir(*parts: str) -> Path:
+    """
+    Return (and create) a directory under the app's local data root.
+
+    The root defaults to ``~/.portfolio_analysis`` and can be moved with the
+    ``PORTFOLIO_DATA_DIR`` environment variable.
+
+    Args:
+        *parts (str): Optional sub-directory components.
+
+    Returns:
+        Path: The existing directory path.
+    """
+    root = Path(os.environ.get("PORTFOLIO_DATA_DIR", Path.home() / ".portfolio_analysis"))
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,67 +1,8 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
-import numpy as np
-
-@st.cache_data
-def get_ticker_currencies(tickers):
-    currencies = {}
-    for ticker in tickers:
-        try:
-            info = yf.Ticker(ticker).info
-            currencies[ticker] = info.get("currency", "USD")
-        except:
-            currencies[ticker] = "USD"
-    return currencies
-
-@st.cache_data
-def fetch_fx_rates(currencies):
-    fx_rates = {}
-    for curr in currencies:
-        if curr == "USD":
-            fx_rates[curr] = 1.0
-        else:
-            fx_symbol = f"{curr}USD=X"
-            try:
-                fx_data = yf.download(fx_symbol, period="7d", interval="1d", progress=False)
-                if not fx_data.empty:
-                    fx_rates[curr] = fx_data["Adj Close"].iloc[-1]
-                else:
-                    fx_rates[curr] = None
-            except:
-                fx_rates[curr] = None
-    return fx_rates
-
-@st.cache_data(show_spinner=True)
-def fetch_price_history(tickers, start):
-    try:
-        data = yf.download(tickers, start=start, auto_adjust=True, progress=False)["Close"]
-        return data.dropna(axis=1, how="all") if not data.empty else pd.DataFrame()
-    except:
-        return pd.DataFrame()
-
-@st.cache_data(show_spinner=True)
-def calculate_returns(prices):
-    returns = pd.DataFrame(index=prices.columns)
-    today = prices.index[-1]
-
-    def calc_return(days):
-        try:
-            past = prices.index[-1] - pd.Timedelta(days=days)
-            past_idx = prices.index[prices.index >= past][0]
-            return ((prices.loc[today] - prices.loc[past_idx]) / prices.loc[past_idx]) * 100
-        except:
-            return pd.Series(np.nan, index=prices.columns)
-
-    returns["1M"] = calc_return(30)
-    returns["6M"] = calc_return(180)
-    returns["1Y"] = calc_return(365)
-    returns["5Y"] = calc_return(1825)
-    returns["Max Drawdown %"] = (
-        prices.apply(lambda x: ((x / x.cummax()) - 1).min() * 100)
-    )
-    return returns.round(2)
+from stock_dashboard.compute import compute_value_over_time
+from stock_dashboard.downsample import line_trace, use_webgl
 
 def render_value_over_time_tab(df):
     st.markdown("""
@@ -124,73 +65,79 @@ div[role="radiogroup"] label {
     benchmark_input = st.sidebar.text_input("Add Benchmark Symbols (comma-separated)", value="^GSPC")
     benchmarks = [t.strip().upper() for t in benchmark_input.split(",") if t.strip()]
 
-    all_tickers = list(set(tickers + benchmarks))
-    price_data = fetch_price_history(all_tickers, start=start_date)
+    result = compute_value_over_time(tickers, benchmarks, start_date)
 
-    if price_data.empty:
+    if result.empty:
         st.error("No price data found.")
         return
 
-    benchmark_data = price_data[benchmarks].dropna(axis=1, how="all") if benchmarks else pd.DataFrame()
-    stock_data = price_data.drop(columns=benchmarks, errors="ignore")
-
-    # FX Conversion (silent)
-    currencies = get_ticker_currencies(stock_data.columns.tolist())
-    fx_rates = fetch_fx_rates(set(currencies.values()))
-    for ticker in stock_data.columns:
-        fx = fx_rates.get(currencies.get(ticker, "USD"), 1.0) or 1.0
-        stock_data[ticker] *= fx
+    stock_data, benchmark_data = result.prices, result.benchmarks
 
     # Chart Controls
     st.subheader("Chart Options")
     selected_tickers = st.multiselect("Select Tickers", stock_data.columns.tolist(), default=stock_data.columns.tolist())
-    view_type = st.radio("View Type", ["Normalized", "Actual Prices"], horizontal=True)
-    log_y = st.checkbox("Logarithmic Y-Axis", value=False)
-
-    chart_data = stock_data[selected_tickers]
-    if view_type == "Normalized":
-        chart_data = chart_data.divide(chart_data.iloc[0]) * 100
-        if not benchmark_data.empty:
-            benchmark_data = benchmark_data.divide(benchmark_data.iloc[0]) * 100
-
-    # Main Chart
-    fig = go.Figure()
-
-    for ticker in chart_data.columns:
-        fig.add_trace(go.Scatter(
-            x=chart_data.index,
-            y=chart_data[ticker],
-            name=ticker,
-            line=dict(width=2),
-            opacity=0.9,
-            hovertemplate=f"{ticker}<br>Date=%{{x|%Y-%m-%d}}<br>Price=%{{y:.2f}}"
-        ))
-
-    for bm in benchmark_data.columns:
-        fig.add_trace(go.Scatter(
-            x=benchmark_data.index,
-            y=benchmark_data[bm],
-            name=f"{bm} (Benchmark)",
-            line=dict(width=3, dash="dash"),
-            hovertemplate=f"{bm}<br>Date=%{{x|%Y-%m-%d}}<br>Price=%{{y:.2f}}"
-        ))
-
-    fig.update_layout(
-        title=dict(text=f"{view_type} Performance", font=dict(color='white')),
-        xaxis=dict(title="Date", color='white'),
-        yaxis=dict(title="Price" if view_type == "Actual Prices" else "Normalized (Start = 100)", type="log" if log_y else "linear", color='white'),
-        plot_bgcolor="#1E1E2F",
-        paper_bgcolor="#1E1E2F",
-        font=dict(color='white'),
-        legend=dict(font=dict(color='white')),
-        hoverlabel=dict(bgcolor='black', font_color='white')
-    )
 
-    st.plotly_chart(fig, use_container_width=True)
+    # Fragment: the view and axis toggles re-render only this chart, from the data passed in
+    @st.fragment
+    def render_performance_chart(chart_data, benchmark_data):
+        view_type = st.radio("View Type", ["Normalized", "Actual Prices"], horizontal=True)
+        log_y = st.checkbox("Logarithmic Y-Axis", value=False)
+
+        # Streamlit does not report Plotly zoom events, so zooming is a range control:
+        # the chosen window is re-downsampled, giving full resolution on short ranges
+        first, last = chart_data.index[0].date(), chart_data.index[-1].date()
+        if first < last:
+            date_range = st.slider("Date Range", min_value=first, max_value=last, value=(first, last))
+            window = slice(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))
+            chart_data = chart_data.loc[window]
+            benchmark_data = benchmark_data.loc[window] if not benchmark_data.empty else benchmark_data
+
+        if view_type == "Normalized":
+            chart_data = chart_data.divide(chart_data.iloc[0]) * 100
+            if not benchmark_data.empty:
+                benchmark_data = benchmark_data.divide(benchmark_data.iloc[0]) * 100
+
+        # Main Chart (each trace downsampled to about the chart's pixel width)
+        fig = go.Figure()
+        webgl = use_webgl(chart_data, benchmark_data)
+
+        for ticker in chart_data.columns:
+            fig.add_trace(line_trace(
+                chart_data[ticker],
+                webgl=webgl,
+                name=ticker,
+                line=dict(width=2),
+                opacity=0.9,
+                hovertemplate=f"{ticker}<br>Date=%{{x|%Y-%m-%d}}<br>Price=%{{y:.2f}}"
+            ))
+
+        for bm in benchmark_data.columns:
+            fig.add_trace(line_trace(
+                benchmark_data[bm],
+                webgl=webgl,
+                name=f"{bm} (Benchmark)",
+                line=dict(width=3, dash="dash"),
+                hovertemplate=f"{bm}<br>Date=%{{x|%Y-%m-%d}}<br>Price=%{{y:.2f}}"
+            ))
+
+        fig.update_layout(
+            title=dict(text=f"{view_type} Performance", font=dict(color='white')),
+            xaxis=dict(title="Date", color='white'),
+            yaxis=dict(title="Price" if view_type == "Actual Prices" else "Normalized (Start = 100)", type="log" if log_y else "linear", color='white'),
+            plot_bgcolor="#1E1E2F",
+            paper_bgcolor="#1E1E2F",
+            font=dict(color='white'),
+            legend=dict(font=dict(color='white')),
+            hoverlabel=dict(bgcolor='black', font_color='white')
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    render_performance_chart(stock_data[selected_tickers], benchmark_data)
 
     # Returns Table
     st.subheader("Performance Summary and Max Drawdown")
-    returns_df = calculate_returns(stock_data[selected_tickers])
+    returns_df = result.returns.loc[selected_tickers]
 
     def colorize(val):
         if pd.isna(val):
@@ -201,18 +148,18 @@ div[role="radiogroup"] label {
             return "color: #ff4444"
         return "color: white"
 
-    styled_df = returns_df.style.format("{:.2f}%").applymap(colorize)
+    styled_df = returns_df.style.format("{:.2f}%").map(colorize)
     st.dataframe(styled_df, use_container_width=True)
 
     # Rolling Volatility Chart
     st.subheader("30-Day Rolling Volatility")
     vol_fig = go.Figure()
+    webgl = use_webgl(stock_data[selected_tickers])
     for ticker in selected_tickers:
-        returns = stock_data[ticker].pct_change().dropna()
-        rolling_vol = returns.rolling(30).std() * 100
-        vol_fig.add_trace(go.Scatter(
-            x=rolling_vol.index,
-            y=rolling_vol,
+        vol_fig.add_trace(line_trace(
+            result.volatility[ticker].dropna(),
+            webgl=webgl,
+            method="minmax",
             name=ticker,
             line=dict(width=2),
             hovertemplate=f"{ticker}<br>Date=%{{x|%Y-%m-%d}}<br>30d Volatility=%{{y:.2f}}%"
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks import fixtures
+from benchmarks.fixtures import write_fixture
+from stock_dashboard.market_data import LocalFileProvider, set_provider
+
+SMALL_PORTFOLIO = 15
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    """Keep every cache, store and fixture of a test under its own temp dir."""
+    monkeypatch.setenv("PORTFOLIO_DATA_DIR", str(tmp_path / "home"))
+    monkeypatch.delenv("PORTFOLIO_BASE_CURRENCY", raising=False)
+    yield tmp_path / "home"
+    set_provider(None)
+
+
+@pytest.fixture(scope="session")
+def market_root(tmp_path_factory):
+    """The benchmarks' recorded 15-ticker portfolio, written once per session."""
+    root = tmp_path_factory.mktemp("market")
+    # Windows are cut back from today, so the recorded bars must end today
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fixtures, "END_DATE", pd.Timestamp.today().normalize())
+        write_fixture(root, SMALL_PORTFOLIO)
+    return root
+
+
+@pytest.fixture
+def provider(market_root):
+    """A fresh replay provider over :func:`market_root`, installed as the shared one."""
+    provider = LocalFileProvider(market_root)
+    set_provider(provider)
+    return provider
+
+
+@pytest.fixture
+def empty_provider(tmp_path):
+    """A replay provider with nothing recorded; tests ``save`` what they need."""
+    provider = LocalFileProvider(tmp_path / "market")
+    set_provider(provider)
+    return provider
+
+
+def daily_bars(closes, end=None):
+    """OHLCV bars around ``closes`` on the business days up to ``end`` (default today)."""
+    closes = np.asarray(closes, dtype=float)
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+    return pd.DataFrame(
+        {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": 1_000},
+        index=pd.bdate_range(end=end, periods=len(closes), name="Date"),
+    )
@@ -0,0 +1,99 @@
+import io
+import json
+from collections import defaultdict
+
+import pytest
+
+from stock_dashboard import batch
+from stock_dashboard.analytics import BENCHMARK
+from stock_dashboard.compute import price_holdings
+from stock_dashboard.market_data import LocalFileProvider, set_provider
+
+PORTFOLIOS = {
+    "alpha": "ticker,quantity\nU0000,10\nU0001,5\nF0000.DE,20\n",
+    "beta": "Symbol;Qty\nU0001;3\nF0000.DE;1\nF0001.L;100\nF0002.T;50\n",
+}
+PAIRS = ["EURUSD=X", "GBPUSD=X", "JPYUSD=X"]
+
+
+class RecordingProvider(LocalFileProvider):
+    """Replays the recorded market and keeps every batch that goes upstream, per endpoint."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.batches = defaultdict(list)
+
+    def _coalesce(self, endpoint, tickers, window, fetch):
+        def recorded(batch):
+            self.batches[endpoint].append(sorted(batch))
+            return fetch(batch)
+        return super()._coalesce(endpoint, tickers, window, recorded)
+
+
+@pytest.fixture
+def upstream(market_root):
+    provider = RecordingProvider(market_root)
+    set_provider(provider)
+    return provider
+
+
+@pytest.fixture
+def portfolio_dir(tmp_path):
+    directory = tmp_path / "portfolios"
+    directory.mkdir()
+    for name, text in PORTFOLIOS.items():
+        (directory / f"{name}.csv").write_text(text)
+    (directory / "notes.md").write_text("not a portfolio")
+    return directory
+
+
+def test_batch_fetches_the_union_once_and_workers_replay_the_snapshot(upstream, portfolio_dir, tmp_path,
+                                                                     monkeypatch):
+    snapshot_market_data = batch.snapshot_market_data
+
+    def marked_snapshot(*args, **kwargs):
+        # Move one recorded quote, so results that did not come from the snapshot would show it
+        replay = snapshot_market_data(*args, **kwargs)
+        path = replay.root / "info" / "U0001.json"
+        path.write_text(json.dumps({**json.loads(path.read_text()), "regularMarketPrice": 1234.5}))
+        return replay
+
+    monkeypatch.setattr(batch, "snapshot_market_data", marked_snapshot)
+    out = tmp_path / "out"
+    summaries = batch.run_batch(portfolio_dir, out, workers=2, benchmarks=["u0002"], export=False)
+
+    union = {"U0000", "U0001", "F0000.DE", "F0001.L", "F0002.T", BENCHMARK, "U0002"}
+    # One batch per endpoint for the holdings' union; .info for the FX pairs is the only follow-up
+    assert [set(b) for b in upstream.batches["quote"]] == [union | set(PAIRS)]
+    assert [set(b) for b in upstream.batches["history"]] == [union | set(PAIRS)]
+    assert [set(b) for b in upstream.batches["info"]] == [union, set(PAIRS)]
+
+    snapshot = out / batch.SNAPSHOT_DIR
+    recorded = {p.stem for p in (snapshot / "history").glob("*.csv")}
+    assert recorded == union | set(PAIRS)
+    assert {p.stem for p in (snapshot / "info").glob("*.json")} == union | set(PAIRS)
+    assert "regularMarketPrice" in json.loads((snapshot / "info" / "EURUSD=X.json").read_text())
+
+    assert [s["portfolio"] for s in summaries] == ["alpha", "beta"]
+    assert not any("error" in s for s in summaries)
+    # The workers' own processes priced U0001 at the marked snapshot quote
+    replay = LocalFileProvider(snapshot)
+    for summary, text in zip(summaries, PORTFOLIOS.values()):
+        holdings, _ = batch.import_holdings(io.StringIO(text), name="p.csv", resolve=False)
+        priced = price_holdings(holdings, replay)
+        assert priced.loc[priced["ticker"] == "U0001", "price"].tolist() == [1234.5]
+        expected = priced["value"].sum()
+        assert summary["total_value"] == pytest.approx(expected)
+        assert summary["unconverted"] == []
+        written = json.loads((out / summary["portfolio"] / batch.SUMMARY_NAME).read_text())
+        assert written["total_value"] == pytest.approx(expected)
+    assert (out / "summary.csv").exists()
+
+
+def test_unreadable_portfolios_are_skipped(upstream, tmp_path):
+    directory = tmp_path / "portfolios"
+    directory.mkdir()
+    (directory / "empty.csv").write_text("ticker,quantity\nbad ticker!,1\n")
+    (directory / "columns.csv").write_text("name,amount\nApple,1\n")
+    assert batch.run_batch(directory, tmp_path / "out") == []
+    assert not upstream.batches
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks import bench_tabs
+from benchmarks.fixtures import FX_PAIRS, portfolio_tickers
+from conftest import SMALL_PORTFOLIO
+
+
+@pytest.fixture
+def positions():
+    return [(t, i + 1) for i, t in enumerate(portfolio_tickers(SMALL_PORTFOLIO))]
+
+
+def test_cold_pass_counts_each_upstream_batch_once(market_root, positions):
+    results, provider = bench_tabs.run_pass(market_root, positions)
+    assert list(results) == [name for name, _ in bench_tabs.STAGES]
+    # The file backend's quotes read info and history internally; that is still one quote call
+    assert results["holdings"]["calls"] == {"quote": 1, "info": 1, "history": 1}
+    assert results["holdings"]["symbols"] == SMALL_PORTFOLIO * 2 + len(FX_PAIRS)
+    assert provider.calls["quote"] == 2 and provider.symbols["quote"] == SMALL_PORTFOLIO + 1
+    assert provider.calls["info"] == 1
+    # After the shared analytics, only the 5-year window (holdings and FX) goes upstream
+    assert results["price_change"]["calls"] == {"history": 2}
+    for stage in ("value_over_time", "classification", "summary", "export"):
+        assert results[stage]["calls"] == {}, stage
+
+
+def test_warm_pass_makes_no_upstream_calls(market_root, positions):
+    _, provider = bench_tabs.run_pass(market_root, positions)
+    results, _ = bench_tabs.run_pass(market_root, positions, provider)
+    assert all(r["calls"] == {} and r["symbols"] == 0 for r in results.values())
+
+
+def test_memory_pass_reports_peaks(market_root, positions):
+    results, _ = bench_tabs.run_pass(market_root, positions, memory=True)
+    assert all(r["peak_mb"] > 0 and r["seconds"] >= 0 for r in results.values())
+
+
+def test_compare_flags_stages_past_the_tolerance():
+    baseline = {"small": {"holdings": {"cold_s": 1.0}, "export": {"cold_s": 1.0}}}
+    report = {"small": {"holdings": {"cold_s": 1.2}, "export": {"cold_s": 1.3}, "summary": {"cold_s": 9.0}}}
+    assert bench_tabs.compare(report, baseline, 0.25) == ["small/export: 1000.0 -> 1300.0 ms"]
+
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard import compute
+from stock_dashboard.analytics import BENCHMARK, PortfolioAnalytics
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.risk_model import RISK_LEVELS
+
+POSITIONS = {"U0000": 10, "U0001": 5, "F0000.DE": 20, "F0001.L": 100, "F0002.T": 50}
+
+
+def local_close(provider, ticker):
+    return provider.close([ticker], period="max")[ticker]
+
+
+@pytest.fixture
+def holdings_frame(provider):
+    holdings = Holdings(list(POSITIONS) + ["NOPE"], list(POSITIONS.values()) + [1])
+    return compute.price_holdings(holdings, provider)
+
+
+@pytest.fixture
+def analytics(holdings_frame, provider):
+    return PortfolioAnalytics.from_provider(holdings_frame, provider)
+
+
+def test_price_holdings_converts_quotes_and_drops_unpriced(holdings_frame, provider):
+    frame = holdings_frame.set_index(holdings_frame["ticker"].astype(str))
+    assert list(frame.index) == list(POSITIONS)
+    gbp = local_close(provider, "GBPUSD=X").iloc[-1]
+    assert frame.loc["F0001.L", "currency"] == "GBp"
+    assert frame.loc["F0001.L", "fx_rate"] == pytest.approx(0.01 * gbp)
+    assert frame.loc["F0001.L", "price"] == pytest.approx(local_close(provider, "F0001.L").iloc[-1] * 0.01 * gbp)
+    assert frame.loc["U0000", "price"] == pytest.approx(local_close(provider, "U0000").iloc[-1])
+    np.testing.assert_allclose(frame["value"], frame["price"] * frame["quantity"])
+
+
+def test_price_holdings_keeps_holdings_without_an_fx_rate(empty_provider):
+    empty_provider.save("AAA", info={"currency": "USD"}, history=daily_bars([10.0, 11.0]))
+    empty_provider.save("BBB.DE", info={"currency": "EUR"}, history=daily_bars([20.0, 21.0]))  # no EURUSD=X
+    empty_provider.save("CCC", info={"currency": "USD"})  # no quote at all
+    empty_provider.save(BENCHMARK, info={"currency": "USD"}, history=daily_bars([400.0, 401.0]))
+    df = compute.price_holdings(Holdings(["AAA", "BBB.DE", "CCC"], [2, 3, 4]), empty_provider)
+
+    assert df["ticker"].astype(str).tolist() == ["AAA", "BBB.DE"]
+    assert compute.unconverted_tickers(df) == ["BBB.DE"]
+    assert np.isnan(df["price"].iloc[1]) and np.isnan(df["value"].iloc[1])
+    assert df["value"].sum() == pytest.approx(22.0)
+
+    overview = compute.compute_overview(df, provider=empty_provider)
+    assert overview.top_holding == "AAA"
+    assert overview.dividend_yield == 0
+
+
+def test_weighted_average_ignores_unknown_rows():
+    assert compute.weighted_average([1.0, 3.0, np.nan, 100.0], [1.0, 3.0, 5.0, np.nan]) == pytest.approx(2.5)
+    assert np.isnan(compute.weighted_average([1.0], [np.nan]))
+
+
+@pytest.mark.parametrize("period", ["1y", "5y", "max"])
+def test_period_change_is_in_the_base_currency_for_every_period(holdings_frame, analytics, provider, period):
+    change = compute.period_change(holdings_frame, analytics, period, provider)
+    for ticker, pair in (("F0002.T", "JPYUSD=X"), ("U0001", None)):
+        closes = provider.close([ticker], period=period)[ticker]
+        if pair:
+            closes = closes * local_close(provider, pair).reindex(closes.index)
+        assert change[ticker] == pytest.approx((closes.iloc[-1] / closes.iloc[0] - 1) * 100)
+
+
+def test_compute_price_change_columns(holdings_frame, analytics, provider):
+    result = compute.compute_price_change(holdings_frame, analytics, provider)
+    metrics = result.metrics.set_index("ticker")
+    assert result.tickers == list(POSITIONS)
+    assert metrics["1W %"].to_dict() == pytest.approx(analytics.change("7d").to_dict())
+    assert (metrics["Max Drawdown (90d)"] <= 0).all()
+    high = provider.ticker_info("F0000.DE")["fiftyTwoWeekHigh"] * metrics.loc["F0000.DE", "fx_rate"]
+    assert metrics.loc["F0000.DE", "52W High"] == pytest.approx(high)
+    assert len(result.history) == 90  # trading bars
+
+
+def test_compute_overview(holdings_frame, analytics, provider):
+    result = compute.compute_overview(holdings_frame, analytics, provider)
+    assert result.total_value == pytest.approx(holdings_frame["value"].sum())
+    assert result.regions.sum() == pytest.approx(100)
+    assert result.sectors["value"].sum() == pytest.approx(result.total_value)
+    assert result.top_holding == holdings_frame.loc[holdings_frame["value"].idxmax(), "ticker"]
+    assert list(result.history.columns) == ["Portfolio Value", "S&P 500 (SPY)"]
+    assert len(result.history) == compute.HISTORY_DAYS
+    assert result.history["Portfolio Value"].iloc[-1] == pytest.approx(result.total_value, rel=1e-6)
+
+
+def test_reprice_converts_at_the_stored_rate():
+    holdings = pd.DataFrame({"ticker": ["A", "B"], "quantity": [2.0, 3.0], "price": [5.0, 7.0],
+                             "fx_rate": [0.5, 1.0]})
+    quotes = pd.DataFrame({"price": [12.0, 100.0], "previous_close": [10.0, 90.0]}, index=["A", BENCHMARK])
+    value, change, benchmark = compute.reprice(holdings, quotes)
+    assert value.tolist() == [12.0, 21.0]
+    assert change.iloc[0] == pytest.approx(20.0) and np.isnan(change.iloc[1])
+    assert benchmark == 100.0
+
+
+def test_calculate_returns():
+    dates = pd.date_range(end="2026-06-30", periods=400)
+    prices = pd.DataFrame({"A": np.linspace(100, 200, 400)}, index=dates)
+    prices.iloc[200, 0] = 50.0
+    returns = compute.calculate_returns(prices)
+    month_ago = prices.loc[dates[-1] - pd.Timedelta(days=30), "A"]
+    assert returns.loc["A", "1M"] == pytest.approx(round((200 / month_ago - 1) * 100, 2))
+    assert returns.loc["A", "5Y"] == pytest.approx(100.0)
+    assert returns.loc["A", "Max Drawdown %"] == pytest.approx(round((50 / prices["A"].iloc[199] - 1) * 100, 2))
+    assert compute.calculate_returns(pd.DataFrame()).empty
+
+
+def test_compute_value_over_time_converts_holdings_not_benchmarks(provider):
+    result = compute.compute_value_over_time(["U0000", "F0000.DE"], [BENCHMARK], pd.Timestamp("2000-01-01"), provider)
+    eur = local_close(provider, "EURUSD=X")
+    expected = local_close(provider, "F0000.DE") * eur.reindex(local_close(provider, "F0000.DE").index)
+    pd.testing.assert_series_equal(result.prices["F0000.DE"], expected, check_names=False)
+    pd.testing.assert_series_equal(result.benchmarks[BENCHMARK], local_close(provider, BENCHMARK), check_names=False)
+    assert list(result.returns.index) == ["U0000", "F0000.DE"]
+    assert not result.empty
+
+
+def test_compute_value_over_time_without_data(empty_provider):
+    assert compute.compute_value_over_time(["NOPE"], [], None, empty_provider).empty
+
+
+def test_compute_classification(holdings_frame, analytics, provider):
+    result = compute.compute_classification(holdings_frame, analytics, provider)
+    assert sorted(result.features["ticker"]) == sorted(POSITIONS)
+    assert set(result.features["Predicted Risk"]) <= set(RISK_LEVELS)
+    assert result.portfolio_risk in RISK_LEVELS
+    assert (result.safest["Predicted Risk"] == "Low").all()
+    assert set(result.key_metrics) == {"Avg Beta", "Avg Dividend Yield"}
+
+
+def test_compute_summary_streams_new_bars_to_the_full_result(empty_provider):
+    rng = np.random.default_rng(5)
+    bars = daily_bars(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 260))))
+    empty_provider.save("AAA", info={"currency": "USD"}, history=bars.iloc[:-1])
+    previous = compute.compute_summary("AAA", empty_provider)
+
+    empty_provider.save("AAA", history=bars)
+    empty_provider.invalidate()
+    streamed = compute.compute_summary("AAA", empty_provider, previous)
+    empty_provider.invalidate()
+    full = compute.compute_summary("AAA", empty_provider)
+
+    assert streamed.history.index.equals(full.history.index)
+    pd.testing.assert_frame_equal(streamed.history, full.history[streamed.history.columns], rtol=1e-6,
+                                  check_dtype=False, check_freq=False)
+    assert streamed.price == pytest.approx(bars["Close"].iloc[-1])
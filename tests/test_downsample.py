@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from stock_dashboard.downsample import downsample, line_trace, lttb_indices, minmax_indices, use_webgl
+
+
+def noisy_series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(np.cumsum(rng.normal(0, 1, n)), index=pd.date_range("2000-01-01", periods=n))
+
+
+def test_short_series_are_returned_unchanged():
+    series = noisy_series(100)
+    pd.testing.assert_series_equal(downsample(series, 500), series)
+
+
+def test_nans_are_dropped_before_sampling():
+    series = noisy_series(10)
+    series.iloc[3] = np.nan
+    assert downsample(series, 500).index.equals(series.dropna().index)
+
+
+def test_lttb_keeps_end_points_and_order():
+    series = noisy_series(10_000)
+    sampled = downsample(series, 300)
+    assert len(sampled) == 300
+    assert sampled.index[0] == series.index[0] and sampled.index[-1] == series.index[-1]
+    assert sampled.index.is_monotonic_increasing
+    assert sampled.index.isin(series.index).all()
+    pd.testing.assert_series_equal(sampled, series.loc[sampled.index])
+
+
+def test_lttb_picks_an_isolated_spike():
+    y = np.zeros(1_000)
+    y[537] = 50.0
+    assert 537 in lttb_indices(np.arange(1_000), y, 50)
+
+
+def test_minmax_keeps_every_extreme():
+    series = noisy_series(10_000, seed=1)
+    sampled = downsample(series, 400, method="minmax")
+    assert len(sampled) <= 400
+    assert sampled.max() == series.max() and sampled.min() == series.min()
+    assert sampled.index[0] == series.index[0] and sampled.index[-1] == series.index[-1]
+
+
+def test_minmax_indices_are_unique_and_sorted():
+    picks = minmax_indices(noisy_series(5_000).to_numpy(), 100)
+    assert (np.diff(picks) > 0).all()
+
+
+def test_line_trace_switches_to_webgl_and_downsamples():
+    series = noisy_series(5_000)
+    trace = line_trace(series, webgl=True, max_points=200, name="AAA")
+    assert isinstance(trace, go.Scattergl)
+    assert len(trace.x) == 200 and trace.name == "AAA"
+    assert isinstance(line_trace(series, max_points=None), go.Scatter)
+    assert len(line_trace(series, max_points=None).x) == 5_000
+
+
+def test_use_webgl_counts_points_after_downsampling():
+    frame = pd.DataFrame(np.ones((5_000, 10)))
+    assert not use_webgl(frame, max_points=1_000, threshold=10_000)
+    assert use_webgl(frame, frame, max_points=1_000, threshold=10_000)
@@ -0,0 +1,39 @@
+import threading
+import time
+
+from stock_dashboard.fetch_executor import FetchExecutor
+
+
+def test_hung_requests_time_out_without_starving_later_fetches():
+    executor = FetchExecutor(max_workers=2, rate=1_000, burst=1_000, timeout=0.2)
+    release = threading.Event()
+    try:
+        assert executor.map(lambda item: release.wait(), range(4), default="timed out") == dict.fromkeys(
+            range(4), "timed out")
+        start = time.monotonic()
+        assert executor.map(lambda item: item * 2, range(6)) == {i: i * 2 for i in range(6)}
+        assert time.monotonic() - start < executor.timeout
+    finally:
+        release.set()
+
+
+def test_concurrency_stays_within_max_workers():
+    executor = FetchExecutor(max_workers=3, rate=1_000, burst=1_000)
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def fetch(item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return item
+
+    assert list(executor.map(fetch, range(12)).values()) == list(range(12))
+    assert peak[0] == 3
+
+
+def test_failures_record_the_default():
+    executor = FetchExecutor(max_workers=2, rate=1_000, burst=1_000)
+    assert executor.map(lambda item: 1 / item, [0, 1], default=None) == {0: None, 1: 1.0}
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from stock_dashboard.fetch_executor import FetchExecutor
+from stock_dashboard.fetch_service import FetchService
+
+
+class SlowFetch:
+    """Batch fetcher that records its batches and blocks until released."""
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+
+    def __call__(self, symbols):
+        self.batches.append(sorted(symbols))
+        self.release.wait(5)
+        return {s: f"{s}-price" for s in symbols}
+
+    def wait_for(self, n_batches):
+        deadline = time.monotonic() + 5
+        while len(self.batches) < n_batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def service():
+    return FetchService(timeout=lambda n_symbols: 5)
+
+
+def fetch_in_thread(service, symbols, fetch, results, window="1y"):
+    thread = threading.Thread(target=lambda: results.append(service.fetch("quote", symbols, window, fetch)))
+    thread.start()
+    return thread
+
+
+def test_concurrent_callers_share_the_in_flight_request(service):
+    fetch, results = SlowFetch(), []
+    first = fetch_in_thread(service, ["X", "Y"], fetch, results)
+    fetch.wait_for(1)
+    # Y is already in flight: the second caller only requests Z and joins Y
+    second = fetch_in_thread(service, ["Y", "Z"], fetch, results)
+    fetch.wait_for(2)
+    fetch.release.set()
+    first.join(5)
+    second.join(5)
+
+    assert fetch.batches == [["X", "Y"], ["Z"]]
+    assert {"X": "X-price", "Y": "Y-price"} in results
+    assert {"Y": "Y-price", "Z": "Z-price"} in results
+    assert service._inflight == {}
+
+
+def test_identical_requests_make_one_upstream_call(service):
+    fetch, results = SlowFetch(), []
+    threads = [fetch_in_thread(service, ["X"], fetch, results)]
+    fetch.wait_for(1)
+    threads += [fetch_in_thread(service, ["X"], fetch, results) for _ in range(3)]
+    time.sleep(0.1)
+    fetch.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetch.batches == [["X"]]
+    assert results == [{"X": "X-price"}] * 4
+
+
+def test_other_windows_are_not_joined(service):
+    fetch, results = SlowFetch(), []
+    fetch.release.set()
+    service.fetch("quote", ["X"], "1y", fetch)
+    service.fetch("quote", ["X"], "5y", fetch)
+    assert fetch.batches == [["X"], ["X"]]
+
+
+def test_a_stalled_fetch_times_out_and_is_retried():
+    service = FetchService(timeout=lambda n_symbols: 0.2)
+    stalled, results = SlowFetch(), []
+    try:
+        start = time.monotonic()
+        owner = fetch_in_thread(service, ["X"], stalled, results)
+        stalled.wait_for(1)
+        joiner = fetch_in_thread(service, ["X"], stalled, results)
+        owner.join(5)
+        joiner.join(5)
+        assert time.monotonic() - start < 2
+        # The owner gives up; the caller that joined it is resolved as for a failed fetch
+        assert sorted(results, key=len) == [{}, {"X": None}]
+        assert service._inflight == {}
+
+        fresh = SlowFetch()
+        fresh.release.set()
+        assert service.fetch("quote", ["X"], "1y", fresh) == {"X": "X-price"}
+    finally:
+        stalled.release.set()
+
+
+def test_default_timeout_follows_the_executor():
+    executor = FetchExecutor(max_workers=4, rate=2.0, timeout=10.0)
+    assert executor.deadline(1) == pytest.approx(10.5)
+    assert executor.deadline(9) == pytest.approx(3 * 10 + 4.5)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard.fx import FXRates, base_currency, major_unit, pair_symbol
+
+
+@pytest.fixture
+def fx(empty_provider):
+    """EUR and GBP fixings on five business days; the GBP series misses its third day."""
+    empty_provider.save("EURUSD=X", info={"currency": "USD"}, history=daily_bars([1.10, 1.20, 1.25, 1.30, 1.40]))
+    gbp = daily_bars([1.25, 1.30, 1.35, 1.40, 1.50])
+    gbp = gbp.drop(gbp.index[2])
+    empty_provider.save("GBPUSD=X", info={"currency": "USD"}, history=gbp)
+    for ticker, currency in (("SAP.DE", "EUR"), ("VOD.L", "GBp"), ("AAPL", "USD")):
+        empty_provider.save(ticker, info={"currency": currency})
+    return FXRates(empty_provider, base="USD")
+
+
+def test_units_and_symbols(monkeypatch):
+    assert major_unit("GBp") == ("GBP", 0.01)
+    assert major_unit("eur") == ("EUR", 1.0)
+    assert major_unit(None) == ("USD", 1.0)
+    assert pair_symbol("EUR") == "EURUSD=X"
+    assert base_currency() == "USD"
+    monkeypatch.setenv("PORTFOLIO_BASE_CURRENCY", "eur")
+    assert base_currency() == "EUR"
+
+
+def test_currencies_default_to_usd(fx):
+    assert fx.currencies(["SAP.DE", "VOD.L", "UNKNOWN"]) == {"SAP.DE": "EUR", "VOD.L": "GBp", "UNKNOWN": "USD"}
+
+
+def test_rates_cross_through_usd_and_carry_over_holidays(fx):
+    rates = fx.rates(["EUR", "GBp", "USD"], base="GBP", period="max")
+    assert rates["EUR"].iloc[0] == pytest.approx(1.10 / 1.25)
+    assert rates["GBp"].iloc[0] == pytest.approx(0.01)
+    assert rates["USD"].iloc[0] == pytest.approx(1 / 1.25)
+    # No GBP fixing on the third day: the second day's is carried forward
+    assert rates["EUR"].iloc[2] == pytest.approx(1.25 / 1.30)
+
+
+def test_unknown_currencies_are_nan(fx):
+    assert np.isnan(fx.spot(["XYZ"])["XYZ"])
+    assert fx.spot(["EUR", "USD"]).tolist() == pytest.approx([1.40, 1.0])
+
+
+def test_convert_applies_each_days_rate(fx):
+    prices = pd.DataFrame(
+        {"SAP.DE": [100.0, 100.0, 100.0], "VOD.L": [200.0, 200.0, 200.0], "AAPL": [5.0, 6.0, 7.0]},
+        index=daily_bars([0.0] * 5).index[1:4],
+    )
+    converted = fx.convert(prices, fx.currencies(prices.columns))
+    assert converted["SAP.DE"].tolist() == pytest.approx([120.0, 125.0, 130.0])
+    assert converted["VOD.L"].tolist() == pytest.approx([2.60, 2.60, 2.80])
+    assert converted["AAPL"].tolist() == pytest.approx([5.0, 6.0, 7.0])
+
+
+def test_convert_back_fills_before_the_first_fixing(fx):
+    before = daily_bars([0.0] * 6).index[0]
+    prices = pd.DataFrame({"SAP.DE": [10.0]}, index=[before])
+    assert fx.convert(prices, {"SAP.DE": "EUR"})["SAP.DE"].iloc[0] == pytest.approx(11.0)
+
+
+def test_convert_latest(fx):
+    amounts = pd.Series([100.0, 100.0, 100.0])
+    converted = fx.convert_latest(amounts, pd.Series(["EUR", "GBp", "USD"]), base="EUR")
+    assert converted.tolist() == pytest.approx([100.0, 1.5 / 1.4, 100 / 1.4])
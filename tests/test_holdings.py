@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_dashboard.holdings import MIN_CAPACITY, Holding, Holdings, as_holdings, normalize_ticker
+
+
+def test_normalize_ticker():
+    assert normalize_ticker("  aapl ") == "AAPL"
+    assert normalize_ticker(None) == ""
+    assert normalize_ticker(12) == ""
+
+
+def test_invalid_rows_are_dropped_and_tickers_normalized():
+    holdings = Holdings([" aapl", "", "MSFT", None, "nvda", "TSLA"], [10, 5, "3.5", 1, 0, "n/a"])
+    assert [(h.ticker, h.quantity) for h in holdings] == [("AAPL", 10.0), ("MSFT", 3.5)]
+
+
+def test_length_mismatch_raises():
+    with pytest.raises(ValueError):
+        Holdings(["AAPL", "MSFT"], [1])
+
+
+def test_symbols_are_stored_once_in_first_seen_order():
+    holdings = Holdings(["B", "A", "B", "B", "A"], [1, 2, 3, 4, 5])
+    assert holdings.symbols == ["B", "A"]
+    assert len(holdings) == 5
+    frame = holdings.to_frame()
+    assert isinstance(frame["ticker"].dtype, pd.CategoricalDtype)
+    assert frame["ticker"].cat.categories.tolist() == ["B", "A"]
+    assert frame.groupby("ticker", observed=True)["quantity"].sum().to_dict() == {"B": 8.0, "A": 7.0}
+
+
+def test_buffers_grow_and_codes_widen_with_the_symbol_table():
+    holdings = Holdings()
+    for i in range(300):
+        holdings.append(f"T{i}", i + 1)
+    assert len(holdings) == 300 > MIN_CAPACITY
+    assert holdings._codes.dtype == np.int16
+    assert holdings[-1].ticker == "T299" and holdings[-1].quantity == 300.0
+    assert holdings.to_frame(categorical=False)["ticker"].tolist() == [f"T{i}" for i in range(300)]
+
+
+def test_indexing():
+    holdings = Holdings(["A", "B"], [1, 2])
+    assert holdings[0].ticker == "A"
+    assert holdings[-1].ticker == "B"
+    with pytest.raises(IndexError):
+        holdings[2]
+
+
+def test_quantities_view_is_read_only():
+    holdings = Holdings(["A"], [1])
+    with pytest.raises(ValueError):
+        holdings.quantities[0] = 5
+
+
+def test_to_frame_shares_the_buffers():
+    holdings = Holdings(["A", "B"], [1, 2])
+    frame = holdings.to_frame()
+    assert np.shares_memory(frame["quantity"].to_numpy(), holdings._quantities)
+
+
+def test_to_frame_cannot_write_through_to_the_container():
+    holdings = Holdings(["A", "B"], [1, 2])
+    frame = holdings.to_frame()
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, "quantity"] = 99
+    assert holdings.quantities.tolist() == [1.0, 2.0]
+    # Derived frames are ordinary copies and stay editable
+    doubled = frame.assign(quantity=frame["quantity"] * 2)
+    doubled.loc[0, "quantity"] = 5
+    assert holdings.quantities.tolist() == [1.0, 2.0]
+
+
+def test_as_holdings_accepts_every_session_shape():
+    expected = [("AAPL", 2.0), ("MSFT", 1.0)]
+    records = [{"ticker": "aapl", "quantity": 2}, {"ticker": "MSFT", "quantity": 1}]
+    for portfolio in (records, pd.DataFrame(records), Holdings.from_records(records),
+                      [Holding("AAPL", 2), Holding("MSFT", 1)]):
+        assert [(h.ticker, h.quantity) for h in as_holdings(portfolio)] == expected
+    assert len(as_holdings(None)) == 0
+    assert len(as_holdings(pd.DataFrame(columns=["ticker", "quantity"]))) == 0
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import bench_indicators
+from stock_dashboard import indicators
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2024-01-01", periods=300)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(dates)))), index=dates, name="AAA")
+
+
+def reference_rsi(prices, window):
+    delta = prices.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def test_sma_matches_pandas_rolling_mean(closes):
+    pd.testing.assert_series_equal(indicators.sma(closes, 20), closes.rolling(20).mean())
+
+
+def test_bollinger_bands_are_two_rolling_stds_around_the_sma(closes):
+    middle, upper, lower = indicators.bollinger_bands(closes, 20, 2)
+    std = closes.rolling(20).std()
+    np.testing.assert_allclose(upper, middle + 2 * std, rtol=1e-10)
+    np.testing.assert_allclose(lower, middle - 2 * std, rtol=1e-10)
+
+
+def test_rsi_uses_wilder_smoothing(closes):
+    np.testing.assert_allclose(indicators.rsi(closes, 14), reference_rsi(closes, 14), rtol=1e-10)
+
+
+def test_rolling_volatility_is_annualized_std_of_returns(closes):
+    expected = closes.pct_change().rolling(30).std() * np.sqrt(indicators.TRADING_DAYS)
+    np.testing.assert_allclose(indicators.rolling_volatility(closes, 30), expected, rtol=1e-8)
+    np.testing.assert_allclose(indicators.rolling_volatility(closes, 30, annualize=False),
+                               closes.pct_change().rolling(30).std(), rtol=1e-8)
+
+
+def test_wide_frame_windows_skip_other_markets_gaps(closes):
+    other = closes.rename("BBB") * 2
+    other.iloc[::5] = np.nan  # a market closed on days the first one traded
+    frame = pd.concat([closes, other], axis=1)
+
+    sma = indicators.sma(frame, 10)
+    own_bars = other.dropna().rolling(10).mean().reindex(frame.index)
+    pd.testing.assert_series_equal(sma["BBB"], own_bars, check_names=False)
+    assert sma["BBB"].isna().equals(other.isna() | own_bars.isna())
+    pd.testing.assert_series_equal(sma["AAA"], closes.rolling(10).mean(), check_names=False)
+
+
+def test_drawdown_is_zero_at_highs_and_never_positive():
+    prices = pd.Series([100.0, 110.0, 99.0, 121.0, 60.5])
+    np.testing.assert_allclose(indicators.drawdown(prices), [0, 0, -0.1, 0, -0.5])
+
+
+def test_vectorized_technicals_match_the_legacy_loop():
+    closes = bench_indicators.synthetic_closes(3, 2)
+    legacy = bench_indicators.legacy_technicals(closes)
+    vectorized = bench_indicators.vectorized_technicals(closes)
+    for name in ("SMA_50", "SMA_200", "Volatility", "Upper Band", "Lower Band"):
+        for ticker in closes.columns:
+            np.testing.assert_allclose(vectorized[name][ticker], legacy[ticker][name], rtol=1e-8, err_msg=name)
+
+
+def test_rolling_stats_matches_pandas_for_every_window(closes):
+    stats = indicators.rolling_stats(closes, (5, 50))
+    for w in (5, 50):
+        np.testing.assert_allclose(stats[("mean", w)], closes.rolling(w).mean(), rtol=1e-10)
+        np.testing.assert_allclose(stats[("std", w)], closes.rolling(w).std(), rtol=1e-8)
+
+
+def test_technicals_match_the_single_indicators(closes):
+    out = indicators.technicals(closes)
+    _, upper, lower = indicators.bollinger_bands(closes, 20, 2)
+    np.testing.assert_allclose(out["SMA_50"], closes.rolling(50).mean(), rtol=1e-10)
+    np.testing.assert_allclose(out["SMA_200"], closes.rolling(200).mean(), rtol=1e-10)
+    np.testing.assert_allclose(out["Upper Band"], upper, rtol=1e-8)
+    np.testing.assert_allclose(out["Lower Band"], lower, rtol=1e-8)
+    np.testing.assert_allclose(out["Volatility"], indicators.rolling_volatility(closes, 30), rtol=1e-8)
+    np.testing.assert_allclose(out["RSI"], reference_rsi(closes, 14), rtol=1e-10)
+
+
+def test_rolling_indicators_stream_to_the_batch_values(closes):
+    state = indicators.RollingIndicators.from_prices(closes.iloc[:-1])
+    streamed = state.update(closes.iloc[-1])
+    batch = {name: values.iloc[-1] for name, values in indicators.technicals(closes).items()}
+    assert streamed.keys() == batch.keys()
+    for name, value in batch.items():
+        assert streamed[name] == pytest.approx(value, rel=1e-6), name
+
+
+def test_rolling_indicators_replace_last_revises_the_bar(closes):
+    state = indicators.RollingIndicators.from_prices(closes)
+    revised = state.update(closes.iloc[-1] * 1.05, replace_last=True)
+    moved = closes.copy()
+    moved.iloc[-1] *= 1.05
+    expected = indicators.RollingIndicators.from_prices(moved).values()
+    for name, value in expected.items():
+        assert revised[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_rolling_indicators_are_nan_until_windows_fill():
+    state = indicators.RollingIndicators(sma_windows=(5,), band_window=3, vol_window=3, rsi_window=3)
+    values = [state.update(p) for p in (10.0, 11.0, 12.0)][-1]
+    assert np.isnan(values["SMA_5"])
+    assert np.isnan(values["Volatility"])
+    assert np.isnan(values["RSI"])
+    assert values["Upper Band"] == pytest.approx(11 + 2 * 1.0)
@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+from stock_dashboard.info_cache import DEFAULT_TTLS, InfoCache, field_class
+
+
+class Fetcher:
+    """Batch ``.info`` fetcher recording the batches it was asked for."""
+
+    def __init__(self, infos):
+        self.infos = infos
+        self.batches = []
+
+    def __call__(self, tickers):
+        self.batches.append(list(tickers))
+        return {t: dict(self.infos[t]) for t in tickers if t in self.infos}
+
+
+@pytest.fixture
+def fetcher():
+    return Fetcher({"AAA": {"currency": "USD", "sector": "Energy"}, "BBB": {"currency": "EUR"}})
+
+
+def settle(cache):
+    """Wait for background refreshes to finish."""
+    cache._executor.shutdown(wait=True)
+
+
+def backdate(cache, seconds):
+    with sqlite3.connect(cache.path) as conn:
+        conn.execute("UPDATE info SET fetched_at = fetched_at - ?", (seconds,))
+
+
+def test_field_classes_pick_the_shortest_ttl():
+    cache = InfoCache()
+    assert field_class("currentPrice") == "quote"
+    assert field_class("sector") == "reference"
+    assert field_class("forwardEps") == "fundamentals"
+    assert cache.ttl_for(["sector"]) == DEFAULT_TTLS["reference"]
+    assert cache.ttl_for(["sector", "currentPrice"]) == DEFAULT_TTLS["quote"]
+    assert cache.ttl_for(None) == DEFAULT_TTLS["fundamentals"]
+
+
+def test_missing_tickers_are_fetched_once_then_served_from_disk(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    assert cache.get(["AAA", "BBB"]) == {"AAA": fetcher.infos["AAA"], "BBB": fetcher.infos["BBB"]}
+    assert cache.get(["BBB", "AAA"], fields=["sector"])["AAA"]["sector"] == "Energy"
+    assert fetcher.batches == [["AAA", "BBB"]]
+
+
+def test_entries_are_shared_between_instances(fetcher):
+    InfoCache(fetch=fetcher).get(["AAA"])
+    other = Fetcher({})
+    assert InfoCache(fetch=other).get(["AAA"])["AAA"]["currency"] == "USD"
+    assert other.batches == []
+
+
+def test_stale_entries_are_returned_at_once_and_refreshed_in_background(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    cache.get(["AAA"])
+    backdate(cache, DEFAULT_TTLS["quote"] + 1)
+    fetcher.infos["AAA"] = {"currency": "USD", "currentPrice": 12.5}
+
+    stale = cache.get(["AAA"], fields=["currentPrice"])
+    settle(cache)
+    assert "currentPrice" not in stale["AAA"]
+    assert fetcher.batches == [["AAA"], ["AAA"]]
+    assert InfoCache(fetch=Fetcher({})).get(["AAA"])["AAA"]["currentPrice"] == 12.5
+
+
+def test_fresh_enough_for_the_fields_asked_is_not_refetched(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    cache.get(["AAA"])
+    backdate(cache, DEFAULT_TTLS["quote"] + 1)
+    cache.get(["AAA"], fields=["sector"])
+    settle(cache)
+    assert fetcher.batches == [["AAA"]]
+
+
+def test_failed_refresh_keeps_the_last_good_payload(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    cache.get(["AAA"])
+    backdate(cache, DEFAULT_TTLS["fundamentals"] + 1)
+    cache.get(["AAA"], fetch=Fetcher({}))
+    settle(cache)
+    assert InfoCache(fetch=Fetcher({})).get(["AAA"])["AAA"] == fetcher.infos["AAA"]
+
+
+def test_unknown_symbols_are_retried_after_the_quote_ttl(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    assert cache.get(["ZZZ"]) == {"ZZZ": {}}
+    cache.get(["ZZZ"])
+    settle(cache)
+    assert fetcher.batches == [["ZZZ"]]
+
+    cache = InfoCache(fetch=fetcher)
+    backdate(cache, DEFAULT_TTLS["quote"] + 1)
+    cache.get(["ZZZ"])
+    settle(cache)
+    assert fetcher.batches == [["ZZZ"], ["ZZZ"]]
+
+
+def test_invalidate_forgets_entries(fetcher):
+    cache = InfoCache(fetch=fetcher)
+    cache.get(["AAA", "BBB"])
+    cache.invalidate(["AAA"])
+    cache.get(["AAA", "BBB"])
+    assert fetcher.batches == [["AAA", "BBB"], ["AAA"]]
+    cache.invalidate()
+    cache.get(["BBB"])
+    assert fetcher.batches[-1] == ["BBB"]
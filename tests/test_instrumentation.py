@@ -0,0 +1,91 @@
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard import instrumentation
+from stock_dashboard.instrumentation import Histogram, Metrics, metrics, timed, upstream
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram((0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 1.0, 3.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [2, 2, 1]
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 4), (float("inf"), 5)]
+    assert histogram.count == 5 and histogram.sum == pytest.approx(4.65)
+    assert histogram.quantile(0.4) == 0.1
+    assert histogram.quantile(0.8) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert np.isnan(Histogram().quantile(0.5))
+
+
+def test_upstream_wrapper_counts_calls_and_symbols_even_on_failure():
+    fetch = upstream("quote", lambda batch: {s: 1.0 for s in batch})
+    fetch(["AAA", "BBB"])
+    fetch(["AAA"])
+    failing = upstream("info", lambda batch: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        failing(["CCC"])
+
+    assert metrics.upstream_calls == {"quote": 2, "info": 1}
+    assert metrics.upstream_symbols == {("quote", "AAA"): 2, ("quote", "BBB"): 1, ("info", "CCC"): 1}
+    assert metrics.latency[("upstream", "quote")].count == 2
+
+
+def test_provider_fetches_are_counted_once_per_batch(empty_provider):
+    for ticker in ("AAA", "BBB"):
+        empty_provider.save(ticker, history=daily_bars(np.linspace(10, 11, 30)))
+
+    empty_provider.history(["AAA", "BBB", "NOPE"], period="1mo")
+    empty_provider.history(["AAA", "BBB"], period="5d")  # sliced from memory
+
+    assert metrics.upstream_calls == {"history": 1}
+    assert {s: n for (e, s), n in metrics.upstream_symbols.items()} == {"AAA": 1, "BBB": 1, "NOPE": 1}
+    assert metrics.hit_ratios()["memo:history"] == pytest.approx(2 / 5)
+
+
+def test_timed_records_raising_blocks(monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "SLOW_SECONDS", 0.0)
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        with pytest.raises(KeyError):
+            with timed("render", "Overview"):
+                raise KeyError("boom")
+    assert metrics.latency[("render", "Overview")].count == 1
+    assert "slow render Overview" in caplog.text
+
+
+def test_prometheus_and_json_render_the_same_counts():
+    recorded = Metrics()
+    recorded.observe("render", 'Price "Change"', 0.02)
+    recorded.observe("render", 'Price "Change"', 40.0)
+    recorded.record_upstream("history", ["AAA", "BBB"], 0.3)
+    recorded.record_cache("info_cache", hits=3, misses=1)
+
+    text = recorded.to_prometheus()
+    labels = 'kind="render",name="Price \\"Change\\""'
+    assert f'portfolio_latency_seconds_bucket{{{labels},le="0.01"}} 0' in text
+    assert f'portfolio_latency_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'portfolio_latency_seconds_bucket{{{labels},le="30.0"}} 1' in text
+    assert f'portfolio_latency_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"portfolio_latency_seconds_count{{{labels}}} 2" in text
+    assert 'portfolio_upstream_calls_total{endpoint="history"} 1' in text
+    assert 'portfolio_upstream_symbols_total{endpoint="history",symbol="BBB"} 1' in text
+    assert 'portfolio_cache_requests_total{cache="info_cache",result="hit"} 3' in text
+    assert text.endswith("\n")
+
+    snapshot = json.loads(recorded.to_json())
+    render = next(row for row in snapshot["latency"] if row["kind"] == "render")
+    assert render["count"] == 2 and render["p50"] == 0.025 and render["buckets"]["inf"] == 2
+    assert snapshot["upstream_calls"] == {"history": 1}
+    assert {row["symbol"] for row in snapshot["upstream_symbols"]} == {"AAA", "BBB"}
+    assert snapshot["cache"]["info_cache"] == {"hits": 3, "misses": 1, "hit_ratio": 0.75}
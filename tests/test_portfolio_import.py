@@ -0,0 +1,107 @@
+import io
+
+import pandas as pd
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard.portfolio_import import import_holdings, normalize_chunk, read_chunks
+
+BROKER_CSV = """Symbol;Qty
+aapl;10
+M&M.NS;"1,500"
+bad ticker!;3
+MSFT;
+brk-b;2
+NVDA;-4
+"""
+
+
+def positions(holdings):
+    return [(h.ticker, h.quantity) for h in holdings]
+
+
+def test_broker_csv_is_parsed_and_rejects_report_file_lines(tmp_path):
+    path = tmp_path / "broker.csv"
+    path.write_text(BROKER_CSV)
+    holdings, report = import_holdings(path, resolve=False)
+    assert positions(holdings) == [("AAPL", 10.0), ("M&M.NS", 1500.0), ("BRK-B", 2.0)]
+    assert report["rows"] == 6 and report["imported"] == 3 and report["rejected_count"] == 3
+    rejected = report["rejected"]
+    assert rejected["row"].tolist() == [4, 5, 7]
+    assert rejected["reason"].tolist() == ["invalid ticker", "invalid quantity", "invalid quantity"]
+    assert path.read_text().splitlines()[3].startswith("bad ticker!")
+
+
+def test_line_numbers_hold_across_chunks(tmp_path):
+    lines = ["ticker,shares"] + [f"T{i},1" for i in range(10)]
+    lines[8] = "T7,zero"
+    path = tmp_path / "holdings.txt"
+    path.write_text("\n".join(lines))
+    holdings, report = import_holdings(path, resolve=False, chunksize=3)
+    assert len(holdings) == 9
+    assert report["rejected"]["row"].tolist() == [9]
+
+
+def test_parquet_reports_record_numbers(tmp_path):
+    path = tmp_path / "holdings.parquet"
+    pd.DataFrame({"Ticker": ["AAA", "", "CCC"], "Units": [1.0, 2.0, 3.0], "Notes": ["x", "y", "z"]}).to_parquet(path)
+    holdings, report = import_holdings(path, resolve=False)
+    assert positions(holdings) == [("AAA", 1.0), ("CCC", 3.0)]
+    assert report["rejected"]["row"].tolist() == [2]
+
+
+def test_uploads_are_typed_by_name():
+    upload = io.BytesIO(b"ticker,quantity\nAAA,1\n")
+    holdings, _ = import_holdings(upload, name="upload.CSV", resolve=False)
+    assert positions(holdings) == [("AAA", 1.0)]
+
+
+@pytest.mark.parametrize("name", ["holdings.xls", "holdings.json", "holdings"])
+def test_unsupported_types_are_rejected(name):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        list(read_chunks(io.BytesIO(b""), name=name))
+
+
+@pytest.mark.parametrize("raw, quantity", [
+    ("1,500", 1500.0),
+    ("12,345,678.5", 12345678.5),
+    (" 2 500 ", 2500.0),
+    ("1,5", 1.5),
+    ("0,25", 0.25),
+    ("1234,5", 1234.5),
+    ("1,50", 1.5),
+])
+def test_commas_are_thousands_separators_or_a_decimal_comma(raw, quantity):
+    valid, rejected = normalize_chunk(pd.DataFrame({"ticker": ["AAA"], "quantity": [raw]}))
+    assert valid["quantity"].tolist() == [quantity] and rejected.empty
+
+
+@pytest.mark.parametrize("raw", ["1,5,0", "1,50,000", "1,500,5", "1.500,5", ","])
+def test_ambiguous_commas_are_rejected(raw):
+    valid, rejected = normalize_chunk(pd.DataFrame({"ticker": ["AAA"], "quantity": [raw]}))
+    assert valid.empty
+    assert rejected["reason"].tolist() == ["invalid quantity"]
+
+
+def test_missing_columns_are_reported():
+    with pytest.raises(ValueError, match="ticker and quantity"):
+        normalize_chunk(pd.DataFrame({"name": ["Apple"], "quantity": [1]}))
+
+
+def test_unpriced_symbols_are_dropped_when_resolving(tmp_path, empty_provider):
+    empty_provider.save("AAA", history=daily_bars([10.0, 11.0]))
+    path = tmp_path / "holdings.csv"
+    path.write_text("ticker,quantity\nAAA,1\nNOPE,2\nAAA,3\n")
+    holdings, report = import_holdings(path)
+    assert positions(holdings) == [("AAA", 1.0), ("AAA", 3.0)]
+    assert report["unresolved"] == ["NOPE"] and report["imported"] == 2
+
+
+def test_excel_rows_report_sheet_lines(tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "holdings.xlsx"
+    pd.DataFrame({"Symbol": ["AAA", "??", "CCC"], "Position": [1, 2, 3]}).to_excel(path, index=False,
+                                                                                  engine="xlsxwriter")
+    holdings, report = import_holdings(path, resolve=False, chunksize=2)
+    assert positions(holdings) == [("AAA", 1.0), ("CCC", 3.0)]
+    assert report["rejected"]["row"].tolist() == [3]
@@ -0,0 +1,131 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard.market_data import slice_period
+from stock_dashboard.price_store import ADJUSTMENT_TOLERANCE, PriceStore
+
+
+class Upstream:
+    """Fake ``_fetch_history`` serving ``bars`` and recording every ``(tickers, period, start)`` asked for."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def __call__(self, tickers, period, start):
+        self.calls.append((sorted(tickers), period, start))
+        return {t: slice_period(self.bars[t], period, start) for t in tickers if t in self.bars}
+
+
+@pytest.fixture
+def upstream():
+    end = pd.Timestamp.today().normalize() - pd.offsets.BDay(1)
+    return Upstream({
+        "AAA": daily_bars(np.linspace(10, 20, 60), end=end),
+        "BBB": daily_bars(np.linspace(50, 40, 60), end=end),
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(tmp_path / "prices")
+
+
+def sidecar(store, ticker):
+    return json.loads((store.root / f"{ticker}.json").read_text())["since"]
+
+
+def add_bar(upstream, ticker, close):
+    bars = upstream.bars[ticker]
+    upstream.bars[ticker] = pd.concat([bars, daily_bars([close], end=bars.index[-1] + pd.offsets.BDay(1))])
+
+
+def test_cold_refresh_fetches_from_start_and_stores_it(store, upstream):
+    start = upstream.bars["AAA"].index[10]
+    result = store.refresh(["AAA", "BBB"], start, upstream)
+
+    assert upstream.calls == [(["AAA", "BBB"], None, str(start.date()))]
+    stored = pd.read_parquet(store.root / "AAA.parquet")
+    pd.testing.assert_frame_equal(stored, upstream.bars["AAA"].loc[start:], check_freq=False)
+    pd.testing.assert_frame_equal(result["BBB"], upstream.bars["BBB"].loc[start:], check_freq=False)
+    assert sidecar(store, "AAA") == str(start.date())
+
+
+def test_warm_refresh_fetches_only_the_tail(store, upstream):
+    start = upstream.bars["AAA"].index[0]
+    store.refresh(["AAA", "BBB"], start, upstream)
+    resume = upstream.bars["AAA"].index[-2]
+    add_bar(upstream, "AAA", 21.0)
+    add_bar(upstream, "BBB", 39.0)
+
+    result = store.refresh(["AAA", "BBB"], start, upstream)
+
+    # One delta batch for both symbols, from the second-to-last stored bar
+    assert upstream.calls[1:] == [(["AAA", "BBB"], None, str(resume.date()))]
+    stored = pd.read_parquet(store.root / "AAA.parquet")
+    assert len(stored) == 61 and stored["Close"].iloc[-1] == 21.0
+    assert result["BBB"]["Close"].iloc[-1] == 39.0
+    assert sidecar(store, "AAA") == str(start.date())
+
+
+def test_adjusted_overlap_triggers_a_full_refetch(store, upstream):
+    start = upstream.bars["AAA"].index[0]
+    store.refresh(["AAA", "BBB"], start, upstream)
+    resume = upstream.bars["AAA"].index[-2]
+    upstream.bars["AAA"] = upstream.bars["AAA"] / 2  # a 2:1 split restates the whole history
+    add_bar(upstream, "AAA", 10.5)
+    add_bar(upstream, "BBB", 39.0)
+
+    store.refresh(["AAA", "BBB"], start, upstream)
+
+    assert upstream.calls[1:] == [(["AAA", "BBB"], None, str(resume.date())), (["AAA"], None, str(start.date()))]
+    stored = pd.read_parquet(store.root / "AAA.parquet")
+    pd.testing.assert_frame_equal(stored, upstream.bars["AAA"], check_freq=False)
+
+
+def test_moves_within_the_tolerance_are_appended(store, upstream):
+    start = upstream.bars["AAA"].index[0]
+    store.refresh(["AAA"], start, upstream)
+    resume = upstream.bars["AAA"].index[-2]
+    upstream.bars["AAA"].loc[resume, "Close"] *= 1 + ADJUSTMENT_TOLERANCE / 2
+    add_bar(upstream, "AAA", 21.0)
+
+    store.refresh(["AAA"], start, upstream)
+
+    assert len(upstream.calls) == 2
+    stored = pd.read_parquet(store.root / "AAA.parquet")
+    assert stored.loc[resume, "Close"] == upstream.bars["AAA"].loc[resume, "Close"]
+
+
+def test_wider_window_refetches_and_widens_the_sidecar(store, upstream):
+    narrow, wide = upstream.bars["AAA"].index[40], upstream.bars["AAA"].index[5]
+    store.refresh(["AAA"], narrow, upstream)
+
+    result = store.refresh(["AAA"], wide, upstream)
+
+    assert upstream.calls[1:] == [(["AAA"], None, str(wide.date()))]
+    assert sidecar(store, "AAA") == str(wide.date())
+    assert result["AAA"].index[0] == wide
+
+    # A narrower window afterwards is only a delta, sliced from the stored series
+    result = store.refresh(["AAA"], narrow, upstream)
+    assert upstream.calls[2][2] == str(upstream.bars["AAA"].index[-2].date())
+    assert result["AAA"].index[0] == narrow
+
+
+def test_full_history_covers_every_later_window(store, upstream):
+    store.refresh(["AAA"], None, upstream)
+    assert upstream.calls == [(["AAA"], "max", None)]
+    assert sidecar(store, "AAA") is None
+
+    store.refresh(["AAA"], upstream.bars["AAA"].index[0], upstream)
+    assert upstream.calls[1][1:] == (None, str(upstream.bars["AAA"].index[-2].date()))
+
+
+def test_symbols_upstream_does_not_know_are_left_out(store, upstream):
+    assert set(store.refresh(["AAA", "NOPE"], None, upstream)) == {"AAA"}
+    assert not (store.root / "NOPE.parquet").exists()
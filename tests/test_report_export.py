@@ -0,0 +1,118 @@
+import re
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from conftest import daily_bars
+from stock_dashboard import report_export
+from stock_dashboard.compute import price_holdings
+from stock_dashboard.holdings import Holdings
+from stock_dashboard.market_data import ACTION_FIELDS
+
+
+def png(color):
+    buffer = BytesIO()
+    Image.new("RGB", (40, 20), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(report_export, "_cache", type(report_export._cache)())
+
+
+@pytest.fixture
+def images(monkeypatch):
+    """Stand-in for the kaleido renders, which need a headless Chrome."""
+    rendered = {"allocation": png("red"), "normalized_prices": png("blue")}
+    monkeypatch.setattr(report_export, "render_images", lambda figures: dict(rendered))
+    return rendered
+
+
+@pytest.fixture
+def ticker_df(provider):
+    return price_holdings(Holdings(["U0000", "U0001", "F0000.DE"], [10, 5, 20]), provider)
+
+
+def test_second_export_is_a_cache_hit(ticker_df, provider, images, monkeypatch):
+    calls = []
+    collect = report_export.collect_fundamentals
+    monkeypatch.setattr(report_export, "collect_fundamentals", lambda *args: calls.append(args) or collect(*args))
+
+    key = report_export.export_key(ticker_df, provider, False, None)
+    assert report_export.cached_export(key) is None
+    first = report_export.build_export(ticker_df, provider)
+    assert report_export.cached_export(key) is first
+
+    second = report_export.build_export(ticker_df, provider)
+    assert second is first
+    assert len(calls) == 1
+
+    with zipfile.ZipFile(BytesIO(first)) as zf:
+        names = set(zf.namelist())
+        assert zf.read(report_export.PDF_NAME).startswith(b"%PDF")
+    assert {report_export.XLSX_NAME, report_export.PDF_NAME, "charts/allocation.png"} <= names
+
+
+def test_export_options_are_part_of_the_key(ticker_df, provider, images):
+    assert report_export.export_key(ticker_df, provider, False, None) != \
+        report_export.export_key(ticker_df, provider, True, None)
+    plain = report_export.build_export(ticker_df, provider)
+    with_sidecar = report_export.build_export(ticker_df, provider, sidecar="csv")
+    assert with_sidecar is not plain
+    with zipfile.ZipFile(BytesIO(with_sidecar)) as zf:
+        assert "technicals.csv" in zf.namelist()
+
+
+def test_pdf_embeds_charts_from_memory(monkeypatch):
+    monkeypatch.setattr("tempfile.TemporaryDirectory", None)
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", None)
+    fundamentals = report_export.collect_fundamentals([])
+    without = report_export.generate_pdf(fundamentals)
+    with_charts = report_export.generate_pdf(fundamentals, {"a": png("red"), "b": png("green")})
+    assert with_charts.startswith(b"%PDF") and len(with_charts) > len(without)
+    assert with_charts.count(b"/Subtype /Image") == 2
+
+
+def test_technicals_keep_the_corporate_actions(empty_provider):
+    bars = daily_bars(np.linspace(10, 20, 40)).assign(**{"Dividends": 0.0, "Stock Splits": 0.0})
+    bars.iloc[-5, bars.columns.get_loc("Dividends")] = 0.25
+    bars.iloc[-3, bars.columns.get_loc("Stock Splits")] = 2.0
+    empty_provider.save("AAA", history=bars)
+    empty_provider.save("BBB", history=daily_bars(np.linspace(5, 6, 40)))
+
+    technicals = dict(report_export.iter_technicals(["AAA", "BBB"], empty_provider))
+
+    assert list(technicals["AAA"].columns) == report_export.TECHNICALS_COLUMNS
+    assert technicals["AAA"]["Dividends"].tolist() == bars["Dividends"].tolist()
+    assert technicals["AAA"]["Stock Splits"].tolist() == bars["Stock Splits"].tolist()
+    # Nothing recorded for BBB: the columns are there, left blank
+    assert list(technicals["BBB"].columns) == report_export.TECHNICALS_COLUMNS
+    assert technicals["BBB"][ACTION_FIELDS].isna().all().all()
+
+
+def sheet_rows(workbook_bytes):
+    """Data rows (header excluded) per worksheet name, read from the xlsx XML."""
+    with zipfile.ZipFile(BytesIO(workbook_bytes)) as zf:
+        names = re.findall(r'<sheet name="([^"]+)"', zf.read("xl/workbook.xml").decode())
+        return {name: zf.read(f"xl/worksheets/sheet{i}.xml").decode().count("<row ") - 1
+                for i, name in enumerate(names, start=1)}
+
+
+def test_sheet_writer_continues_on_a_new_sheet_at_the_row_limit(monkeypatch):
+    import xlsxwriter
+
+    monkeypatch.setattr(report_export, "EXCEL_MAX_ROWS", 4)  # a header and three rows per sheet
+    buffer = BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True})
+    writer = report_export._SheetWriter(workbook, "Technicals", ["n"], None, set())
+    writer.write(pd.DataFrame({"n": range(5)}))
+    writer.write(pd.DataFrame({"n": range(5, 7)}))
+    workbook.close()
+
+    assert writer.sheets == 3
+    assert sheet_rows(buffer.getvalue()) == {"Technicals": 3, "Technicals (2)": 3, "Technicals (3)": 1}
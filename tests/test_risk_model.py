@@ -0,0 +1,101 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import daily_bars
+from stock_dashboard import risk_model
+from stock_dashboard.risk_model import FEATURES, RISK_LEVELS, RiskModel
+
+
+@pytest.fixture(autouse=True)
+def no_loaded_model(monkeypatch):
+    monkeypatch.setattr(risk_model, "_model", None)
+
+
+def synthetic_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "ticker": [f"T{i:04d}" for i in range(n)],
+        "Volatility": rng.uniform(0.05, 0.8, n),
+        "Beta": rng.uniform(0.2, 2.0, n),
+        "P/E Ratio": rng.uniform(5, 60, n),
+        "Dividend Yield": rng.uniform(0, 5, n),
+        "Price Std Dev": rng.uniform(1, 50, n),
+    })
+
+
+def test_snapshots_of_one_day_merge_latest_row_wins(tmp_path):
+    first = synthetic_features(3)
+    later = first.iloc[[1]].assign(Beta=9.0)
+    risk_model.save_snapshot(first, as_of="2026-01-02", root=tmp_path)
+    path = risk_model.save_snapshot(later, as_of="2026-01-02 15:30", root=tmp_path)
+    risk_model.save_snapshot(synthetic_features(2, seed=1), as_of="2026-01-05", root=tmp_path)
+
+    assert path.name == "2026-01-02.parquet"
+    snapshots = risk_model.load_snapshots(tmp_path)
+    assert len(snapshots) == 5
+    day = snapshots[snapshots["as_of"] == pd.Timestamp("2026-01-02")].set_index("ticker")
+    assert len(day) == 3 and day.loc["T0001", "Beta"] == 9.0
+
+
+def test_training_writes_the_next_version(tmp_path):
+    snapshots = synthetic_features(60)
+    first = risk_model.train(snapshots, root=tmp_path, n_estimators=5)
+    second = risk_model.train(snapshots, root=tmp_path, n_estimators=5)
+
+    assert (first.name, second.name) == ("risk_model-v0001.joblib", "risk_model-v0002.joblib")
+    assert risk_model.artifact_versions(tmp_path) == [1, 2]
+    artifact = joblib.load(second)
+    assert artifact["version"] == 2 and artifact["features"] == FEATURES and artifact["samples"] == 60
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_training_without_snapshots_fails(tmp_path):
+    with pytest.raises(ValueError, match="snapshot"):
+        risk_model.train(risk_model.load_snapshots(tmp_path / "none"), root=tmp_path)
+    assert risk_model.main(["train"]) == 1
+
+
+def test_load_skips_artifacts_for_another_feature_layout(tmp_path):
+    risk_model.train(synthetic_features(60), root=tmp_path, n_estimators=5)
+    joblib.dump({"model": None, "version": 2, "features": FEATURES[:-1]}, tmp_path / "risk_model-v0002.joblib")
+    (tmp_path / "risk_model-v0003.joblib").write_bytes(b"not a pickle")
+
+    model = RiskModel.load(tmp_path)
+    assert model.version == 1 and model.path.name == "risk_model-v0001.joblib"
+
+
+def test_load_without_a_compatible_artifact_is_none(tmp_path):
+    assert RiskModel.load(tmp_path) is None
+    joblib.dump({"model": None, "version": 1, "features": ["Volatility"]}, tmp_path / "risk_model-v0001.joblib")
+    assert RiskModel.load(tmp_path) is None
+
+
+def test_predictions_fall_back_to_the_rules_until_a_model_exists(data_home):
+    features = synthetic_features(200)
+    assert risk_model.get_model() is None
+    pd.testing.assert_series_equal(risk_model.predict_risk(features), risk_model.label_risk(features))
+
+    risk_model.train(features, n_estimators=20)  # the default models/ dir under the data home
+    model = risk_model.get_model()
+    assert model is not None and model.path.parent == data_home / risk_model.MODEL_DIR
+    predicted = risk_model.predict_risk(features)
+    assert set(predicted) <= set(RISK_LEVELS)
+    assert (predicted == risk_model.label_risk(features)).mean() > 0.9
+
+
+def test_predicting_no_rows_is_empty(tmp_path):
+    model = RiskModel.load(risk_model.train(synthetic_features(60), root=tmp_path, n_estimators=5).parent)
+    assert model.predict(synthetic_features(0)).empty
+
+
+def test_holdings_without_a_reported_beta_are_skipped(empty_provider):
+    for ticker, info in {"AAA": {"beta": 1.1, "trailingPE": 20, "dividendYield": 0.02},
+                         "BBB": {"trailingPE": 15, "dividendYield": 0.01}}.items():
+        empty_provider.save(ticker, info=info, history=daily_bars(np.linspace(10, 12, 200)))
+    empty_provider.save("SPY", history=daily_bars(np.linspace(400, 420, 200)))
+
+    features = risk_model.extract_features(["AAA", "BBB"], empty_provider)
+    assert features["ticker"].tolist() == ["AAA"]
+    assert features.loc[0, "Beta"] == 1.1 and features.loc[0, "Dividend Yield"] == pytest.approx(2.0)
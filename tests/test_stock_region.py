@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from stock_dashboard.Get_stock_region import (AMERICAS, ASIA, EUROPE, OTHER, exchange_codes, get_stock_regions,
+                                              region_from_exchange, region_from_suffix, region_weights)
+
+
+@pytest.mark.parametrize("ticker, region", [
+    ("AAPL", AMERICAS),
+    ("brk-b ", AMERICAS),
+    ("BF-A", AMERICAS),
+    ("SHOP.TO", AMERICAS),
+    ("NESN.SW", EUROPE),
+    ("ULVR.L", EUROPE),
+    ("7203.T", ASIA),
+    ("0700.HK", ASIA),
+    ("BHP.AX", OTHER),
+    ("BTC-USD", OTHER),
+    ("ETH-EUR", OTHER),
+    ("EURUSD=X", OTHER),
+    ("JPY=X", OTHER),
+    ("CL=F", OTHER),
+    ("^GSPC", None),
+    ("FOO.ZZ", None),
+    ("", None),
+])
+def test_region_from_suffix(ticker, region):
+    assert region_from_suffix(ticker) == region
+
+
+@pytest.mark.parametrize("exchange, region", [
+    ("ne", AMERICAS),
+    ("NEO ", AMERICAS),
+    ("nms", AMERICAS),
+    # Exact matches only: these contain "ne" or "sto" but are not those exchanges
+    ("euronext", EUROPE),
+    ("sto", EUROPE),
+    ("nse", ASIA),
+    ("osa", ASIA),
+    ("asx", OTHER),
+])
+def test_exchange_codes_match_exactly(exchange, region):
+    assert region_from_exchange(exchange) == region
+
+
+@pytest.mark.parametrize("exchange", ["nasdaqgs", "xne", "ccc", ""])
+def test_unlisted_exchanges_are_reported(exchange):
+    assert region_from_exchange(exchange) == f"{OTHER} (Exchange: {exchange})"
+
+
+def test_only_inconclusive_symbols_are_looked_up(empty_provider):
+    empty_provider.save("^N225", info={"exchange": "OSA"})
+    empty_provider.save("BTC-USD", info={"exchange": "NMS"})  # never consulted
+
+    assert exchange_codes(["AAPL", "NESN.SW", "BTC-USD", "EURUSD=X", "^N225"]) == {"^N225": "OSA"}
+    assert get_stock_regions(["AAPL", "BTC-USD", "EURUSD=X", "^N225"]) == {
+        "AAPL": AMERICAS, "BTC-USD": OTHER, "EURUSD=X": OTHER, "^N225": ASIA,
+    }
+
+
+def test_region_weights_put_crypto_and_fx_under_other():
+    holdings = pd.DataFrame({
+        "ticker": ["AAPL", "BTC-USD", "NESN.SW", "EURUSD=X", "^GSPC"],
+        "value": [50.0, 20.0, 20.0, 10.0, 0.0],
+        "exchange": ["", "", "", "", "snp"],
+    })
+    weights = region_weights(holdings)
+    assert weights.to_dict() == pytest.approx({AMERICAS: 50.0, OTHER: 30.0, EUROPE: 20.0})